@@ -16,6 +16,8 @@ import { MapContainer, TileLayer, Marker, Popup, Polyline, useMap } from 'react-
 import L from 'leaflet';
 import 'leaflet/dist/leaflet.css';
 import { getHeroImage, ASSETS } from './utils/assetMapper';
+import { lookupLocation } from './utils/locationTable';
+import { hasDetails, fetchProfileDetails, useFullProfiles } from './utils/profileDetails';
 import RelationshipSelector from './RelationshipSelector';
 import HitlistPanel from './components/HitlistPanel';
 import OutliersDashboard from './components/OutliersDashboard';
@@ -126,6 +128,9 @@ const calculatePresidentialSpan = (bornYear, diedYear) => {
     };
 };
 
+// Index entries (family_index.json) flag notes instead of carrying them
+const hasStory = (person) => !!(person.story?.notes || person.has_story);
+
 const detectThreads = (person) => {
     const notes = (person.story?.notes || "").toLowerCase();
     const tags = (person.story?.tags || []).map(t => t.toLowerCase());
@@ -154,8 +159,15 @@ const detectThreads = (person) => {
     });
 };
 
+// Index entries carry no notes, so once the full profiles have loaded the
+// selected thread's members come from them (threadMembers, a set of ids)
+const isThreadMember = (person, selectedThreadId, threadMembers) =>
+    threadMembers ? threadMembers.has(person.id) : detectThreads(person).some(t => t.id === selectedThreadId);
+
 const getCoordinates = (locationName, hierarchy = null, coords = null) => {
-    // 1. Use Pre-Calculated Coords from Pipeline if available
+    // 1. Use Pre-Calculated Coords from Pipeline if available, embedded in
+    // the profile or from locations.json
+    if (!coords && locationName) coords = lookupLocation(locationName);
     if (coords && coords.lat && coords.lng) {
         return { pos: [coords.lat, coords.lng], tier: coords.tier || 1, label: "Exact" };
     }
@@ -575,7 +587,7 @@ const getFamilyLinks = (person, allData) => {
 const nodeWidth = 200;
 const nodeHeight = 60;
 
-const buildGenealogyGraph = (data, searchText = '', storyMode = false, selectedThreadId = null) => {
+const buildGenealogyGraph = (data, searchText = '', storyMode = false, selectedThreadId = null, threadMembers = null) => {
   const dagreGraph = new dagre.graphlib.Graph();
   dagreGraph.setDefaultEdgeLabel(() => ({}));
 
@@ -587,11 +599,10 @@ const buildGenealogyGraph = (data, searchText = '', storyMode = false, selectedT
 
   data.forEach((person) => {
     const bornYear = person.vital_stats.born_date?.match(/\d{4}/)?.[0] || '????';
-    const hasStory = !!person.story?.notes;
+    const personHasStory = hasStory(person);
     const isMatch = !searchText || person.name.toLowerCase().includes(searchText.toLowerCase());
 
-    const personThreads = detectThreads(person);
-    const isInThread = selectedThreadId ? personThreads.some(t => t.id === selectedThreadId) : false;
+    const isInThread = selectedThreadId ? isThreadMember(person, selectedThreadId, threadMembers) : false;
 
     // Visual Logic
     let opacity = 1;
@@ -606,12 +617,12 @@ const buildGenealogyGraph = (data, searchText = '', storyMode = false, selectedT
         opacity = 0.2;
     } else if (selectedThreadId && !isInThread) {
         opacity = 0.2;
-    } else if (storyMode && !hasStory && !searchText && !selectedThreadId) {
+    } else if (storyMode && !personHasStory && !searchText && !selectedThreadId) {
         opacity = 0.2;
     }
 
     // Highlighting logic (Story Mode)
-    if (storyMode && hasStory) {
+    if (storyMode && personHasStory) {
         border = `2px solid ${COLORS.gold}`;
         boxShadow = '0 0 10px rgba(245, 158, 11, 0.5)';
     }
@@ -628,7 +639,7 @@ const buildGenealogyGraph = (data, searchText = '', storyMode = false, selectedT
     dagreGraph.setNode(String(person.id), { width: nodeWidth, height: nodeHeight });
     nodes.push({
       id: String(person.id),
-      data: { label: person.name, year: bornYear, hasStory },
+      data: { label: person.name, year: bornYear, hasStory: personHasStory },
       type: 'default', // Using default for now, can be custom
       position: { x: 0, y: 0 }, // Placeholder
       style: {
@@ -649,7 +660,7 @@ const buildGenealogyGraph = (data, searchText = '', storyMode = false, selectedT
     const tags = person.story?.tags || [];
     nodes[nodes.length - 1].data.label = (
         <div className="relative">
-            {hasStory && (
+            {personHasStory && (
                 <div className="absolute -top-3 -right-3 bg-gold text-white p-1 rounded-full shadow-sm z-10" title="Has Story">
                     <BookOpen size={10} fill="white" />
                 </div>
@@ -677,8 +688,7 @@ const buildGenealogyGraph = (data, searchText = '', storyMode = false, selectedT
     links.children.forEach(child => {
         const edgeId = `${String(person.id)}-${String(child.id)}`;
         if (!processedEdges.has(edgeId)) {
-            const childThreads = detectThreads(child);
-            const childInThread = selectedThreadId ? childThreads.some(t => t.id === selectedThreadId) : false;
+            const childInThread = selectedThreadId ? isThreadMember(child, selectedThreadId, threadMembers) : false;
             const isThreadEdge = selectedThreadId && isInThread && childInThread;
             const threadColor = selectedThreadId ? NARRATIVE_THREADS.find(t => t.id === selectedThreadId)?.hex : null;
 
@@ -736,8 +746,8 @@ const buildGenealogyGraph = (data, searchText = '', storyMode = false, selectedT
   return { nodes: layoutedNodes, edges };
 };
 
-const GraphView = ({ data, onNodeClick, searchText, storyMode, selectedThreadId }) => {
-    const { nodes: layoutedNodes, edges: layoutedEdges } = useMemo(() => buildGenealogyGraph(data, searchText, storyMode, selectedThreadId), [data, searchText, storyMode, selectedThreadId]);
+const GraphView = ({ data, onNodeClick, searchText, storyMode, selectedThreadId, threadMembers }) => {
+    const { nodes: layoutedNodes, edges: layoutedEdges } = useMemo(() => buildGenealogyGraph(data, searchText, storyMode, selectedThreadId, threadMembers), [data, searchText, storyMode, selectedThreadId, threadMembers]);
 
     // We need to update nodes when props change, but useNodesState manages internal state too.
     // So we use useEffect to sync.
@@ -847,7 +857,7 @@ const GenerationGroup = ({ generation, items, selectedAncestor, onSelect, userRe
                             >
                                 <div className="flex justify-between items-start mb-1">
                                     <div className="flex items-center gap-1.5 min-w-0">
-                                        {item.story?.notes && (
+                                        {hasStory(item) && (
                                             <BookOpen size={12} className={`shrink-0 ${isSelected ? "text-accent" : "text-gold"}`} />
                                         )}
                                         <h3 className={`font-bold text-sm truncate ${isSelected ? 'text-gray-900' : 'text-gray-800'}`}>
@@ -1323,7 +1333,65 @@ const ThreadTimeline = ({ thread, members, onBack, onSelectMember }) => {
     );
 };
 
-const ImmersiveProfile = ({ item, familyData, historyData, onClose, onNavigate, userRelation, onSelectThread }) => {
+// Stands in for a story-level view until the full profiles have loaded
+const StoryDataPending = ({ error }) => (
+    <div className="h-full flex flex-col items-center justify-center text-gray-500 font-serif p-8">
+        {error ? (
+            <>
+                <AlertTriangle size={32} className="text-amber-700 mb-4" />
+                <p>{error}</p>
+            </>
+        ) : (
+            <Loader2 className="w-10 h-10 animate-spin text-amber-700" />
+        )}
+    </div>
+);
+
+// Opens index entries once their detail shard has loaded (see utils/profileDetails.js)
+const ImmersiveProfile = ({ item, ...props }) => {
+    const [detailed, setDetailed] = useState(() => (item && hasDetails(item) ? item : null));
+    const [loadError, setLoadError] = useState(null);
+
+    React.useEffect(() => {
+        if (!item) return;
+        setLoadError(null);
+        if (hasDetails(item)) {
+            setDetailed(item);
+            return;
+        }
+        let active = true;
+        fetchProfileDetails(item)
+            .then(full => { if (active) setDetailed(full); })
+            .catch(err => { if (active) setLoadError(err.message); });
+        return () => { active = false; };
+    }, [item]);
+
+    if (!item) return null;
+
+    if (loadError) {
+        return (
+            <div className="absolute inset-0 z-30 bg-parchment flex flex-col items-center justify-center text-gray-500 font-serif">
+                <AlertTriangle size={32} className="text-amber-700 mb-4" />
+                <p className="mb-4">{loadError}</p>
+                <button onClick={props.onClose} className="px-4 py-2 bg-amber-700 text-white rounded hover:bg-amber-800 transition-colors">
+                    Close
+                </button>
+            </div>
+        );
+    }
+
+    if (!detailed || detailed.id !== item.id) {
+        return (
+            <div className="absolute inset-0 z-30 bg-parchment flex items-center justify-center">
+                <Loader2 className="w-10 h-10 animate-spin text-amber-700" />
+            </div>
+        );
+    }
+
+    return <ImmersiveProfileView item={detailed} {...props} />;
+};
+
+const ImmersiveProfileView = ({ item, familyData, historyData, onClose, onNavigate, userRelation, onSelectThread }) => {
     // Muse: Ensure the profile has a visual identity
     if (!item) return null;
 
@@ -2007,6 +2075,16 @@ export default function App({ familyData, historyData, hitlistData }) {
     localStorage.setItem('userRelation', JSON.stringify(relation));
   };
 
+  // Full profiles for the story-level views (threads, fleet, outliers and the
+  // graph's trivia), fetched from the detail shards when one first opens
+  const needsStoryData = ['threads', 'fleet', 'outliers', 'graph'].includes(viewMode) || !!selectedThreadId;
+  const { profiles: storyData, error: storyDataError } = useFullProfiles(familyData, needsStoryData);
+
+  const threadMembers = useMemo(() => {
+    if (!selectedThreadId || !storyData) return null;
+    return new Set(storyData.filter(p => detectThreads(p).some(t => t.id === selectedThreadId)).map(p => p.id));
+  }, [storyData, selectedThreadId]);
+
   const filteredGraphData = useMemo(() => {
     return familyData.filter(p => {
         // Lineage Filter: Default to 'Paternal' if field is missing (legacy data)
@@ -2017,7 +2095,15 @@ export default function App({ familyData, historyData, hitlistData }) {
         const matchesTags = selectedTags.length === 0 || (p.story.tags && selectedTags.every(t => p.story.tags.includes(t)));
         return matchesLineage && matchesBranch && matchesTags;
     });
-  }, [selectedBranchId, selectedTags, selectedLineage]);
+  }, [familyData, selectedBranchId, selectedTags, selectedLineage]);
+
+  // The graph's profiles in full, for its trivia
+  const triviaData = useMemo(() => {
+    if (!storyData) return null;
+    if (storyData === familyData) return filteredGraphData;
+    const ids = new Set(filteredGraphData.map(p => p.id));
+    return storyData.filter(p => ids.has(p.id));
+  }, [storyData, familyData, filteredGraphData]);
 
   const filteredListData = useMemo(() => {
     return familyData.filter(p => {
@@ -2025,17 +2111,17 @@ export default function App({ familyData, historyData, hitlistData }) {
         const matchesTags = selectedTags.length === 0 || (p.story.tags && selectedTags.every(t => p.story.tags.includes(t)));
         return matchesTags;
     });
-  }, [selectedTags]);
+  }, [familyData, selectedTags]);
 
   // Group data by Generation
   const groupedData = useMemo(() => {
     const groups = {};
     const filtered = filteredListData.filter(item => {
         const matchesSearch = item.name.toLowerCase().includes(searchText.toLowerCase());
-        const matchesStory = !storyMode || (item.story?.notes);
+        const matchesStory = !storyMode || hasStory(item);
 
         // Filter by Epic/Thread if selected (List View Logic: Filter strictly)
-        const threadMatches = !selectedThreadId || detectThreads(item).some(t => t.id === selectedThreadId);
+        const threadMatches = !selectedThreadId || isThreadMember(item, selectedThreadId, threadMembers);
 
         return matchesSearch && matchesStory && threadMatches;
     });
@@ -2047,7 +2133,7 @@ export default function App({ familyData, historyData, hitlistData }) {
     });
 
     return groups;
-  }, [searchText, storyMode, filteredListData, selectedThreadId]);
+  }, [searchText, storyMode, filteredListData, selectedThreadId, threadMembers]);
 
   return (
     <div className="flex flex-col h-screen bg-white font-sans overflow-hidden">
@@ -2290,8 +2376,8 @@ export default function App({ familyData, historyData, hitlistData }) {
         </div>
 
         {/* TRIVIA WIDGET */}
-        {viewMode === 'graph' && (
-            <TriviaWidget data={filteredGraphData} branchName={BRANCHES[selectedBranchId]} historyData={historyData} />
+        {viewMode === 'graph' && triviaData && (
+            <TriviaWidget data={triviaData} branchName={BRANCHES[selectedBranchId]} historyData={historyData} />
         )}
 
         {/* LIST VIEW (Shows in 'list' AND 'graph' modes) */}
@@ -2316,10 +2402,12 @@ export default function App({ familyData, historyData, hitlistData }) {
         <ErrorBoundary level="view" onReset={() => setViewMode('list')}>
         {viewMode === 'threads' && (
              <div className="flex-1 overflow-hidden relative border-t border-gray-100 bg-parchment-muted">
-                 {selectedThreadId ? (
+                 {selectedThreadId && !storyData ? (
+                     <StoryDataPending error={storyDataError} />
+                 ) : selectedThreadId ? (
                      <ThreadTimeline
                         thread={NARRATIVE_THREADS.find(t => t.id === selectedThreadId)}
-                        members={familyData.filter(p => detectThreads(p).some(t => t.id === selectedThreadId))}
+                        members={storyData.filter(p => threadMembers.has(p.id))}
                         onBack={() => setSelectedThreadId(null)}
                         onSelectMember={setSelectedAncestor}
                      />
@@ -2347,13 +2435,17 @@ export default function App({ familyData, historyData, hitlistData }) {
         <ErrorBoundary level="view" onReset={() => setViewMode('list')}>
         {viewMode === 'outliers' && (
              <div className="flex-1 overflow-y-auto relative border-t border-gray-100">
-                 <OutliersDashboard
-                    data={familyData}
-                    onSelectProfile={(id) => {
-                        const person = familyData.find(p => String(p.id) === String(id));
-                        if (person) setSelectedAncestor(person);
-                    }}
-                 />
+                 {storyData ? (
+                     <OutliersDashboard
+                        data={storyData}
+                        onSelectProfile={(id) => {
+                            const person = familyData.find(p => String(p.id) === String(id));
+                            if (person) setSelectedAncestor(person);
+                        }}
+                     />
+                 ) : (
+                     <StoryDataPending error={storyDataError} />
+                 )}
              </div>
         )}
         </ErrorBoundary>
@@ -2380,6 +2472,7 @@ export default function App({ familyData, historyData, hitlistData }) {
                     searchText={searchText}
                     storyMode={storyMode}
                     selectedThreadId={selectedThreadId}
+                    threadMembers={threadMembers}
                     onNodeClick={(person) => {
                         setSelectedAncestor(person);
                     }}
@@ -2392,7 +2485,11 @@ export default function App({ familyData, historyData, hitlistData }) {
           <ErrorBoundary level="view" onReset={() => setViewMode('list')}>
           {viewMode === 'fleet' && (
               <div className="absolute inset-0 z-0 bg-parchment">
-                  <TheFleet familyData={familyData} onSelectProfile={setSelectedAncestor} />
+                  {storyData ? (
+                      <TheFleet familyData={storyData} onSelectProfile={setSelectedAncestor} />
+                  ) : (
+                      <StoryDataPending error={storyDataError} />
+                  )}
               </div>
           )}
           </ErrorBoundary>
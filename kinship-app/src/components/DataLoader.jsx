@@ -1,6 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import { Loader2 } from 'lucide-react';
 import { setWikimediaCache } from '../utils/assetMapper';
+import { setLocationTable } from '../utils/locationTable';
+import { setDetailShards, setShipCache, withShipSpecs } from '../utils/profileDetails';
 
 const BASE_URL = import.meta.env.BASE_URL;
 
@@ -12,18 +14,37 @@ const fetchJSON = async (filename) => {
   return response.json();
 };
 
-const mergeShipCache = (familyDataRaw, shipCacheRaw) => {
-  return familyDataRaw.map(p => {
-    if (p.story && p.story.voyages) {
-      const enrichedVoyages = p.story.voyages.map(v => {
-        if (!v.specs && v.ship_name && shipCacheRaw[v.ship_name]) {
-          return { ...v, specs: shipCacheRaw[v.ship_name] };
-        }
-        return v;
-      });
-      return { ...p, story: { ...p.story, voyages: enrichedVoyages } };
-    }
-    return p;
+// Optional files written by newer pipeline runs; missing ones load as {}
+const fetchOptionalJSON = (filename) => fetchJSON(filename).catch(() => ({}));
+
+// family_data.json written with --dictionary-encode holds repeated strings
+// (labels, locations, hierarchies, ship names) as codes into `strings`
+const decodeFamilyData = (raw) => {
+  if (Array.isArray(raw)) return raw;
+
+  const str = (code) => (typeof code === 'number' ? raw.strings[code] : code);
+  const hierarchy = (h) => (h ? Object.fromEntries(Object.entries(h).map(([k, v]) => [k, str(v)])) : h);
+
+  return raw.profiles.map(p => {
+    const vitals = { ...p.vital_stats };
+    if ('born_location' in vitals) vitals.born_location = str(vitals.born_location);
+    if ('died_location' in vitals) vitals.died_location = str(vitals.died_location);
+    if ('born_hierarchy' in vitals) vitals.born_hierarchy = hierarchy(vitals.born_hierarchy);
+    if ('died_hierarchy' in vitals) vitals.died_hierarchy = hierarchy(vitals.died_hierarchy);
+
+    return {
+      ...p,
+      lineage: str(p.lineage),
+      generation: str(p.generation),
+      vital_stats: vitals,
+      story: {
+        ...p.story,
+        voyages: p.story.voyages.map(v => ({
+          ...v, ship_name: str(v.ship_name), departure: str(v.departure), arrival: str(v.arrival)
+        })),
+        life_events: p.story.life_events.map(e => ({ ...e, location: str(e.location) })),
+      },
+    };
   });
 };
 
@@ -34,18 +55,31 @@ const DataLoader = ({ children }) => {
   useEffect(() => {
     const loadAll = async () => {
       try {
-        const [familyDataRaw, shipCacheRaw, historyData, hitlistData, wikimediaCache] =
+        const [familyIndex, shipCacheRaw, historyData, hitlistData, wikimediaCache, locations] =
           await Promise.all([
-            fetchJSON('family_data.json'),
+            fetchOptionalJSON('family_index.json'),
             fetchJSON('ship_cache.json'),
             fetchJSON('history_data.json'),
             fetchJSON('hitlist_data.json'),
             fetchJSON('wikimedia_cache.json'),
+            fetchOptionalJSON('locations.json'),
           ]);
 
-        const familyData = mergeShipCache(familyDataRaw, shipCacheRaw);
+        setShipCache(shipCacheRaw);
         setWikimediaCache(wikimediaCache);
-        setData({ familyData, historyData, hitlistData });
+        setLocationTable(locations);
+
+        if (familyIndex.profiles) {
+          // Paint from the slim index; a profile loads its detail shard when
+          // opened, and the story-level views load the rest (useFullProfiles)
+          setDetailShards(familyIndex.shards);
+          setData({ familyData: familyIndex.profiles, historyData, hitlistData });
+        } else {
+          // Output of a pipeline run from before family_index.json
+          const familyDataRaw = await fetchJSON('family_data.json');
+          const familyData = decodeFamilyData(familyDataRaw).map(withShipSpecs);
+          setData({ familyData, historyData, hitlistData });
+        }
       } catch (err) {
         console.error('Data loading failed:', err);
         setError(err.message);
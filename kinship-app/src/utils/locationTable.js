@@ -0,0 +1,12 @@
+// src/utils/locationTable.js
+
+// Populated by DataLoader from locations.json before App renders:
+// location string -> { lat, lng, tier, profiles }
+let locationTable = {};
+export const setLocationTable = (table) => { locationTable = table || {}; };
+
+// Pipeline coordinates for a location string, or null if it was not resolved
+export const lookupLocation = (locationName) => {
+    const entry = locationTable[locationName];
+    return entry && entry.lat != null && entry.lng != null ? entry : null;
+};
@@ -0,0 +1,86 @@
+// src/utils/profileDetails.js
+import { useEffect, useMemo, useState } from 'react';
+
+// family_index.json lists every profile with only what the list, graph and
+// relationship views read; the full profiles live in detail shards
+// (data/details/<lineage>-<generation>.json, profile id -> profile). A
+// profile's shard is fetched when it is opened; every shard only when a
+// story-level view first needs the full profiles (see useFullProfiles).
+const BASE_URL = import.meta.env.BASE_URL;
+
+let shardNames = [];
+let shipCache = {};
+const shardRequests = {};
+
+// Populated by DataLoader: the index's shard file names and ship_cache.json
+export const setDetailShards = (names) => { shardNames = names || []; };
+export const setShipCache = (cache) => { shipCache = cache || {}; };
+
+// Voyages pick up specs from ship_cache.json when the pipeline left them out
+export const withShipSpecs = (p) => {
+    if (!p.story || !p.story.voyages) return p;
+    const voyages = p.story.voyages.map(v => {
+        if (!v.specs && v.ship_name && shipCache[v.ship_name]) {
+            return { ...v, specs: shipCache[v.ship_name] };
+        }
+        return v;
+    });
+    return { ...p, story: { ...p.story, voyages } };
+};
+
+// Index entries carry the number of their shard; full profiles do not
+export const hasDetails = (p) => p.shard === undefined;
+
+const fetchDetailShard = (number) => {
+    if (!shardRequests[number]) {
+        const filename = shardNames[number];
+        shardRequests[number] = fetch(`${BASE_URL}data/details/${filename}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`Failed to load ${filename}: ${response.status}`);
+                }
+                return response.json();
+            })
+            .catch(err => {
+                // Let the next request retry
+                delete shardRequests[number];
+                throw err;
+            });
+    }
+    return shardRequests[number];
+};
+
+// The full profile behind an index entry (the profile itself if already full)
+export const fetchProfileDetails = async (p) => {
+    if (hasDetails(p)) return p;
+    const shard = await fetchDetailShard(p.shard);
+    if (!shard[p.id]) {
+        throw new Error(`Profile ${p.id} is missing from ${shardNames[p.shard]}`);
+    }
+    return withShipSpecs(shard[p.id]);
+};
+
+// Every index entry replaced by its full profile
+export const fetchAllDetails = async (index) => {
+    const shards = await Promise.all(shardNames.map((_, number) => fetchDetailShard(number)));
+    return index.map(p => (hasDetails(p) || !shards[p.shard][p.id] ? p : withShipSpecs(shards[p.shard][p.id])));
+};
+
+// Full profiles for the story-level views: the list itself when it already
+// holds full profiles (family_data.json), otherwise fetched from every shard
+// the first time `wanted` is true. `profiles` is null until they arrive.
+export const useFullProfiles = (index, wanted) => {
+    const complete = useMemo(() => index.every(hasDetails), [index]);
+    const [loaded, setLoaded] = useState({ profiles: null, error: null });
+
+    useEffect(() => {
+        if (complete || !wanted || loaded.profiles) return;
+        let active = true;
+        fetchAllDetails(index)
+            .then(profiles => { if (active) setLoaded({ profiles, error: null }); })
+            .catch(err => { if (active) setLoaded({ profiles: null, error: err.message }); });
+        return () => { active = false; };
+    }, [index, complete, wanted, loaded.profiles]);
+
+    return complete ? { profiles: index, error: null } : loaded;
+};
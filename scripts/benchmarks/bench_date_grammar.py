@@ -0,0 +1,54 @@
+"""
+Times the date grammar's fast path against the dateparser path on the
+vital date corpus (tests/data/vital_date_corpus.json): every string the
+grammar handles is split both ways, and the report gives the time per
+string and the speedup. Correctness is checked by tests/test_date_grammar.py.
+
+Usage: python scripts/benchmarks/bench_date_grammar.py [repeats]
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from date_grammar import split_vital_date
+from genealogy_pipeline import GenealogyTextPipeline
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tests", "data", "vital_date_corpus.json")
+
+
+def best_of(repeats, split, raws):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for raw in raws:
+            split(raw)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    covered = [raw for raw, *_ in corpus if split_vital_date(raw) is not None]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = GenealogyTextPipeline()
+    dateparser_s = best_of(repeats, pipeline._split_date_location_dateparser, covered)
+    fast_s = best_of(repeats, split_vital_date, covered)
+
+    print(f"{len(covered)} of {len(corpus)} corpus strings take the fast path (best of {repeats})")
+    print(f"{'path':<12}{'total s':>10}{'us/string':>12}")
+    for name, seconds in (("dateparser", dateparser_s), ("grammar", fast_s)):
+        print(f"{name:<12}{seconds:>10.3f}{seconds / len(covered) * 1e6:>12.1f}")
+    print(f"Fast path is {dateparser_s / fast_s:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares python-docx paragraph materialization with the streaming
+DocxParagraphReader on a large synthetic document.
+
+Usage: python scripts/benchmarks/bench_docx_reader.py [paragraphs]
+
+Each reader runs in its own subprocess so peak RSS is measured separately
+(lxml allocations are not visible to tracemalloc).
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, SCRIPTS_DIR)
+
+from synthetic_tree import write_docx
+
+
+def write_synthetic_docx(path, paragraph_count):
+    lines = [
+        "Josiah Example {1.2.1.%d}",
+        "Born: 3/14/1701, Hartford, CT",
+        "Died: c. 1760 in Windsor, CT",
+        "NOTES: He sailed on the Hector in 1720 and was a friend of Samuel Example; later a deacon.",
+    ]
+    write_docx(path, (lines[i % len(lines)].replace("%d", str(i)) for i in range(paragraph_count)))
+
+
+def read_with(reader, path):
+    start = time.perf_counter()
+    count = 0
+    chars = 0
+    if reader == "python-docx":
+        from docx import Document
+        for para in Document(path).paragraphs:
+            count += 1
+            chars += len(para.text)
+    else:
+        from docx_stream import DocxParagraphReader
+        with DocxParagraphReader(path) as stream:
+            for _, text in stream:
+                count += 1
+                chars += len(text)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"reader": reader, "paragraphs": count, "chars": chars, "seconds": elapsed, "peak_rss_mb": peak_kb / 1024}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        print(json.dumps(read_with(sys.argv[2], sys.argv[3])))
+        sys.exit(0)
+
+    paragraph_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.docx")
+        write_synthetic_docx(path, paragraph_count)
+        print(f"Synthetic document: {paragraph_count} paragraphs, {os.path.getsize(path) / 1e6:.1f} MB zipped")
+
+        results = []
+        for reader in ("python-docx", "stream"):
+            out = subprocess.run([sys.executable, __file__, "--child", reader, path],
+                                 capture_output=True, text=True, check=True)
+            results.append(json.loads(out.stdout))
+
+    print(f"{'reader':<12} {'paragraphs':>10} {'seconds':>8} {'peak RSS MB':>12}")
+    for r in results:
+        print(f"{r['reader']:<12} {r['paragraphs']:>10} {r['seconds']:>8.2f} {r['peak_rss_mb']:>12.1f}")
+    if results[0]["chars"] != results[1]["chars"]:
+        print("WARNING: readers disagree on extracted text length")
@@ -0,0 +1,66 @@
+"""
+Offline geocoding benchmark. Parses the lineage documents, collects every
+birth, death and life event location, and geocodes them with the API
+switched off: built-in tables, then the gazetteer, then the cache. Reports
+coverage and throughput per tier for a cold pass (empty gazetteer memo)
+and a warm one.
+
+Usage: python scripts/benchmarks/bench_geocoding.py [sources.json]
+
+Run from the repository root so the document paths resolve.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from gazetteer import Gazetteer
+from genealogy_pipeline import GenealogyTextPipeline, GeocodingService, SOURCES_CONFIG, load_sources
+
+
+def location_mentions(profiles):
+    mentions = []
+    for p in profiles:
+        mentions.append(p["vital_stats"]["born_location"])
+        mentions.append(p["vital_stats"]["died_location"])
+        mentions.extend(e["location"] for e in p["story"]["life_events"] if e.get("location", "Unknown") != "Unknown")
+    return [m for m in mentions if m and m != "Unknown"]
+
+
+def run_pass(geocoder, mentions):
+    geocoder.reset_stats()
+    start = time.perf_counter()
+    for location in mentions:
+        geocoder.geocode(location)
+    return time.perf_counter() - start
+
+
+def main():
+    config = sys.argv[1] if len(sys.argv) > 1 else SOURCES_CONFIG
+    pipeline = GenealogyTextPipeline()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline.parse_documents(load_sources(config))
+    mentions = location_mentions(pipeline.family_data)
+    print(f"{len(pipeline.family_data)} profiles, {len(mentions)} location mentions, {len(set(mentions))} distinct")
+
+    start = time.perf_counter()
+    gazetteer = Gazetteer(pipeline._parse_location_hierarchy)
+    print(f"Gazetteer: {len(gazetteer.places_by_name)} place names, {len(gazetteer.regions)} regions, "
+          f"loaded in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        geocoder = GeocodingService(os.path.join(tmp, "enrichment.sqlite"), gazetteer=gazetteer)
+        geocoder.api_enabled = False
+        for label in ("cold", "warm"):
+            seconds = run_pass(geocoder, mentions)
+            print(f"\n{label}: {len(mentions) / seconds:,.0f} lookups/s ({seconds * 1000:.1f}ms)")
+            geocoder.report_coverage()
+        geocoder.cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Scaling benchmark for the graph stages of clean_and_save (family linking,
+naming echo and Ariadne's mention scan) on in-memory synthetic profiles.
+
+Usage: python scripts/benchmarks/bench_mentions.py [sizes...]
+
+Per-profile cost should stay roughly flat as the profile count grows.
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from genealogy_pipeline import GenealogyTextPipeline
+
+FIRST_NAMES = ["John", "Mary", "William", "Sarah", "Thomas", "Elizabeth", "Samuel", "Hannah", "Joseph", "Abigail"]
+
+
+def synthetic_surname(i):
+    # Capitalized, letters only, so it matches Ariadne's candidate pattern
+    letters = ""
+    i += 26 * 26
+    while i:
+        i, r = divmod(i, 26)
+        letters = chr(ord("a") + r) + letters
+    return letters.capitalize()
+
+
+def build_profiles(n, seed=7):
+    rng = random.Random(seed)
+    names = []
+    for i in range(n):
+        middle = synthetic_surname(rng.randrange(n))
+        names.append(f"{rng.choice(FIRST_NAMES)} {middle} {synthetic_surname(i)}")
+
+    profiles = []
+    for i in range(n):
+        pid = str(i + 1)
+        born = rng.randint(1600, 1850)
+        friend = names[rng.randrange(n)]
+        partner = names[rng.randrange(n)]
+        notes = (
+            f"Settled near the river in {born + 25}. "
+            f"He was a friend of {friend}; later in business with {partner}, "
+            f"and witness to the will of {names[rng.randrange(n)]}."
+        )
+        profiles.append({
+            "id": pid,
+            "name": names[i],
+            "lineage": "Synthetic",
+            "generation": "GENERATION I: SYNTHETIC",
+            "vital_stats": {"born_date": str(born), "died_date": "Unknown"},
+            "story": {"notes": notes, "life_events": []},
+            "metadata": {"source_id": "Synthetic", "doc_paragraph_index": i + 1},
+            "relations": {"parents": [], "children": [], "spouses": []},
+        })
+    return profiles
+
+
+def run(n):
+    pipeline = GenealogyTextPipeline()
+    pipeline.family_data = build_profiles(n)
+    pipeline.update_ariadne_journal = lambda: None
+
+    timings = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for label, step in (("link", pipeline.link_family_members),
+                            ("echo", pipeline._analyze_naming_patterns),
+                            ("mentions", pipeline._find_mentions)):
+            start = time.perf_counter()
+            step()
+            timings[label] = time.perf_counter() - start
+    return timings
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [500, 1000, 2000, 4000, 8000]
+
+    print(f"{'profiles':>9} {'link s':>8} {'echo s':>8} {'mentions s':>11} {'us/profile':>11}")
+    for n in sizes:
+        t = run(n)
+        total = sum(t.values())
+        print(f"{n:>9} {t['link']:>8.3f} {t['echo']:>8.3f} {t['mentions']:>11.3f} {total / n * 1e6:>11.1f}")
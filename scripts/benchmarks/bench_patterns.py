@@ -0,0 +1,71 @@
+"""
+Per-pattern micro-benchmark for the regex registry. Parses the lineage
+documents (parse cache off, in-process), tags every profile and runs the
+mention candidate scan with every registered pattern instrumented, then
+reports calls, matches and cumulative time per pattern.
+
+Usage: python scripts/benchmarks/bench_patterns.py [sources.json]
+
+Run from the repository root so the document paths resolve.
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from genealogy_pipeline import GenealogyTextPipeline, SOURCES_CONFIG, load_sources
+from pipeline_patterns import PATTERNS
+
+
+def run_workload(sources):
+    pipeline = GenealogyTextPipeline()
+    pipeline.use_parse_cache = False
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline.parse_documents(sources, workers=1)
+    parse_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for profile in pipeline.family_data:
+        pipeline.extract_tags(profile)
+        PATTERNS.name_candidate.findall(profile["story"]["notes"])
+    tag_seconds = time.perf_counter() - start
+
+    return len(pipeline.family_data), parse_seconds, tag_seconds
+
+
+def main():
+    config = sys.argv[1] if len(sys.argv) > 1 else SOURCES_CONFIG
+    with contextlib.redirect_stdout(io.StringIO()):
+        sources = load_sources(config)
+
+    profiles, parse_s, tag_s = run_workload(sources)
+    print(f"{profiles} profiles: parse {parse_s:.2f}s, tags+candidates {tag_s:.2f}s (uninstrumented)")
+
+    PATTERNS.instrument()
+    try:
+        run_workload(sources)
+        rows = PATTERNS.stats()
+    finally:
+        PATTERNS.uninstrument()
+
+    total = sum(r["seconds"] for r in rows)
+    print(f"Total time inside registered patterns: {total:.3f}s\n")
+    print(f"{'pattern':<26}{'calls':>10}{'matches':>10}{'ms':>10}{'us/call':>10}")
+    for r in rows:
+        if not r["calls"]:
+            continue
+        per_call = r["seconds"] / r["calls"] * 1e6
+        print(f"{r['name']:<26}{r['calls']:>10}{r['matches']:>10}{r['seconds'] * 1000:>10.1f}{per_call:>10.2f}")
+
+    unused = [r["name"] for r in rows if not r["calls"]]
+    if unused:
+        print(f"\nNot exercised by this workload: {', '.join(unused)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Memory and emit-time benchmark for the profile records (profile_model.py)
+against the plain dict profiles they replaced, on a synthetic lineage
+document (see synthetic_tree.py).
+
+The document is parsed, deduped, linked and tagged once; the family data
+is then serialized and loaded back both ways, as nested dicts and as
+Profile records, and for each we report the memory the profile list holds
+(tracemalloc) and the time emit() takes to write family_data.json.
+
+Usage: python scripts/benchmarks/bench_profile_model.py [profiles] [--repeat N]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+
+from genealogy_pipeline import GenealogyTextPipeline
+from profile_model import Profile, as_dict
+from synthetic_tree import write_synthetic_tree
+
+
+def parsed_profiles(size):
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = os.path.join(tmp, "synthetic.docx")
+        write_synthetic_tree(docx_path, size)
+        pipeline = GenealogyTextPipeline()
+        pipeline.use_parse_cache = False
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline.parse_documents([("Synthetic", docx_path)], workers=1)
+            pipeline.dedupe_child_entries()
+            pipeline.link_family_members()
+            pipeline.tag_profiles()
+    for p in pipeline.family_data:
+        p.setdefault("hero_image", None)
+    return json.dumps([as_dict(p) for p in pipeline.family_data])
+
+
+def held_memory(build):
+    # Bytes still allocated once the structure is built (the JSON text
+    # it is loaded from is allocated beforehand and not counted)
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, held, peak
+
+
+def emit_time(profiles, repeat):
+    pipeline = GenealogyTextPipeline()
+    pipeline.family_data = profiles
+    best = None
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "family_data.json")
+        pipeline.save_location_table = lambda table: None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                pipeline.emit(output)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        with open(output, "rb") as f:
+            written = f.read()
+    return best, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile records vs dict profiles")
+    parser.add_argument("profiles", nargs="?", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3, help="Emit runs per model; the best is reported")
+    args = parser.parse_args()
+
+    print(f"Parsing a synthetic tree of {args.profiles} profiles...", flush=True)
+    text = parsed_profiles(args.profiles)
+
+    dicts, dict_held, dict_peak = held_memory(lambda: json.loads(text))
+    records, record_held, record_peak = held_memory(lambda: [Profile.from_dict(p) for p in json.loads(text)])
+    dict_emit, dict_output = emit_time(dicts, args.repeat)
+    record_emit, record_output = emit_time(records, args.repeat)
+    if dict_output != record_output:
+        raise SystemExit("Records and dicts emitted different family_data.json")
+
+    mb = 1024 * 1024
+    print(f"{'model':>8} {'held MB':>9} {'peak MB':>9} {'emit s':>8}")
+    print(f"{'dict':>8} {dict_held / mb:>9.1f} {dict_peak / mb:>9.1f} {dict_emit:>8.3f}")
+    print(f"{'record':>8} {record_held / mb:>9.1f} {record_peak / mb:>9.1f} {record_emit:>8.3f}")
+    print(f"Records hold {1 - record_held / dict_held:.0%} less; emit takes {record_emit / dict_emit:.2f}x "
+          f"the dict time ({len(records)} profiles, {len(record_output) / mb:.1f} MB written)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Scaling benchmark for the whole pipeline on synthetic lineage documents
+(see synthetic_tree.py). For each size it writes a document, runs every
+stage from parse to emit in a fresh subprocess, cold (no parse cache, an
+empty enrichment store), and records each stage's wall time, CPU time and
+peak RSS. The report ends with each stage's growth exponent between the
+two largest sizes: ~1 is linear, ~2 quadratic.
+
+Usage: python scripts/benchmarks/bench_scaling.py [sizes...] [--trace-memory] [--out results.json]
+
+Default sizes are 1000, 5000 and 20000 profiles; the specification's
+upper end is 200000. Enrichment runs offline: Wikimedia searches are
+switched off (api_enabled), the geocoding API is off by default (--geocode-api)
+and the Gemini key is cleared, so enrich times are local work
+only.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic_tree import write_synthetic_tree
+
+DEFAULT_SIZES = [1000, 5000, 20000]
+DEFAULT_OUT = "./.pipeline_cache/bench_scaling.json"
+STAGES = ["parse", "dedupe", "link", "echo", "mentions", "enrich", "tag", "emit"]
+
+
+def run_child(docx_path, trace_memory):
+    # Runs inside the size's scratch directory, which stands in for the repo root
+    from genealogy_pipeline import GenealogyTextPipeline
+    from pipeline_metrics import PipelineMetrics
+    from wikimedia_images import WikimediaImageService
+
+    for path in ("kinship-app/public/data", "kinship-app/src", ".pipeline_cache"):
+        os.makedirs(path, exist_ok=True)
+    pipeline = GenealogyTextPipeline()
+    pipeline.use_parse_cache = False
+    pipeline.metrics = PipelineMetrics(trace_memory=trace_memory)
+    pipeline.image_service = WikimediaImageService(workers=pipeline.image_workers)
+    pipeline.image_service.api_enabled = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        with pipeline.metrics.stage("parse"):
+            pipeline.parse_documents([("Synthetic", docx_path)], workers=1)
+        pipeline.clean_and_save()
+    return pipeline.metrics.to_dict()
+
+
+def run_size(size, trace_memory):
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = os.path.join(tmp, "synthetic.docx")
+        start = time.perf_counter()
+        paragraphs = write_synthetic_tree(docx_path, size)
+        generated = time.perf_counter() - start
+
+        cmd = [sys.executable, __file__, "--child", docx_path] + (["--trace-memory"] if trace_memory else [])
+        env = dict(os.environ, VITE_GEMINI_API_KEY="")
+        out = subprocess.run(cmd, cwd=tmp, env=env, capture_output=True, text=True)
+        if out.returncode != 0:
+            raise RuntimeError(f"Pipeline failed at {size} profiles:\n{out.stderr}")
+        metrics = json.loads(out.stdout.strip().splitlines()[-1])
+
+    return {"profiles": size, "paragraphs": paragraphs, "generate_s": round(generated, 3),
+            "metrics": metrics}
+
+
+def growth(results, stage, field="wall_s"):
+    # Exponent k in t ~ n^k between the two largest sizes
+    if len(results) < 2:
+        return None
+    small, large = results[-2], results[-1]
+    t_small = small["metrics"]["stages"][stage][field]
+    t_large = large["metrics"]["stages"][stage][field]
+    if t_small <= 0 or t_large <= 0:
+        return None
+    return math.log(t_large / t_small) / math.log(large["profiles"] / small["profiles"])
+
+
+def report(results):
+    print(f"{'profiles':>9} " + " ".join(f"{stage:>9}" for stage in STAGES) + f" {'total s':>9} {'peak MB':>8}")
+    for r in results:
+        stages = r["metrics"]["stages"]
+        print(f"{r['profiles']:>9} " + " ".join(f"{stages[s]['wall_s']:>8.2f}s" for s in STAGES)
+              + f" {r['metrics']['wall_s']:>8.2f}s {r['metrics']['peak_rss_mb']:>8.0f}")
+    if len(results) >= 2:
+        print(f"{'exponent':>9} " + " ".join(f"{k:>9.2f}" if k is not None else f"{'n/a':>9}"
+                                             for k in (growth(results, s) for s in STAGES)))
+
+
+def main():
+    if len(sys.argv) >= 3 and sys.argv[1] == "--child":
+        print(json.dumps(run_child(sys.argv[2], "--trace-memory" in sys.argv)))
+        return
+
+    parser = argparse.ArgumentParser(description="Pipeline scaling benchmark on synthetic documents")
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--trace-memory", action="store_true", help="Also record each stage's tracemalloc peak")
+    parser.add_argument("--out", default=DEFAULT_OUT, help=f"Where to write the results (default: {DEFAULT_OUT})")
+    args = parser.parse_args()
+
+    results = []
+    for size in sorted(args.sizes):
+        print(f"Running {size} profiles...", flush=True)
+        results.append(run_size(size, args.trace_memory))
+    report(results)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"stages": STAGES, "results": results}, f, indent=2)
+    print(f"Results saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
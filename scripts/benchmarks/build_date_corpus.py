@@ -0,0 +1,62 @@
+"""
+Rebuilds tests/data/vital_date_corpus.json: every unique raw Born/Died
+string in the lineage documents that reaches the dateparser stage of
+split_date_location (no " in " separator), with the (date, location,
+year_int) the dateparser path produces for it. The date grammar test
+checks the fast path against this reference.
+
+Usage: python scripts/benchmarks/build_date_corpus.py [sources.json]
+
+Run from the repository root so the document paths resolve.
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from docx_stream import DocxParagraphReader
+from genealogy_pipeline import GenealogyTextPipeline, SOURCES_CONFIG, load_sources
+from pipeline_patterns import PATTERNS
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tests", "data", "vital_date_corpus.json")
+
+
+def collect_raw_dates(sources):
+    raws = set()
+    for _, path in sources:
+        with DocxParagraphReader(path) as reader:
+            for _, text in reader:
+                text = text.strip()
+                for pattern in (PATTERNS.born_line, PATTERNS.died_line):
+                    m = pattern.search(text)
+                    if m:
+                        raws.add(m.group(1).strip())
+    return sorted(raws)
+
+
+def main():
+    config = sys.argv[1] if len(sys.argv) > 1 else SOURCES_CONFIG
+    with contextlib.redirect_stdout(io.StringIO()):
+        sources = load_sources(config)
+        pipeline = GenealogyTextPipeline()
+
+    corpus = []
+    for raw in collect_raw_dates(sources):
+        if not raw or raw.lower() == "unknown" or PATTERNS.in_separator.search(raw):
+            continue
+        date, location = pipeline._split_date_location_dateparser(raw)
+        corpus.append([raw, date, location, pipeline._normalize_date_uncached(date)])
+
+    os.makedirs(os.path.dirname(CORPUS_PATH), exist_ok=True)
+    with open(CORPUS_PATH, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        f.write(",\n".join(json.dumps(entry, ensure_ascii=False) for entry in corpus))
+        f.write("\n]\n")
+    print(f"Wrote {len(corpus)} date strings to {os.path.normpath(CORPUS_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Writes synthetic lineage documents in the format described in
+docs/source_specification.md: GENERATION headers, reverse-lineage IDs
+({1}, {1.1}, {1.1.2}, ...), Born/Married/Died/Children/NOTES lines, ship
+tags and natural-language voyages, associate tags and notes that mention
+other people in the tree. Output is deterministic for a given size and
+seed, so runs at different sizes are comparable.
+
+Usage: python scripts/benchmarks/synthetic_tree.py OUT.docx [--profiles N] [--seed S] [--sources sources.json]
+
+--sources also writes a pipeline sources config pointing at OUT.docx, for
+genealogy_pipeline.py --sources.
+"""
+import argparse
+import json
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+# Generations below the probands; 2^12 - 1 profiles per proband at most
+MAX_DEPTH = 11
+FIRST_GENERATION = 4  # Probands sit in GENERATION IV (see the specification)
+
+MALE_NAMES = ["John", "William", "Thomas", "Samuel", "Joseph", "Benjamin", "Nathaniel", "Jonathan", "Daniel",
+              "Ebenezer", "Josiah", "Isaac", "Stephen", "Timothy", "Elisha", "Caleb", "Aaron", "Henry"]
+FEMALE_NAMES = ["Mary", "Sarah", "Elizabeth", "Hannah", "Abigail", "Martha", "Rebecca", "Ruth", "Anna",
+                "Mercy", "Lydia", "Esther", "Deborah", "Susanna", "Experience", "Thankful", "Prudence"]
+SURNAME_HEADS = ["Ash", "Brad", "Chad", "Dun", "Fair", "Hart", "Kings", "Lang", "Mar", "North", "Pem", "Rad",
+                 "Stan", "Thorn", "Wey", "Whit", "Went", "Hol", "Crom", "Sel", "Bur", "Hal", "Win", "Ald"]
+SURNAME_MIDDLES = ["ing", "er", "en", "el", "am", "in"]
+SURNAME_TAILS = ["ford", "ley", "ton", "wick", "field", "well", "by", "ham", "more", "wood", "ridge",
+                 "stead", "worth", "combe", "den", "hurst"]
+LOCATIONS = ["Hartford, CT", "Windsor, CT", "Wethersfield, CT", "Simsbury, CT", "New London, CT",
+             "Boston, MA", "Salem, MA", "Dedham, MA", "Ipswich, MA", "Plymouth, MA", "Springfield, MA",
+             "Providence, RI", "Newport, RI", "Portsmouth, NH", "Dover, NH", "Albany, NY", "Manhattan, NY",
+             "Newburgh, NY", "Philadelphia, PA", "Burlington, NJ", "Dedham, Essex, England",
+             "Boxted, Essex, England", "London, England", "Bristol, England", "Leiden, Holland",
+             "Toppesfield, Essex, England", "Ohio", "Cleveland, OH", "Chicago, IL", "Unknown", "?"]
+OCCUPATIONS = ["farmer", "cooper", "deacon", "blacksmith", "merchant", "ship captain", "schoolmaster",
+               "miller", "tanner", "minister", "selectman", "innkeeper"]
+SHIPS = ["Mayflower", "Arbella", "Hector", "Lion", "Mary and John", "Griffin", "Elizabeth", "Abigail",
+         "Hopewell", "James", "Defence", "Planter"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+RELATIONS = ["a neighbor of", "a friend of", "in business with", "a witness to the will of",
+             "a classmate of", "a partner of"]
+ROMAN = [(1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"), (50, "L"), (40, "XL"),
+         (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")]
+
+
+def roman(number):
+    out = ""
+    for value, letters in ROMAN:
+        while number >= value:
+            out += letters
+            number -= value
+    return out
+
+
+def write_docx(path, paragraphs):
+    """Streams paragraph strings into a minimal .docx, each split over two runs like Word does."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", CONTENT_TYPES)
+        zf.writestr("_rels/.rels", ROOT_RELS)
+        with zf.open("word/document.xml", "w") as f:
+            f.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>')
+            for text in paragraphs:
+                half = len(text) // 2
+                f.write(('<w:p><w:r><w:t xml:space="preserve">%s</w:t></w:r><w:r><w:t xml:space="preserve">%s</w:t></w:r></w:p>'
+                         % (escape(text[:half]), escape(text[half:]))).encode("utf-8"))
+            f.write(b'<w:sectPr/></w:body></w:document>')
+
+
+class SyntheticTree:
+    """
+    A pedigree of `profile_count` ancestors: probands {1}..{R}, then their
+    parents ({1.1} father, {1.2} mother), grandparents and so on, filled
+    generation by generation. Every attribute is derived from the seed and
+    the profile ID, so any profile can be named before it is written.
+    """
+
+    def __init__(self, profile_count, seed=7):
+        self.profile_count = profile_count
+        self.seed = seed
+        per_root = 2 ** (MAX_DEPTH + 1) - 1
+        roots = max(1, -(-profile_count // per_root))
+        self.levels = []
+        level = [str(i + 1) for i in range(roots)]
+        remaining = profile_count
+        while level and remaining > 0:
+            self.levels.append(level[:remaining])
+            remaining -= len(self.levels[-1])
+            level = [f"{pid}.{side}" for pid in self.levels[-1] for side in (1, 2)]
+        self.ids = [pid for level in self.levels for pid in level]
+        self._surnames = {}
+        self._years = {}
+
+    def rng(self, pid, salt=""):
+        return random.Random(f"{self.seed}:{pid}:{salt}")
+
+    def surname(self, pid):
+        if pid not in self._surnames:
+            if pid.endswith(".1"):
+                # Fathers carry the child's surname
+                name = self.surname(pid[:-2])
+            else:
+                rng = self.rng(pid, "surname")
+                middle = rng.choice(SURNAME_MIDDLES) if rng.random() < 0.4 else ""
+                name = rng.choice(SURNAME_HEADS) + middle + rng.choice(SURNAME_TAILS)
+            self._surnames[pid] = name
+        return self._surnames[pid]
+
+    def is_female(self, pid):
+        return pid.endswith(".2") or ("." not in pid and int(pid) % 2 == 0)
+
+    def name(self, pid):
+        rng = self.rng(pid, "name")
+        first = rng.choice(FEMALE_NAMES if self.is_female(pid) else MALE_NAMES)
+        # About a third carry their mother's maiden name as a middle name
+        if rng.random() < 0.35:
+            return f"{first} {self.surname(pid + '.2')} {self.surname(pid)}"
+        return f"{first} {self.surname(pid)}"
+
+    def birth_year(self, pid):
+        if pid not in self._years:
+            rng = self.rng(pid, "born")
+            if "." in pid:
+                self._years[pid] = self.birth_year(pid.rsplit(".", 1)[0]) - rng.randint(20, 40)
+            else:
+                self._years[pid] = rng.randint(1880, 1960)
+        return self._years[pid]
+
+    def date(self, rng, year):
+        style = rng.random()
+        if style < 0.45:
+            return f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{year}"
+        if style < 0.65:
+            return str(year)
+        if style < 0.75:
+            return f"c. {year}"
+        if style < 0.85:
+            return f"{rng.choice(['bef.', 'aft.'])} {year}"
+        if style < 0.95:
+            return f"{rng.randint(1, 28)} {rng.choice(MONTHS)} {year}"
+        return "Unknown"
+
+    def vital(self, rng, year):
+        date = self.date(rng, year)
+        location = rng.choice(LOCATIONS)
+        if rng.random() < 0.05:
+            location += f" ({rng.choice(['Main St.', 'the old homestead', 'First Church'])})"
+        return f"{date} in {location}" if rng.random() < 0.3 else f"{date}, {location}"
+
+    def notes(self, rng, pid, born):
+        he = "She" if self.is_female(pid) else "He"
+        first = self.name(pid).split()[0]
+        sentences = [f"{first} was a {rng.choice(OCCUPATIONS)} in {rng.choice(LOCATIONS[:20])}."]
+        if rng.random() < 0.3:
+            sentences.append(f"In {born + rng.randint(18, 40)} {he.lower()} moved to {rng.choice(LOCATIONS[:20])}.")
+        if rng.random() < 0.08:
+            sentences.append(f"{he} sailed on the {rng.choice(SHIPS)} in {born + rng.randint(15, 30)}.")
+        if rng.random() < 0.04:
+            sentences.append(f"[Ship: {rng.choice(SHIPS)} | Year: {born + 20} | Departure: {rng.choice(LOCATIONS[20:25])} "
+                             f"| Arrival: {rng.choice(LOCATIONS[:10])}]")
+        if rng.random() < 0.1:
+            sentences.append(f"[{rng.choice(['Friend', 'Witness', 'Neighbor'])}: {self.name(rng.choice(self.ids))}]")
+        if rng.random() < 0.2:
+            # Cross-mention of someone elsewhere in the tree, usually a contemporary
+            other = rng.choice(self.ids)
+            sentences.append(f"{he} was {rng.choice(RELATIONS)} {self.name(other)}.")
+        if pid.endswith(".2") and rng.random() < 0.5:
+            sentences.append(f"{he} married {self.name(pid[:-1] + '1')} in {born + rng.randint(18, 28)}.")
+        return " ".join(sentences)
+
+    def children(self, rng, pid):
+        # The child in the tree plus a few siblings who have no profile of their own
+        child = pid.rsplit(".", 1)[0]
+        entries = [f"{self.name(child)} ({self.birth_year(child)})"]
+        for _ in range(rng.randint(0, 3)):
+            year = self.birth_year(child) + rng.randint(-8, 8)
+            first = rng.choice(MALE_NAMES + FEMALE_NAMES)
+            entries.append(f"{first} {self.surname(child)} ({year}-{year + rng.randint(1, 80)})")
+        return "; ".join(entries)
+
+    def profile_paragraphs(self, pid):
+        rng = self.rng(pid)
+        born = self.birth_year(pid)
+        name = self.name(pid)
+        if rng.random() < 0.01:
+            name = f"(UNKNOWN) {self.surname(pid)}"
+        yield f"{name} {{{pid}}}"
+        yield f"Born: {self.vital(rng, born)}"
+        if pid.endswith(".1") and pid[:-1] + "2" in self._present:
+            yield f"Married: {self.date(rng, born + 24)} to {self.name(pid[:-1] + '2')}"
+        yield f"Died: {self.vital(rng, born + rng.randint(30, 85))}"
+        if "." in pid:
+            yield f"Children: {self.children(rng, pid)}"
+        yield f"NOTES: {self.notes(rng, pid, born)}"
+
+    def paragraphs(self):
+        self._present = set(self.ids)
+        for depth, level in enumerate(self.levels):
+            greats = depth - 2
+            title = {0: "PROBANDS", 1: "PARENTS", 2: "GRANDPARENTS"}.get(depth, f"{greats} GREAT GRANDPARENTS")
+            yield f"GENERATION {roman(FIRST_GENERATION + depth)}: {title}"
+            for pid in level:
+                yield from self.profile_paragraphs(pid)
+
+
+def write_synthetic_tree(path, profile_count, seed=7):
+    """Writes the document and returns the number of paragraphs."""
+    tree = SyntheticTree(profile_count, seed)
+    count = 0
+
+    def counted():
+        nonlocal count
+        for text in tree.paragraphs():
+            count += 1
+            yield text
+
+    write_docx(path, counted())
+    return count
+
+
+def write_sources(path, docx_path, lineage="Synthetic"):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"documents": [{"lineage": lineage,
+                                  "path": os.path.relpath(docx_path, os.path.dirname(os.path.abspath(path)))}]},
+                  f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic lineage document")
+    parser.add_argument("output", help="Path of the .docx to write")
+    parser.add_argument("--profiles", type=int, default=1000, help="Number of ancestor profiles (default: 1000)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--sources", help="Also write a pipeline sources config for the document here")
+    args = parser.parse_args()
+
+    paragraphs = write_synthetic_tree(args.output, args.profiles, args.seed)
+    print(f"Wrote {args.output}: {args.profiles} profiles, {paragraphs} paragraphs, "
+          f"{os.path.getsize(args.output) / 1e6:.1f} MB")
+    if args.sources:
+        write_sources(args.sources, args.output)
+        print(f"Wrote {args.sources}")
@@ -0,0 +1,328 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+DEFAULT_CACHE_DB = "./.pipeline_cache/enrichment.sqlite"
+
+# The JSON files each namespace is exported to (and seeded from)
+EXPORT_PATHS = {
+    "ships": "./kinship-app/public/data/ship_cache.json",
+    "wikimedia": "./kinship-app/public/data/wikimedia_cache.json",
+    "geocoding": "./kinship-app/src/geocoding_cache.json",
+}
+
+# Entry kinds: a found value, a lookup that ran cleanly and found nothing,
+# and a lookup that failed (timeout, API error) and should be retried
+HIT = "hit"
+NEGATIVE = "negative"
+ERROR = "error"
+
+DAY = 24 * 60 * 60
+
+
+class RetryPolicy:
+    """
+    How long each kind of entry is trusted before its key is looked up
+    again. Hits never expire by default, negatives expire after
+    negative_ttl, and errors back off exponentially from error_backoff up to
+    max_error_backoff with each consecutive failure.
+
+    With refresh_negatives, negative and error entries written before the
+    policy was created are treated as stale, so each is retried once this
+    run.
+    """
+
+    def __init__(self, hit_ttl=None, negative_ttl=90 * DAY, error_backoff=60 * 60,
+                 max_error_backoff=7 * DAY, refresh_negatives=False, clock=time.time):
+        self.hit_ttl = hit_ttl
+        self.negative_ttl = negative_ttl
+        self.error_backoff = error_backoff
+        self.max_error_backoff = max_error_backoff
+        self.refresh_negatives = refresh_negatives
+        self._clock = clock
+        self.started_at = clock()
+        # Freshness checks per namespace, e.g. {"ships_hits": 12, "ships_misses": 3}
+        self.lookups = defaultdict(int)
+
+    def ttl(self, kind, attempts=1):
+        """Seconds an entry of this kind stays fresh, or None for forever."""
+        if kind == HIT:
+            return self.hit_ttl
+        if kind == NEGATIVE:
+            return self.negative_ttl
+        return min(self.error_backoff * 2 ** max(0, attempts - 1), self.max_error_backoff)
+
+    def is_fresh(self, store, key):
+        """True when the cached entry can be used without a network call."""
+        fresh = self._is_fresh(store, key)
+        self.lookups[f"{store.namespace}_{'hits' if fresh else 'misses'}"] += 1
+        return fresh
+
+    def _is_fresh(self, store, key):
+        if key not in store:
+            return False
+
+        kind = store.kind(key)
+        updated_at = store.updated_at(key)
+        if self.refresh_negatives and kind != HIT and updated_at < self.started_at:
+            return False
+
+        ttl = self.ttl(kind, store.attempts(key))
+        return ttl is None or self._clock() - updated_at < ttl
+
+
+class CacheStore:
+    """
+    Persistent key -> JSON value cache for one enrichment namespace (ships,
+    geocoding, wikimedia), stored in a SQLite file shared by all of them.
+
+    Reads come from an in-memory copy loaded at open, so it behaves like the
+    dict it replaces. Writes are buffered and committed in small batches, each
+    in one SQLite transaction, so a crash loses at most the last unflushed
+    batch and never leaves a half-written file. Every entry records its kind
+    (hit, negative or error), when it was last written and, for errors, how
+    many times in a row the lookup has failed.
+
+    The committed JSON file the frontend reads (seed_json) is imported on
+    open for any key the store does not have yet; export_json() writes it
+    back out.
+    """
+
+    def __init__(self, namespace, db_path=DEFAULT_CACHE_DB, seed_json=None, batch_size=20, max_batch_age=5.0):
+        self.namespace = namespace
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_batch_age = max_batch_age
+
+        self._lock = threading.RLock()
+        self._values = {}
+        self._meta = {}  # key -> (updated_at, kind, attempts)
+        self._pending = {}
+        self._last_commit = time.monotonic()
+        self.writes = 0
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT,"
+            " updated_at REAL NOT NULL,"
+            " kind TEXT NOT NULL DEFAULT 'hit',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        # Stores created before entries were typed hold hits and None misses
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")}
+        if "kind" not in columns:
+            self._conn.execute("ALTER TABLE cache_entries ADD COLUMN kind TEXT NOT NULL DEFAULT 'hit'")
+            self._conn.execute("ALTER TABLE cache_entries ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE cache_entries SET kind = 'negative' WHERE value = 'null'")
+        self._conn.commit()
+
+        # rowid order is first-insert order, matching the old JSON files
+        rows = self._conn.execute(
+            "SELECT key, value, updated_at, kind, attempts FROM cache_entries WHERE namespace = ? ORDER BY rowid",
+            (namespace,)
+        )
+        for key, value, updated_at, kind, attempts in rows:
+            self._values[key] = json.loads(value)
+            self._meta[key] = (updated_at, kind, attempts)
+
+        if seed_json:
+            self._import_json(seed_json)
+
+    def _import_json(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError:
+                return
+        if not isinstance(data, dict):
+            return
+
+        mtime = os.path.getmtime(path)
+        new_items = [(k, v) for k, v in data.items() if k not in self._values]
+        if not new_items:
+            return
+        with self._lock:
+            for key, value in new_items:
+                # A null in the exported file is a miss of unknown cause; it
+                # ages out like any other negative
+                self._write(key, value, mtime, HIT if value is not None else NEGATIVE, 0)
+            self.commit()
+
+    # --- dict protocol ---
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(list(self._values))
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def keys(self):
+        return list(self._values)
+
+    def items(self):
+        return list(self._values.items())
+
+    # --- entry metadata ---
+
+    def updated_at(self, key):
+        """Unix time the entry was last written, or None if it is not cached."""
+        meta = self._meta.get(key)
+        return meta[0] if meta else None
+
+    def kind(self, key):
+        meta = self._meta.get(key)
+        return meta[1] if meta else None
+
+    def attempts(self, key):
+        """Consecutive failed lookups for an error entry (0 for other kinds)."""
+        meta = self._meta.get(key)
+        return meta[2] if meta else 0
+
+    def counts(self):
+        counts = {HIT: 0, NEGATIVE: 0, ERROR: 0}
+        for _, kind, _ in self._meta.values():
+            counts[kind] += 1
+        return counts
+
+    # --- persistence ---
+
+    def set(self, key, value, kind=HIT, timestamp=None):
+        """
+        Writes an entry. Negative and error entries always hold None; an
+        error on top of an error counts one more consecutive failure.
+        """
+        with self._lock:
+            if kind != HIT:
+                value = None
+            attempts = 0
+            if kind == ERROR:
+                attempts = self.attempts(key) + 1 if self.kind(key) == ERROR else 1
+
+            self._write(key, value, time.time() if timestamp is None else timestamp, kind, attempts)
+            self.writes += 1
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._last_commit >= self.max_batch_age:
+                self.commit()
+
+    def set_negative(self, key, timestamp=None):
+        self.set(key, None, NEGATIVE, timestamp)
+
+    def set_error(self, key, timestamp=None):
+        self.set(key, None, ERROR, timestamp)
+
+    def _write(self, key, value, timestamp, kind, attempts):
+        self._values[key] = value
+        self._meta[key] = (timestamp, kind, attempts)
+        self._pending[key] = (value, timestamp, kind, attempts)
+
+    def commit(self):
+        """Flushes buffered writes to the database in one transaction."""
+        with self._lock:
+            if self._pending:
+                rows = [(self.namespace, key, json.dumps(value), timestamp, kind, attempts)
+                        for key, (value, timestamp, kind, attempts) in self._pending.items()]
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO cache_entries (namespace, key, value, updated_at, kind, attempts) VALUES (?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at, "
+                        "kind = excluded.kind, attempts = excluded.attempts",
+                        rows
+                    )
+                self._pending = {}
+            self._last_commit = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self.commit()
+            self._conn.close()
+
+    def compact(self):
+        """Checkpoints the write-ahead log and rebuilds the database file."""
+        with self._lock:
+            self.commit()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+
+    def export_json(self, path, indent=4):
+        """
+        Atomically writes the namespace as a JSON object (the frontend's
+        format): hits as their value, negatives as null. Errors are left out,
+        so a failed lookup never reaches the site as a permanent miss.
+        """
+        with self._lock:
+            data = {key: value for key, value in self._values.items() if self._meta[key][1] != ERROR}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_path, path)
+
+
+def store_fingerprint(db_path=DEFAULT_CACHE_DB):
+    """
+    Cheap version stamp of the whole store: entry count and latest write
+    per namespace. Changes whenever any entry is written.
+    """
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT namespace, COUNT(*), MAX(updated_at) FROM cache_entries "
+                            "GROUP BY namespace ORDER BY namespace").fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    finally:
+        conn.close()
+    return [list(row) for row in rows]
+
+
+def export_caches(db_path=DEFAULT_CACHE_DB, compact=False):
+    """
+    Writes every namespace out to its JSON file for the frontend. A namespace
+    with no entries and no existing file is skipped.
+    """
+    for namespace, path in EXPORT_PATHS.items():
+        store = CacheStore(namespace, db_path, seed_json=path)
+        if len(store) or os.path.exists(path):
+            store.export_json(path)
+            print(f"Exported {len(store)} {namespace} entries to {path}")
+        if compact:
+            store.compact()
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the enrichment cache to the JSON files the frontend reads")
+    parser.add_argument("--db", default=DEFAULT_CACHE_DB,
+                        help=f"SQLite cache file (default: {DEFAULT_CACHE_DB})")
+    parser.add_argument("--compact", action="store_true",
+                        help="Also checkpoint the write-ahead log and vacuum the database")
+    args = parser.parse_args()
+
+    export_caches(args.db, compact=args.compact)
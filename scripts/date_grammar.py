@@ -0,0 +1,106 @@
+"""
+Fast-path grammar for the vital date strings the lineage documents use
+(docs/source_specification.md, "Dates"):
+
+    9/4/1805, Hartford, CT        M/D/YYYY, then a location
+    1829, Newburgh, NY            YYYY
+    c. 1835 / bef. 1750 / aft.    modifier + date
+    4/1702                        M/YYYY
+    1640 - 1645, 1663 or 1683     ranges and alternatives
+
+split_vital_date() returns the same (date, location) pair the dateparser
+path of split_date_location produces, or None when the string is outside
+the grammar or could be read differently by dateparser, in which case
+the caller falls back to dateparser.
+"""
+import datetime
+import re
+
+# Modifiers the pipeline recognizes in front of a date (see
+# PATTERNS.trailing_date_modifier); "living in" never reaches here because
+# strings containing " in " are split before the fast path.
+_MODIFIER = r"(?:c|ca|circa|about|abt|before|bef|by|after|aft|bet|between|fl)\.?"
+_SINGLE_DATE = r"\d{1,2}/\d{1,2}/\d{4}|\d{1,2}/\d{4}|\d{4}"
+
+_VITAL_DATE = re.compile(
+    r"^(?:(?P<modifier>" + _MODIFIER + r")\s*(?<=[.\s])\s*)?"
+    r"(?P<first>" + _SINGLE_DATE + r")"
+    r"(?:(?P<joiner>\s+[-–]\s+|\s+or\s+)(?P<second>" + _SINGLE_DATE + r"))?"
+    r"(?P<rest>.*)$",
+    re.IGNORECASE | re.DOTALL
+)
+
+# A location must follow a separator (or a space) and hold nothing dateparser
+# could read as part of a date
+_LOCATION_START = re.compile(r"^(?:\s*[,;]|\s+(?=[A-Za-z]))")
+_LOCATION_CHARS = re.compile(r"^[A-Za-z ,;.'\-()?]*$")
+_WORD = re.compile(r"[A-Za-z]+")
+
+# Words dateparser's English locale treats as date vocabulary: month and
+# weekday names, units, relative terms, ordinal suffixes and filler words
+DATE_VOCABULARY = frozenset("""
+jan january feb february mar march apr april may jun june jul july aug august
+sep sept september oct october nov november dec december
+mon monday mo tue tues tuesday tu wed wednesday we thu thursday th fri friday fr
+sat saturday sa sun sunday su
+am pm year years yr yrs month months mons week weeks wk day days hour hours hr hrs
+minute minutes min mins second seconds sec secs decade decades
+ago before after now today yesterday tomorrow noon midnight this last next till date from
+about ad and at by just nd of on rd st the in an
+one two three four five six seven eight nine ten eleven twelve later
+utc gmt est edt cst cdt mst mdt pst pdt bst
+""".split())
+
+
+def _valid_date(token):
+    parts = token.split("/")
+    try:
+        if len(parts) == 3:
+            datetime.date(int(parts[2]), int(parts[0]), int(parts[1]))
+        elif len(parts) == 2:
+            datetime.date(int(parts[1]), int(parts[0]), 1)
+    except ValueError:
+        return False
+    return True
+
+
+def _safe_location(rest):
+    if not rest.strip(",; "):
+        return True
+    if not _LOCATION_START.match(rest) or not _LOCATION_CHARS.match(rest):
+        return False
+
+    words = _WORD.findall(rest)
+    if not words:
+        return False
+    # A short token right after the date can be glued onto it ("1697, MA")
+    if len(words[0]) <= 2:
+        return False
+    for word in words:
+        if len(word) == 1 or word.lower() in DATE_VOCABULARY:
+            return False
+    return True
+
+
+def split_vital_date(text):
+    """
+    Returns (date, location) for a vital string in the documented formats,
+    or None if dateparser is needed.
+    """
+    text = text.strip()
+    m = _VITAL_DATE.match(text)
+    if not m:
+        return None
+
+    if not _valid_date(m.group("first")):
+        return None
+    if m.group("second") and not _valid_date(m.group("second")):
+        return None
+
+    rest = m.group("rest")
+    if not _safe_location(rest):
+        return None
+
+    date_part = text[:m.start("rest")].strip()
+    location = rest.strip().strip(",; ")
+    return date_part, location or "Unknown"
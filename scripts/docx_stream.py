@@ -0,0 +1,93 @@
+import zipfile
+
+from lxml import etree
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY = W_NS + "body"
+W_P = W_NS + "p"
+W_R = W_NS + "r"
+W_HYPERLINK = W_NS + "hyperlink"
+W_T = W_NS + "t"
+W_TAB = W_NS + "tab"
+W_PTAB = W_NS + "ptab"
+W_BR = W_NS + "br"
+W_CR = W_NS + "cr"
+W_NO_BREAK_HYPHEN = W_NS + "noBreakHyphen"
+W_TYPE = W_NS + "type"
+
+
+def _run_text(run):
+    # Same text equivalents python-docx uses for run inner content
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_TAB or tag == W_PTAB:
+            parts.append("\t")
+        elif tag == W_BR:
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == W_CR:
+            parts.append("\n")
+        elif tag == W_NO_BREAK_HYPHEN:
+            parts.append("-")
+    return "".join(parts)
+
+
+def paragraph_text(p):
+    """Text of a `w:p` element, matching python-docx's Paragraph.text."""
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            for run in child:
+                if run.tag == W_R:
+                    parts.append(_run_text(run))
+    return "".join(parts)
+
+
+class DocxParagraphReader:
+    """
+    Streams the body paragraphs of a .docx straight out of word/document.xml.
+
+    Iterating yields (index, text) tuples where index counts body-level
+    paragraphs exactly like enumerate(Document(path).paragraphs), so
+    doc_paragraph_index values stay compatible. Elements are cleared as soon
+    as they are read, keeping memory bounded regardless of document size.
+    """
+
+    def __init__(self, docx_path):
+        self.docx_path = docx_path
+        self._zip = zipfile.ZipFile(docx_path)
+        # Fail early (like Document() would) if this is not a Word document
+        self._zip.getinfo("word/document.xml")
+        self.paragraph_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    def __iter__(self):
+        with self._zip.open("word/document.xml") as xml:
+            for _, elem in etree.iterparse(xml, events=("end",), resolve_entities=False, huge_tree=True):
+                parent = elem.getparent()
+                # Only direct children of w:body are complete units we can act on;
+                # paragraphs inside tables or content controls are not body paragraphs.
+                if parent is None or parent.tag != W_BODY:
+                    continue
+
+                if elem.tag == W_P:
+                    yield self.paragraph_count, paragraph_text(elem)
+                    self.paragraph_count += 1
+
+                # Free the finished element and anything already read before it
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
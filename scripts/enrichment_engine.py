@@ -0,0 +1,54 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EnrichmentJob:
+    """
+    One service's share of the enrichment stage: the distinct keys it has to
+    look up and the blocking function that resolves one key. At most
+    `concurrency` lookups for the job run at once; request rate limits stay
+    inside the services, next to the network calls they protect.
+    """
+
+    def __init__(self, name, keys, resolve, concurrency=1):
+        self.name = name
+        self.keys = list(keys)
+        self.resolve = resolve
+        self.concurrency = max(1, concurrency)
+        self.seconds = 0.0
+
+
+async def _run_job(job, loop, executor):
+    semaphore = asyncio.Semaphore(job.concurrency)
+
+    async def resolve(key):
+        async with semaphore:
+            return await loop.run_in_executor(executor, job.resolve, key)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(resolve(key) for key in job.keys))
+    job.seconds = time.perf_counter() - start
+    return results
+
+
+async def _run_jobs(jobs):
+    loop = asyncio.get_running_loop()
+    # Sized so every job can reach its cap at the same time
+    workers = sum(job.concurrency for job in jobs)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return await asyncio.gather(*(_run_job(job, loop, executor) for job in jobs))
+
+
+def run_enrichment(jobs):
+    """
+    Runs every job's lookups concurrently, so the stage takes about as long
+    as its slowest service rather than the sum of all of them. Returns
+    {job name: [result per key, in key order]}.
+    """
+    jobs = [job for job in jobs if job.keys]
+    if not jobs:
+        return {}
+
+    results = asyncio.run(_run_jobs(jobs))
+    return {job.name: job_results for job, job_results in zip(jobs, results)}
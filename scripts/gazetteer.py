@@ -0,0 +1,208 @@
+import json
+import os
+
+from pipeline_patterns import PATTERNS
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.json")
+
+US_STATES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "florida": "FL", "georgia": "GA",
+    "hawaii": "HI", "idaho": "ID", "illinois": "IL", "indiana": "IN", "iowa": "IA",
+    "kansas": "KS", "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS", "missouri": "MO",
+    "montana": "MT", "nebraska": "NE", "nevada": "NV", "new hampshire": "NH", "new jersey": "NJ",
+    "new mexico": "NM", "new york": "NY", "north carolina": "NC", "north dakota": "ND", "ohio": "OH",
+    "oklahoma": "OK", "oregon": "OR", "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC",
+    "south dakota": "SD", "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT",
+    "virginia": "VA", "washington": "WA", "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+    # Old-style abbreviations seen in the documents
+    "conn": "CT", "mass": "MA", "penn": "PA", "penna": "PA", "n.y": "NY", "n.j": "NJ", "n.h": "NH",
+    "r.i": "RI", "vt": "VT", "me": "ME", "va": "VA", "md": "MD",
+}
+US_STATE_CODES = frozenset(US_STATES.values())
+
+# Trailing segments naming a country, mapped to the country used in the
+# index (_parse_location_hierarchy reports England as "UK")
+COUNTRIES = {
+    "usa": "USA", "us": "USA", "u.s.a": "USA", "united states": "USA", "america": "USA",
+    "england": "UK", "eng": "UK", "uk": "UK", "great britain": "UK", "britain": "UK",
+    "scotland": "Scotland", "wales": "Wales", "ireland": "Ireland",
+    "holland": "Netherlands", "netherlands": "Netherlands", "the netherlands": "Netherlands",
+    "france": "France", "germany": "Germany", "canada": "Canada",
+}
+
+COMPASS = {"N": "North", "S": "South", "E": "East", "W": "West"}
+
+
+def normalize_location(text):
+    """
+    Canonical form of a location string: qualifiers ("assume", "probably")
+    and parentheticals dropped, segments trimmed of stray punctuation,
+    "Simsbury CT" split into "Simsbury, CT", US state names and old
+    abbreviations turned into postal codes, "E. Greenwich" spelled out and
+    "County" suffixes removed.
+    Returns "" when nothing is left.
+    """
+    if not text:
+        return ""
+
+    text = PATTERNS.parenthetical.sub("", text)
+    text = PATTERNS.location_qualifier.sub("", text.strip())
+    segments = []
+    for segment in text.replace(";", ",").split(","):
+        segment = PATTERNS.repeated_space.sub(" ", segment).strip(" .?*[]<>")
+        segment = PATTERNS.compass_prefix.sub(lambda m: COMPASS[m.group(1)] + " ", segment)
+        if segment:
+            segments.append(segment)
+    if not segments:
+        return ""
+
+    match = PATTERNS.location_city_state.match(segments[-1])
+    if match and match.group(2) in US_STATE_CODES:
+        segments[-1:] = [match.group(1), match.group(2)]
+
+    canonical = []
+    for segment in segments:
+        lowered = segment.lower().rstrip(".")
+        # A state name after the town ("Hartford, Connecticut"), or on its own
+        if lowered in US_STATES and (canonical or len(segments) == 1):
+            canonical.append(US_STATES[lowered])
+        elif lowered in COUNTRIES and COUNTRIES[lowered] == "UK":
+            canonical.append("England")
+        else:
+            canonical.append(PATTERNS.county_suffix.sub("", segment))
+
+    # "Boston, MA, USA" reads as "Boston, MA"
+    if len(canonical) > 1 and canonical[-1].lower() in COUNTRIES and COUNTRIES[canonical[-1].lower()] == "USA" \
+            and canonical[-2] in US_STATE_CODES:
+        canonical.pop()
+    return ", ".join(canonical)
+
+
+class Gazetteer:
+    """
+    Offline coordinates for places (town, state or county, country),
+    regions (states, counties, colonies) and countries, loaded from
+    gazetteer.json. resolve() walks down the hierarchy: the place itself,
+    then its region, then its country.
+    """
+
+    def __init__(self, parse_hierarchy, path=GAZETTEER_PATH, default_country="USA"):
+        self.parse_hierarchy = parse_hierarchy
+        # Bare town names ("Windsor") in the documents almost always mean
+        # the colonial town, so ties are broken in favour of this country
+        self.default_country = default_country
+        self.places = {}         # (name, region) -> [(country, lat, lng)]
+        self.places_by_name = {}  # name -> [(region, country, lat, lng)]
+        self.regions = {}        # name -> [(country, lat, lng)]
+        self.countries = {}      # country -> (lat, lng)
+        self._memo = {}
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for name, region, country, lat, lng in data["places"]:
+            name_key, region_key = self._key(name), self._key(region)
+            self.places.setdefault((name_key, region_key), []).append((country, lat, lng))
+            self.places_by_name.setdefault(name_key, []).append((region_key, country, lat, lng))
+        # Regions the places are filed under; a place missing from one of
+        # these falls back to the region rather than a namesake elsewhere
+        self.place_regions = {region for _, region in self.places if region}
+        for name, country, lat, lng in data["regions"]:
+            self.regions.setdefault(self._key(name), []).append((country, lat, lng))
+        for country, lat, lng in data["countries"]:
+            self.countries[country] = (lat, lng)
+
+    @staticmethod
+    def _key(value):
+        return value.casefold() if value else None
+
+    def place_key(self, location):
+        """(name, region, country) for a location string, or None. Any part may be None."""
+        canonical = normalize_location(location)
+        if not canonical:
+            return None
+        hierarchy = self.parse_hierarchy(canonical)
+        if not hierarchy:
+            return None
+
+        segments = canonical.split(", ")
+        country = hierarchy["country"] or segments[-1]
+        country = COUNTRIES.get(country.lower())
+        if len(segments) == 1:
+            if canonical in US_STATE_CODES:
+                return None, canonical, "USA"
+            if country:
+                return None, None, country
+            return hierarchy["city"], None, None
+
+        if country == "USA":
+            region = hierarchy["state"]
+            region = US_STATES.get(region.lower().rstrip("."), region) if region else None
+        elif hierarchy["country"] is None and country is None:
+            # "Norwich, Norfolk": town and region, country unstated
+            region = hierarchy["state"]
+        else:
+            # Town, [parish,] county, country
+            region = segments[-2] if len(segments) >= 3 else None
+        return hierarchy["city"], region, country
+
+    def resolve(self, location):
+        """
+        Returns (coords, level) where level is "place", "region" or
+        "country", or (None, None). Town-level hits are exact points (tier 1);
+        region and country centroids are tier 3, as in the app's map.
+        """
+        if location in self._memo:
+            return self._memo[location]
+        result = self._resolve(location)
+        self._memo[location] = result
+        return result
+
+    def _pick(self, candidates, country, prefer=None):
+        # Unique after filtering on the country, when one is known
+        if country:
+            candidates = [c for c in candidates if c[0] == country]
+        elif prefer and len(candidates) > 1:
+            candidates = [c for c in candidates if c[0] == prefer]
+        return candidates[0] if len(candidates) == 1 else None
+
+    def _region_country(self, region_key):
+        hit = self._pick(self.regions.get(region_key, []), None)
+        return hit[0] if hit else None
+
+    def _resolve(self, location):
+        key = self.place_key(location)
+        if key is None:
+            return None, None
+        name, region, country = key
+        name_key, region_key = self._key(name), self._key(region)
+
+        # 1. The place itself
+        if name_key:
+            hit = None
+            if region_key:
+                hit = self._pick(self.places.get((name_key, region_key), []), country)
+            if not hit and (not region_key or region_key not in self.place_regions
+                            and region.upper() not in US_STATE_CODES):
+                # No region, or one the places are not filed under
+                # ("Jamaica, Queens", "Hempstead, New Netherlands"): go by
+                # name within the region's country
+                named = [(c, lat, lng) for _, c, lat, lng in self.places_by_name.get(name_key, [])]
+                within = country or (self._region_country(region_key) if region_key else None)
+                hit = self._pick(named, within, prefer=self.default_country)
+            if hit:
+                return {"lat": hit[1], "lng": hit[2], "tier": 1}, "place"
+
+        # 2. Its region; a lone name may itself be a county or colony
+        for region_name in (region_key, name_key if not region_key else None):
+            if region_name:
+                hit = self._pick(self.regions.get(region_name, []), country)
+                if hit:
+                    return {"lat": hit[1], "lng": hit[2], "tier": 3}, "region"
+
+        # 3. Its country
+        if country in self.countries:
+            lat, lng = self.countries[country]
+            return {"lat": lat, "lng": lng, "tier": 3}, "country"
+        return None, None
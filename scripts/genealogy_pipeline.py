@@ -1,25 +1,68 @@
-import re
 import json
+import argparse
+import copy
+import inspect
+import bisect
+import contextlib
 import os
 import requests
 import time
 import hashlib
+import functools
 import datetime
-from docx import Document
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import dateparser
 import dateparser.search
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
+from docx_stream import DocxParagraphReader
+import pipeline_patterns
+from pipeline_patterns import PATTERNS, EAST_COAST_NAMES, WESTWARD_NAMES
+import date_grammar
+from date_grammar import split_vital_date
+from wikimedia_images import WikimediaImageService, image_cache_key
+from enrichment_engine import EnrichmentJob, run_enrichment
+from rate_limit import TokenBucket
+from cache_store import CacheStore, RetryPolicy, DEFAULT_CACHE_DB, EXPORT_PATHS, store_fingerprint
+from gazetteer import Gazetteer, GAZETTEER_PATH
+from stage_runner import Stage, StageRunner, file_fingerprint
+from pipeline_metrics import PipelineMetrics, DEFAULT_METRICS_PATH, report_comparison
+from pipeline_profiler import PROFILE_ENV, DEFAULT_PROFILE_DIR, profiler_from_env
+import profile_model
+from profile_model import Profile, new_profile, as_dict
+from intern_table import STRINGS
+import json_stream
+from json_stream import OutputGroup
+import mention_scanner
+from mention_scanner import MentionScanner, merge_scan_log, new_scan_log, scan_in_parallel
+import name_matcher
 
 class ShipEnrichmentService:
-    def __init__(self):
+    MODEL = "gemini-2.0-flash"
+    # Every spec record, single or batched, carries exactly these keys
+    SPEC_FIELDS = (
+        ("year_built", "string"),
+        ("location_built", "string"),
+        ("deck_length", "string"),
+        ("beam", "string"),
+        ("gross_tonnage", "string"),
+        ("masts", "string or int"),
+        ("owner", "string"),
+        ("description", "short string, max 20 words"),
+    )
+
+    def __init__(self, cache_db=DEFAULT_CACHE_DB, retry_policy=None, batch_size=20):
         print("Initializing GenAI API...")
         load_dotenv()
-        self.cache_file = "./kinship-app/public/data/ship_cache.json"
+        self.cache_file = EXPORT_PATHS["ships"]
+        self.cache_db = cache_db
         self.cache = self.load_cache()
-        self.cache_updated = False
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.batch_size = max(1, batch_size)
+        self.request_delay = 1
+        self.requests_made = 0
         self.api_key = os.environ.get("VITE_GEMINI_API_KEY")
         if self.api_key == None:
             self.api_key = os.getenv("VITE_GEMINI_API_KEY")
@@ -34,30 +77,24 @@ class ShipEnrichmentService:
             print("Failed to load API key")
 
     def load_cache(self):
-        if os.path.exists(self.cache_file):
-            with open(self.cache_file, "r") as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return {}
-        return {}
+        return CacheStore("ships", self.cache_db, seed_json=self.cache_file)
 
     def save_cache(self):
-        if self.cache_updated:
-            with open(self.cache_file, "w") as f:
-                json.dump(self.cache, f, indent=4)
+        self.cache.commit()
+        if self.cache.writes:
+            self.cache.export_json(self.cache_file)
             print("Ship cache saved.")
 
     def enrich_ship(self, ship_name):
         if not ship_name:
             return None
 
-        # Check Cache
-        if ship_name in self.cache:
+        # Check Cache (known misses and recent failures are not re-queried)
+        if self.retry_policy.is_fresh(self.cache, ship_name):
             return self.cache[ship_name]
 
         if not self.client:
-            return None
+            return self.cache.get(ship_name)
 
         print(f"   [ShipInfo] Querying AI for '{ship_name}'...")
         try:
@@ -66,23 +103,10 @@ class ShipEnrichmentService:
             Return ONLY a JSON object with the following keys. If specific data is unknown, use "Unknown".
 
             Keys:
-            - year_built (string)
-            - location_built (string)
-            - deck_length (string)
-            - beam (string)
-            - gross_tonnage (string)
-            - masts (string or int)
-            - owner (string)
-            - description (short string, max 20 words)
+{self._spec_key_lines()}
             """
 
-            response = self.client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json"
-                )
-            )
+            response = self._generate(prompt)
 
             if response.text:
                 data = json.loads(response.text)
@@ -91,25 +115,147 @@ class ShipEnrichmentService:
                     data = data[0]
 
                 self.cache[ship_name] = data
-                self.cache_updated = True
                 # Polite delay
-                time.sleep(1)
+                time.sleep(self.request_delay)
                 return data
 
+            # An empty answer is a clean miss
+            self.cache.set_negative(ship_name)
+
         except Exception as e:
             print(f"   [ShipInfo] Error enriching '{ship_name}': {e}")
+            # Retried after a backoff rather than on every run
+            self.cache.set_error(ship_name)
 
-        # Cache miss as None if failed, or maybe we want to retry later?
-        # For now, let's not cache failures permanently, or maybe cache a 'checked' state.
-        # But for simplicity, we just return None.
         return None
 
+    def _spec_key_lines(self):
+        return "\n".join(f"            - {key} ({kind})" for key, kind in self.SPEC_FIELDS)
+
+    def _generate(self, prompt):
+        self.requests_made += 1
+        return self.client.models.generate_content(
+            model=self.MODEL,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json"
+            )
+        )
+
+    def _valid_spec(self, record):
+        if not isinstance(record, dict):
+            return False
+        for key, _ in self.SPEC_FIELDS:
+            value = record.get(key)
+            if isinstance(value, bool) or not isinstance(value, (str, int)):
+                return False
+        return True
+
+    def ship_batches(self, ship_names):
+        """
+        Splits the ships that need a lookup (not cached, or stale) into
+        request-sized batches. Empty when there is no client to ask.
+        """
+        pending = []
+        for name in ship_names:
+            if name and name not in pending and not self.retry_policy.is_fresh(self.cache, name):
+                pending.append(name)
+        if not self.client:
+            return []
+        return [pending[start:start + self.batch_size] for start in range(0, len(pending), self.batch_size)]
+
+    def enrich_ships(self, ship_names):
+        """
+        Fills the cache for every ship that needs a lookup, packing up to
+        batch_size names into each request. Ships missing from a batch answer
+        or failing validation fall back to single requests. Returns the
+        number of ships looked up.
+        """
+        batches = self.ship_batches(ship_names)
+        if not batches:
+            return 0
+
+        print(f"--- Enriching {sum(len(b) for b in batches)} ships in batches of up to {self.batch_size} ---")
+        for batch in batches:
+            self.enrich_batch(batch)
+        self.cache.commit()
+        return sum(len(b) for b in batches)
+
+    def enrich_batch(self, names):
+        if len(names) == 1:
+            self.enrich_ship(names[0])
+            return
+
+        print(f"   [ShipInfo] Querying AI for {len(names)} ships...")
+        ship_list = "\n".join(f"            - {json.dumps(name)}" for name in names)
+        prompt = f"""
+            Provide historical specifications for each of the ships below (likely 17th-19th century context).
+            Return ONLY a JSON object that maps each ship name, exactly as written, to an object with the
+            following keys. If specific data is unknown, use "Unknown". If you have no record of a ship at all,
+            map its name to null.
+
+            Ships:
+{ship_list}
+
+            Keys:
+{self._spec_key_lines()}
+            """
+
+        try:
+            response = self._generate(prompt)
+        except Exception as e:
+            print(f"   [ShipInfo] Error enriching batch of {len(names)}: {e}")
+            for name in names:
+                self.cache.set_error(name)
+            return
+
+        try:
+            answer = json.loads(response.text or "")
+        except json.JSONDecodeError:
+            answer = None
+        if not isinstance(answer, dict):
+            # Usually a response cut off at the output limit: halve and retry
+            print(f"   [ShipInfo] Unusable answer for {len(names)} ships, splitting the batch")
+            middle = len(names) // 2
+            self.enrich_batch(names[:middle])
+            self.enrich_batch(names[middle:])
+            return
+
+        time.sleep(self.request_delay)
+        retry = []
+        for name in names:
+            if name in answer and answer[name] is None:
+                self.cache.set_negative(name)
+            elif self._valid_spec(answer.get(name)):
+                record = answer[name]
+                self.cache[name] = {key: record[key] for key, _ in self.SPEC_FIELDS}
+            else:
+                retry.append(name)
+
+        for name in retry:
+            self.enrich_ship(name)
+
 class GeocodingService:
-    def __init__(self):
-        self.cache_file = "./kinship-app/src/geocoding_cache.json"
+    # Resolution tiers in the order geocode() tries them, for the coverage report
+    TIERS = ["hardcoded", "historical", "region_table", "gazetteer_place", "cache", "api",
+             "gazetteer_region", "gazetteer_country", "miss"]
+
+    API_URL = "https://nominatim.openstreetmap.org/search"
+
+    def __init__(self, cache_db=DEFAULT_CACHE_DB, retry_policy=None, gazetteer=None, api_enabled=False, api_url=API_URL):
+        self.cache_file = EXPORT_PATHS["geocoding"]
+        self.cache_db = cache_db
         self.cache = self.load_cache()
-        self.cache_updated = False
-        self.api_enabled = True
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Nominatim lookups are opt-in (--geocode-api); without them places
+        # the tables and gazetteer do not know fall back to a region centroid
+        self.api_enabled = api_enabled
+        self.api_url = api_url
+        # Nominatim's usage policy allows one request per second
+        self.rate_limiter = TokenBucket(1.0)
+        # Offline town/region/country lookups, tried before the API
+        self.gazetteer = gazetteer
+        self.reset_stats()
 
         self.HARDCODED_LOCATIONS = {
             "Hartford, CT": [41.7658, -72.6734],
@@ -220,56 +366,88 @@ class GeocodingService:
         }
 
     def load_cache(self):
-        if os.path.exists(self.cache_file):
-            with open(self.cache_file, "r") as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return {}
-        return {}
+        return CacheStore("geocoding", self.cache_db, seed_json=self.cache_file)
 
     def save_cache(self):
-        if self.cache_updated:
-            with open(self.cache_file, "w") as f:
-                json.dump(self.cache, f, indent=4)
+        self.cache.commit()
+        if self.cache.writes:
+            self.cache.export_json(self.cache_file)
             print("Geocoding cache saved.")
 
+    def needs_lookup(self, location_name):
+        """True when geocode() would have to go past the built-in tables, the gazetteer and the cache."""
+        if not location_name or location_name == "Unknown" or not self.api_enabled:
+            return False
+        if location_name in self.HARDCODED_LOCATIONS or location_name in self.HISTORICAL_LOCATIONS or location_name in self.REGION_COORDINATES:
+            return False
+        if self._gazetteer_lookup(location_name)[1] == "place":
+            return False
+        return not self.retry_policy.is_fresh(self.cache, location_name)
+
+    def reset_stats(self):
+        self.tier_counts = defaultdict(int)
+        self.tier_seconds = defaultdict(float)
+
     def geocode(self, location_name):
         if not location_name or location_name == "Unknown":
             return None
 
+        start = time.perf_counter()
+        result, tier = self._geocode(location_name)
+        self.tier_counts[tier] += 1
+        self.tier_seconds[tier] += time.perf_counter() - start
+        return result
+
+    def _gazetteer_lookup(self, location_name):
+        if self.gazetteer is None:
+            return None, None
+        return self.gazetteer.resolve(location_name)
+
+    def _geocode(self, location_name):
         # Tier 1: Hardcoded
         if location_name in self.HARDCODED_LOCATIONS:
-            return {"lat": self.HARDCODED_LOCATIONS[location_name][0], "lng": self.HARDCODED_LOCATIONS[location_name][1], "tier": 1}
+            return {"lat": self.HARDCODED_LOCATIONS[location_name][0], "lng": self.HARDCODED_LOCATIONS[location_name][1], "tier": 1}, "hardcoded"
 
         # Tier 2: Historical
         if location_name in self.HISTORICAL_LOCATIONS:
-            return {"lat": self.HISTORICAL_LOCATIONS[location_name][0], "lng": self.HISTORICAL_LOCATIONS[location_name][1], "tier": 2}
+            return {"lat": self.HISTORICAL_LOCATIONS[location_name][0], "lng": self.HISTORICAL_LOCATIONS[location_name][1], "tier": 2}, "historical"
 
         # Tier 3: Regions (Exact match)
         if location_name in self.REGION_COORDINATES:
-            return {"lat": self.REGION_COORDINATES[location_name][0], "lng": self.REGION_COORDINATES[location_name][1], "tier": 3}
+            return {"lat": self.REGION_COORDINATES[location_name][0], "lng": self.REGION_COORDINATES[location_name][1], "tier": 3}, "region_table"
+
+        # Offline gazetteer: town-level hits are as good as the tables above
+        coords, level = self._gazetteer_lookup(location_name)
+        if level == "place":
+            return coords, "gazetteer_place"
 
-        # Check Cache
-        if location_name in self.cache:
-            return self.cache[location_name]
+        # Check Cache: a fresh miss or failure skips the API until its TTL runs out
+        fresh = self.retry_policy.is_fresh(self.cache, location_name)
+        if fresh and self.cache[location_name]:
+            return self.cache[location_name], "cache"
 
         # Tier 4: API
-        if not self.api_enabled:
-            return None
+        if self.api_enabled and not fresh:
+            result = self._query_api(location_name)
+            if result:
+                return result, "api"
+
+        # Nothing better than the region or country centroid
+        if coords:
+            return coords, f"gazetteer_{level}"
+        return None, "miss"
 
+    def _query_api(self, location_name):
         try:
-            return None
             print(f"   [Geocoding] Querying API for '{location_name}'...")
-            time.sleep(1.1)
-            url = "https://nominatim.openstreetmap.org/search"
+            self.rate_limiter.acquire()
             params = {
                 "q": location_name,
                 "format": "json",
                 "limit": 1
             }
             headers = {"User-Agent": "GenealogyApp/1.0 (contact@example.com)"}
-            response = requests.get(url, params=params, headers=headers, timeout=2)
+            response = requests.get(self.api_url, params=params, headers=headers, timeout=2)
             data = response.json()
 
             if data:
@@ -277,20 +455,335 @@ class GeocodingService:
                 lng = float(data[0]["lon"])
                 result = {"lat": lat, "lng": lng, "tier": 4}
                 self.cache[location_name] = result
-                self.cache_updated = True
                 return result
             else:
-                self.cache[location_name] = None
-                self.cache_updated = True
+                self.cache.set_negative(location_name)
                 return None
         except Exception as e:
+            print(f"   [Geocoding] Error querying API for '{location_name}': {e}")
+            self.cache.set_error(location_name)
+            return None
+
+    def report_coverage(self):
+        """Prints how many lookups each tier answered and how fast."""
+        total = sum(self.tier_counts.values())
+        if not total:
+            return
+        print(f"--- Geocoding Coverage ({total} lookups) ---")
+        for tier in self.TIERS:
+            count = self.tier_counts.get(tier, 0)
+            if count:
+                seconds = self.tier_seconds[tier]
+                rate = f"{count / seconds:,.0f}/s" if seconds else "n/a"
+                print(f"   {tier:<18} {count:>6} ({count / total:6.1%})  {rate}")
+
+class PipelineContext:
+    """
+    Shared lookup tables for one clean_and_save run: id map, birth years,
+    real-profile name index and per-profile sentence/clause splits.
+    Built once and read by child dedupe, the naming echo, Ariadne's mention
+    scan and the reverse-link stitcher instead of each rebuilding them.
+    """
+
+    def __init__(self, pipeline, profiles):
+        self.pipeline = pipeline
+        self._splits = {}
+        self._surnames = {}
+        self.set_profiles(profiles)
+
+    def set_profiles(self, profiles):
+        # Called again after child dedupe replaces the profile list
+        self.profiles = profiles
+        self.id_map = {p['id']: p for p in profiles}
+        self.birth_years = {pid: self.pipeline._get_birth_year(p) for pid, p in self.id_map.items()}
+
+        self.real_profiles = {}
+        self.child_entries = []
+        for p in profiles:
+            if p.get("metadata", {}).get("is_child_entry"):
+                self.child_entries.append(p)
+            elif p['id'] not in self.real_profiles:
+                self.real_profiles[p['id']] = p
+        self._real_name_map = None
+
+    def _build_real_name_index(self):
+        # Normalize name: remove parens, extra spaces
+        self._real_name_map = {}
+        for pid, p in self.real_profiles.items():
+            norm = PATTERNS.parenthetical.sub('', p['name']).strip().lower()
+            self._real_name_map[norm] = pid
+
+        # All names joined into one string so a substring lookup is a single find()
+        self._real_names = list(self._real_name_map.keys())
+        self._real_name_starts = []
+        offset = 0
+        for name in self._real_names:
+            self._real_name_starts.append(offset)
+            offset += len(name) + 1
+        self._real_name_blob = "\x00".join(self._real_names)
+
+    def match_real_name(self, child_name):
+        """
+        Returns the id of the first real profile (in document order) whose
+        normalized name equals child_name, or contains it when child_name is
+        longer than 5 characters. None if nothing matches.
+        """
+        if self._real_name_map is None:
+            self._build_real_name_index()
+
+        if len(child_name) <= 5:
+            return self._real_name_map.get(child_name)
+
+        if "\x00" in child_name:
+            for real_name, real_id in self._real_name_map.items():
+                if child_name in real_name:
+                    return real_id
+            return None
+
+        pos = self._real_name_blob.find(child_name)
+        if pos == -1:
+            return None
+        idx = bisect.bisect_right(self._real_name_starts, pos) - 1
+        return self._real_name_map[self._real_names[idx]]
+
+    def _text_splits(self, profile, text):
+        pid = profile['id']
+        cached = self._splits.get(pid)
+        if cached and cached[0] is text:
+            return cached
+
+        sentences = self.pipeline.split_sentences(text)
+
+        # Clause spans (same split as PATTERNS.clause_break.split(text))
+        clause_spans = []
+        clause_start = 0
+        for sep in PATTERNS.clause_break.finditer(text):
+            clause_spans.append((clause_start, sep.start()))
+            clause_start = sep.end()
+        clause_spans.append((clause_start, len(text)))
+
+        cached = (text, sentences, clause_spans)
+        self._splits[pid] = cached
+        return cached
+
+    def sentences(self, profile, text):
+        return self._text_splits(profile, text)[1]
+
+    def clause_spans(self, profile, text):
+        return self._text_splits(profile, text)[2]
+
+    def surnames(self, profile):
+        """Returns (surname, maiden_name) for a profile, parsed once per run."""
+        pid = profile['id']
+        cached = self._surnames.get(pid)
+        if cached and cached[0] is profile:
+            return cached[1], cached[2]
+
+        # 1. Last Name
+        parts = PATTERNS.name_suffix.sub('', profile['name']).split()
+        surname = parts[-1].strip(".,")
+
+        # 2. Maiden Name in Parens: "Mary (Greene) Wainwright"
+        maiden_match = PATTERNS.maiden_name.search(profile['name'])
+        maiden = maiden_match.group(1).strip() if maiden_match else ""
+
+        self._surnames[pid] = (profile, surname, maiden)
+        return surname, maiden
+
+class ParseCache:
+    """
+    Persistent per-lineage store of derived profile-block data, keyed on a hash
+    of the paragraphs that make up each block. Entries are only valid for the
+    parser code fingerprint they were written with.
+    """
+
+    def __init__(self, path, parser_fingerprint, enabled=True):
+        self.path = path
+        self.parser_fingerprint = parser_fingerprint
+        self.enabled = enabled
+        self.entries = {}
+        self.used = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty_ids = []
+
+        if enabled and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    data = {}
+            if data.get("parser") == parser_fingerprint:
+                self.entries = data.get("blocks", {})
+
+    def fingerprint(self, lines):
+        # Offsets are part of the key: child entries record their paragraph position
+        payload = json.dumps(lines, ensure_ascii=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
             return None
+        self.hits += 1
+        self.used[key] = entry
+        return entry["lines"]
+
+    def put(self, key, line_ops, profile_ids):
+        self.misses += 1
+        self.dirty_ids.extend(profile_ids)
+        self.used[key] = {"profiles": profile_ids, "lines": line_ops}
+
+    def save(self):
+        if not self.enabled:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Only blocks seen in this run are kept, so stale blocks do not accumulate
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"parser": self.parser_fingerprint, "blocks": self.used}, f)
+        os.replace(tmp_path, self.path)
+
+class DateCache:
+    """
+    Persistent store of raw Born/Died strings -> (date, location, year_int).
+    Entries are only valid for the date-parser version stamp they were
+    written with; unlike the parse cache, entries are kept across runs even
+    when unused, since a date string tends to come back after a block edit.
+    """
+
+    def __init__(self, path, version, enabled=True):
+        self.path = path
+        self.version = version
+        self.enabled = enabled
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+
+        if enabled and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    data = {}
+            if data.get("version") == version:
+                self.entries = data.get("dates", {})
+
+    def get(self, raw):
+        entry = self.entries.get(raw)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, raw, value):
+        self.entries[raw] = list(value)
+        self.dirty = True
+
+    def save(self):
+        if not self.enabled or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "dates": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+def new_date_stats():
+    return {"disk_hits": 0, "disk_misses": 0, "split_hits": 0, "split_misses": 0,
+            "normalize_hits": 0, "normalize_misses": 0, "split_fallbacks": 0, "normalize_fallbacks": 0}
+
+def _hit_rate(hits, misses):
+    total = hits + misses
+    return f"{hits}/{total} ({100.0 * hits / total:.0f}%)" if total else "0/0"
+
+# Lineage documents parsed when no sources config is present
+SOURCES_CONFIG = "pipeline_sources.json"
+FAMILY_DATA_OUTPUT = "kinship-app/public/data/family_data.json"
+LOCATIONS_OUTPUT = "kinship-app/public/data/locations.json"
+# Written next to family_data.json: the slim list the app paints first, and
+# the full profiles split into one detail file per lineage and generation
+FAMILY_INDEX_NAME = "family_index.json"
+DETAILS_DIR_NAME = "details"
+DEFAULT_SOURCES = [
+    ("Paternal", "GENEALOGY DSD Paternal Ancestry.docx"),
+    ("Maternal", "GENEALOGY DSD Maternal Ancestry.docx")
+]
 
 class GenealogyTextPipeline:
+    # Methods whose source determines the derived block data; editing any of
+    # them (or the pattern registry or date grammar) invalidates the parse cache.
+    PARSE_METHODS = (
+        "_derive_line", "_derive_children", "_resolve_vital_date", "_split_date_location_uncached",
+        "_split_date_location_dateparser", "_normalize_date_uncached", "_normalize_date_fallback", "_extract_location_note", "_parse_location_hierarchy",
+        "_extract_voyages", "extract_events_from_text", "split_sentences", "extract_year",
+        "extract_relative_date", "extract_location", "_extract_explicit_associates"
+    )
+    PARSE_CACHE_DIR = "./.pipeline_cache"
+    # Methods behind the date cache's version stamp (along with the pattern
+    # registry, the date grammar and the installed dateparser version)
+    DATE_METHODS = ("_split_date_location_uncached", "_split_date_location_dateparser",
+                    "_normalize_date_uncached", "_normalize_date_fallback")
+    DATE_MEMO_SIZE = 4096
+    # Methods behind each stage's version stamp (see build_stages); editing
+    # one reruns that stage and, if its output changes, the stages after it
+    STAGE_METHODS = {
+        "parse": ("parse_documents", "parse_document", "_parse_paragraphs", "_finish_block", "_apply_line",
+                  "_add_child_profiles", "_intern_story"),
+        "dedupe": ("dedupe_child_entries",),
+        "link": ("link_family_members",),
+        "echo": ("_analyze_naming_patterns", "_get_birth_year"),
+        "mentions": ("_find_mentions", "_build_name_index", "_get_birth_year"),
+        "enrich": ("enrich_profiles", "enrich_concurrently", "_profile_locations", "build_location_table",
+                   "fetch_wikimedia_image", "_missing_image_keys", "_store_image_results",
+                   "_get_country_from_location", "_generate_voyage_context", "_parse_location_hierarchy"),
+        "tag": ("tag_profiles", "extract_tags", "_has_exclusion_context"),
+        "emit": ("emit", "_final_profile", "_encode_profile", "_index_entry", "_detail_shard", "emit_index",
+                 "save_location_table"),
+    }
+    STAGE_NAMES = tuple(STAGE_METHODS)
+
     def __init__(self):
         self.family_data = []
-        self.image_cache = self.load_cache()
-        self.cache_updated = False
+        self.context = None
+        self.use_parse_cache = True
+        self.date_cache = None
+        self.date_stats = new_date_stats()
+        self.metrics = PipelineMetrics()
+        self.cache_db = DEFAULT_CACHE_DB
+        self.retry_policy = RetryPolicy()
+        self._image_cache = None
+        self.image_service = None
+        self.image_workers = 4
+        self.ship_batch_size = 20
+        # Geocode places the tables and gazetteer miss through Nominatim
+        self.geocode_api = False
+        # Lookups in flight per service during the enrichment stage. Ship
+        # batches go one at a time so the cache is written in a stable order.
+        self.enrichment_concurrency = {"geocode": 1, "ships": 1, "images": self.image_workers}
+        # Write born/died/event coords into family_data.json as well as locations.json
+        self.embed_coords = True
+        # Distinct location -> coords and profile count, built by the enrich stage
+        self.location_table = {}
+        # Shared copies of repeated locations, labels and ship names (see intern_table.py)
+        self.strings = STRINGS
+        # Write family_data.json with those strings as codes into a string table
+        self.dictionary_encode = False
+        # Indented, ASCII-escaped family_data.json instead of compact UTF-8
+        self.pretty_json = False
+
+        # Bounded per-instance memos: "Unknown", "c. 1700" and dates shared by
+        # alias profiles and child entries are parsed once
+        self._split_memo = functools.lru_cache(maxsize=self.DATE_MEMO_SIZE)(self._split_date_location_uncached)
+        self._normalize_memo = functools.lru_cache(maxsize=self.DATE_MEMO_SIZE)(self._normalize_date_uncached)
+
+    def _get_context(self):
+        # Rebuild only when the profile list itself has been replaced
+        if self.context is None or self.context.profiles is not self.family_data:
+            self.context = PipelineContext(self, self.family_data)
+        return self.context
 
     def _extract_voyages(self, text):
         voyages = []
@@ -298,7 +791,6 @@ class GenealogyTextPipeline:
 
         # Pattern 1: Explicit Tag
         # [Ship: Name | Type: X | Year: Y | Departure: A | Arrival: B]
-        tag_pattern = r'\[Ship:\s*([^\]]+)\]'
 
         def replace_tag(match):
             content = match.group(1)
@@ -327,15 +819,13 @@ class GenealogyTextPipeline:
             voyages.append(voyage)
             return "" # Remove tag
 
-        new_text = re.sub(tag_pattern, replace_tag, text, flags=re.IGNORECASE)
+        new_text = PATTERNS.ship_tag.sub(replace_tag, text)
 
         # Pattern 2: Natural Language (Improved)
         # Strategy: Find "arrived/sailed/came ... on/aboard ... [ShipName]"
 
         # 2a. Quoted Ship Name (Strongest, handles "Hector", "Mayflower")
-        quote_pattern = r'(?:arrived|sailed|came|passage|travelled)\b[^.;]*?\b(?:on|aboard)\b(?:\s+(?:the|a)\b)?(?:\s*ship)?\s*[“"\'‘]([^”"\'’]+)[”"\'’]'
-
-        for m in re.finditer(quote_pattern, new_text, re.IGNORECASE):
+        for m in PATTERNS.voyage_quoted.finditer(new_text):
             ship_name = m.group(1).strip()
             if not any(v['ship_name'] == ship_name for v in voyages):
                  voyages.append({
@@ -348,14 +838,8 @@ class GenealogyTextPipeline:
                 })
 
         # 2b. Unquoted Capitalized Ship Name (Context aware)
-        # Regex Explanation:
-        # (?i:...) Group: Case-insensitive context (verbs, prepositions)
-        # ([A-Z]...): Case-sensitive Ship Name (must be capitalized)
-        prefix = r'(?i:(?:arrived|sailed|came|passage|travelled)\b[^.;]*?\b(?:on|aboard)\b(?:\s+(?:the|a)\b)?(?:\s*ship)?\s+)'
-        name_part = r'([A-Z][a-z]+(?:(?:\s+(?:and|&)\s+|\s+)[A-Z][a-z]+)*)'
-        cap_pattern = prefix + name_part
-
-        for m in re.finditer(cap_pattern, new_text):
+        # Case-insensitive context (verbs, prepositions), case-sensitive ship name
+        for m in PATTERNS.voyage_capitalized.finditer(new_text):
             ship_name = m.group(1).strip()
 
             # Validation: Ignore common capitalized words that might follow "on"
@@ -373,115 +857,155 @@ class GenealogyTextPipeline:
                 })
 
         # Cleanup extra spaces
-        new_text = re.sub(r'\s{2,}', ' ', new_text).strip()
+        new_text = PATTERNS.repeated_space.sub(' ', new_text).strip()
         return voyages, new_text
 
+    @property
+    def image_cache(self):
+        # Opened on first use, so parse-only pipelines never touch the store
+        if self._image_cache is None:
+            self._image_cache = self.load_cache()
+        return self._image_cache
+
+    @image_cache.setter
+    def image_cache(self, cache):
+        self._image_cache = cache
+
     def load_cache(self):
-        cache_file = "./kinship-app/public/data/wikimedia_cache.json"
-        if os.path.exists(cache_file):
-            with open(cache_file, "r") as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return {}
-        return {}
+        return CacheStore("wikimedia", self.cache_db, seed_json=EXPORT_PATHS["wikimedia"])
 
     def save_cache(self):
-        if self.cache_updated:
-            with open("./kinship-app/public/data/wikimedia_cache.json", "w") as f:
-                json.dump(self.image_cache, f, indent=4)
+        self.image_cache.commit()
+        if self.image_cache.writes:
+            self.image_cache.export_json(EXPORT_PATHS["wikimedia"])
             print("Wikimedia cache saved.")
 
+    def _get_image_service(self):
+        if self.image_service is None:
+            self.image_service = WikimediaImageService(workers=self.image_workers)
+        return self.image_service
+
     def fetch_wikimedia_image(self, location, year):
-        if not location or location.lower() == "unknown":
+        key = image_cache_key(location, year)
+        if key is None:
             return None
 
-        # Determine Century
-        century = ""
-        if year:
-            c_val = (year // 100) + 1
-            century = f"{c_val}th century"
-        else:
-            century = "historical"
-
-        # Create a cache key
-        cache_key = f"{location}|{century}"
-        if cache_key in self.image_cache:
+        cache_key, century = key
+        if self.retry_policy.is_fresh(self.image_cache, cache_key):
             return self.image_cache[cache_key]
 
-        # Construct Search Queries
-        queries = [
-            f"{location} {century} map",
-            f"{location} historical"
-        ]
-
-        api_url = "https://commons.wikimedia.org/w/api.php"
-
-        for q in queries:
-            # Check if we need to save cache incrementally
-            if self.cache_updated and len(self.image_cache) % 5 == 0:
-                self.save_cache()
-                self.cache_updated = False
-
-            params = {
-                "action": "query",
-                "generator": "search",
-                "gsrnamespace": "6", # File namespace
-                "gsrsearch": q,
-                "gsrlimit": "1",
-                "prop": "imageinfo",
-                "iiprop": "url|extmetadata",
-                "iiurlwidth": "1024",
-                "format": "json"
-            }
-
-            try:
-                # Be polite
-                time.sleep(0.1)
-                response = requests.get(api_url, params=params, headers={"User-Agent": "GenealogyApp/1.0 (contact@example.com)"}, timeout=5)
-                data = response.json()
-
-                if "query" in data and "pages" in data["query"]:
-                    # Get first result
-                    page_id = list(data["query"]["pages"].keys())[0]
-                    page = data["query"]["pages"][page_id]
-
-                    if "imageinfo" in page:
-                        info = page["imageinfo"][0]
-                        thumb_url = info.get("thumburl", info.get("url"))
-
-                        metadata = info.get("extmetadata", {})
-                        description = metadata.get("ImageDescription", {}).get("value", q)
-                        # Clean HTML from description if needed, or keep it simple
-                        # Simple regex to strip HTML tags
-                        description = re.sub(r'<[^>]+>', '', description)[:150] + "..."
-
-                        result = {
-                            "src": thumb_url,
-                            "alt": f"Historical image of {location}",
-                            "caption": description,
-                            "style": { "filter": "sepia(20%) contrast(110%)" } # Default vintage style
-                        }
-
-                        self.image_cache[cache_key] = result
-                        self.cache_updated = True
-                        print(f"   [Wikimedia] Found image for '{q}'")
-                        return result
-
-            except Exception as e:
-                print(f"   [Wikimedia] Error fetching for '{q}': {e}")
+        # Misses and failures are cached by kind so neither is re-searched
+        # until its TTL runs out. The store commits in batches, so an
+        # interrupted run keeps what it already fetched.
+        kind, result = self._get_image_service().lookup(location, century)
+        self.image_cache.set(cache_key, result, kind)
+        return result
+
+    def _missing_image_keys(self, profiles):
+        """{cache key: (location, century)} for every image key that needs a lookup, in first-seen order."""
+        missing = {}
+        for p in profiles:
+            key = image_cache_key(p["vital_stats"]["born_location"], p["vital_stats"].get("born_year_int"))
+            if key is None:
                 continue
+            cache_key, century = key
+            if cache_key not in missing and not self.retry_policy.is_fresh(self.image_cache, cache_key):
+                missing[cache_key] = (p["vital_stats"]["born_location"], century)
+        return missing
+
+    def _store_image_results(self, missing, results):
+        # Written in first-seen order so the cache file stays deterministic
+        for cache_key, (kind, result) in zip(missing, results):
+            self.image_cache.set(cache_key, result, kind)
+        self.image_cache.commit()
+
+    def enrich_concurrently(self, profiles, geocoder, ship_service, ship_names):
+        """
+        Looks up every distinct geocode, ship and hero image key that is not
+        cached yet, with the three services running side by side, each
+        capped at its own concurrency. The per-profile loop afterwards is
+        served from the caches.
+        """
+        locations = {}
+        for p in profiles:
+            for loc in self._profile_locations(p):
+                if loc not in locations and geocoder.needs_lookup(loc):
+                    locations[loc] = True
+        ship_batches = ship_service.ship_batches(ship_names)
+        missing_images = self._missing_image_keys(profiles)
+        if not (locations or ship_batches or missing_images):
+            return
 
-        # Cache miss (None) to avoid re-searching
-        self.image_cache[cache_key] = None
-        self.cache_updated = True
-        return None
+        image_service = self._get_image_service()
+        jobs = [
+            EnrichmentJob("geocode", locations, geocoder.geocode, self.enrichment_concurrency["geocode"]),
+            EnrichmentJob("ships", ship_batches, ship_service.enrich_batch, self.enrichment_concurrency["ships"]),
+            EnrichmentJob("images", missing_images, lambda key: image_service.lookup(*missing_images[key]),
+                          self.enrichment_concurrency["images"]),
+        ]
+        print(f"--- Enriching {len(locations)} locations, {sum(len(b) for b in ship_batches)} ships "
+              f"and {len(missing_images)} hero images concurrently ---")
+        start = time.time()
+        results = run_enrichment(jobs)
+
+        if missing_images:
+            self._store_image_results(missing_images, results["images"])
+        geocoder.cache.commit()
+        ship_service.cache.commit()
+        for job in jobs:
+            if job.keys:
+                print(f"   {job.name}: {len(job.keys)} lookups in {job.seconds:.1f}s (up to {job.concurrency} at once)")
+        print(f"   Enrichment finished in {time.time() - start:.1f}s")
+
+    def _profile_locations(self, profile):
+        """Birth, death and life event locations of a profile, "Unknown" left out."""
+        locations = [profile["vital_stats"]["born_location"], profile["vital_stats"]["died_location"]] + \
+                    [e["location"] for e in profile["story"]["life_events"] if "location" in e]
+        return [loc for loc in locations if loc and loc != "Unknown"]
+
+    def build_location_table(self, profiles, geocoder):
+        """
+        Geocodes each distinct location string once. Returns
+        {location: {"coords": ..., "profiles": n}} in first-seen order,
+        where n is the number of profiles that mention the location.
+        """
+        table = {}
+        for p in profiles:
+            for loc in dict.fromkeys(self._profile_locations(p)):
+                entry = table.get(loc)
+                if entry is None:
+                    entry = table[loc] = {"coords": geocoder.geocode(loc), "profiles": 0}
+                entry["profiles"] += 1
+        return table
+
+    def save_location_table(self, table, path=LOCATIONS_OUTPUT):
+        """
+        Writes locations.json for the map view: location -> lat, lng, tier
+        and profile count, most mentioned first. Unresolved locations are
+        kept with null coordinates.
+        """
+        locations = {}
+        for loc, entry in sorted(table.items(), key=lambda item: (-item[1]["profiles"], item[0])):
+            coords = entry["coords"] or {}
+            locations[loc] = {
+                "lat": coords.get("lat"),
+                "lng": coords.get("lng"),
+                "tier": coords.get("tier"),
+                "profiles": entry["profiles"]
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(locations, f, indent=4, ensure_ascii=True)
+        resolved = sum(1 for entry in table.values() if entry["coords"])
+        print(f"Location table saved to {path} ({resolved}/{len(table)} locations resolved)")
 
     def _normalize_date(self, raw_date_string):
         """
         Parses a raw date string and returns a best-guess integer year.
         Returns None if no valid year is found.
         """
+        return self._normalize_memo(raw_date_string)
+
+    def _normalize_date_uncached(self, raw_date_string):
         if not raw_date_string:
             return None
 
@@ -493,13 +1017,13 @@ class GenealogyTextPipeline:
         # Extract the first 4-digit year candidate to work with
         # (1000-2999).
         # We capture the group to ensure we get the year digits.
-        year_match = re.search(r'\b(1[0-9]{3}|20[0-2][0-9])', s)
+        year_match = PATTERNS.year_candidate.search(s)
 
         # 0. Handle "century" logic if no specific year found
         if not year_match:
             # "18th century" -> 1700
             # "17th century" -> 1600
-            century_match = re.search(r'\b(\d{2})(?:th|nd|st|rd)\s+century\b', s)
+            century_match = PATTERNS.century.search(s)
             if century_match:
                 try:
                     c_val = int(century_match.group(1))
@@ -519,13 +1043,13 @@ class GenealogyTextPipeline:
         # 1. Handle "before" / "bef" / "by"
         # Logic: if "bef", "before", or "by" appears in the text preceding the year, return year - 1
         # e.g., "bef 1800" -> 1799
-        if re.search(r'\b(bef\.?|before|by)\b', pre_text):
+        if PATTERNS.modifier_before.search(pre_text):
             return year_val - 1
 
         # 2. Handle "after" / "aft"
         # Logic: if "aft" or "after" appears, return year + 1
         # e.g., "aft 1750" -> 1751
-        if re.search(r'\b(aft\.?|after)\b', pre_text):
+        if PATTERNS.modifier_after.search(pre_text):
             return year_val + 1
 
         # 3. Handle "between"
@@ -533,7 +1057,7 @@ class GenealogyTextPipeline:
         # This falls through to the default return of year_val because regex found the first year.
         # But we verify no "bef" / "aft" modifiers confuse it.
         # "between" in pre_text -> simply return year_val.
-        if re.search(r'\bbetween\b', pre_text):
+        if PATTERNS.modifier_between.search(pre_text):
             return year_val
 
         # 4. Handle dual dating like "1774/5" or ranges "1774-1778"
@@ -542,12 +1066,12 @@ class GenealogyTextPipeline:
 
         # 5. Handle "living in" or "fl."
         # If "living in 1774", we return 1774 as the best anchor.
-        if re.search(r'\b(living in|fl\.?)\b', pre_text):
+        if PATTERNS.modifier_living.search(pre_text):
             return year_val
 
         # 6. Handle "circa" / "c." / "about" / "abt"
         # If "c. 1774", we extract 1774.
-        if re.search(r'\b(c\.?|ca\.?|circa|about|abt\.?)\b', pre_text):
+        if PATTERNS.modifier_circa.search(pre_text):
             return year_val
 
         return year_val
@@ -556,6 +1080,7 @@ class GenealogyTextPipeline:
         """
         Uses dateparser to attempt to find a year if regex failed.
         """
+        self.date_stats["normalize_fallbacks"] += 1
         try:
             dt = dateparser.parse(raw_date_string)
             if dt:
@@ -565,26 +1090,30 @@ class GenealogyTextPipeline:
         return None
 
     def split_date_location(self, text):
+        """Splits a raw vital string into (date, location)."""
+        return self._split_memo(text)
+
+    def _split_date_location_uncached(self, text):
         if not text or text.lower() == "unknown":
             return "Unknown", "Unknown"
 
         # 1. " in " separator (Strongest)
         # Handles: "May 1, 1850 in Hartford" -> "May 1, 1850", "Hartford"
-        in_sep = re.search(r"\s+in\s+", text, re.IGNORECASE)
+        in_sep = PATTERNS.in_separator.search(text)
         if in_sep:
-            parts = re.split(r"\s+in\s+", text, flags=re.IGNORECASE, maxsplit=1)
+            parts = PATTERNS.in_separator.split(text, maxsplit=1)
             date_candidate = parts[0].strip()
             loc_candidate = parts[1].strip()
 
             # Correction: If location is just a year (e.g. "Disappeared in 1744"),
             # then the whole thing is likely a date statement, or at least the year belongs to the date.
             # We treat the whole string as the date, and location as Unknown.
-            if re.match(r'^\d{4}$', loc_candidate):
+            if PATTERNS.bare_year.match(loc_candidate):
                  return text.strip(), "Unknown"
 
             # Clean up date_candidate: Remove standard event labels if present
             # (e.g. "Born: April 12, 1880" -> "April 12, 1880")
-            date_candidate = re.sub(r'^(Born|Died|Buried|Baptized|Married):?\s*', '', date_candidate, flags=re.IGNORECASE)
+            date_candidate = PATTERNS.event_label.sub('', date_candidate)
 
             # Cleanup for "possibly" or garbage
             if date_candidate.strip().lower() in ["possibly", "unknown", "?", ""]:
@@ -599,7 +1128,17 @@ class GenealogyTextPipeline:
 
             return date_candidate, loc_candidate
 
-        # 2. Fallback: Use dateparser to handle messy formats
+        # 2. Fast path: the documented date formats, without dateparser
+        # e.g., "9/4/1805, Hartford, CT", "c. 1700, Salem, MA", "1640 - 1645"
+        fast = split_vital_date(text)
+        if fast is not None:
+            return fast
+
+        self.date_stats["split_fallbacks"] += 1
+        return self._split_date_location_dateparser(text)
+
+    def _split_date_location_dateparser(self, text):
+        # 3. Fallback: Use dateparser to handle messy formats
         # e.g., "Springfield, 1880", "Born 1880", "1880 New York"
         try:
             dates = dateparser.search.search_dates(text, languages=['en'])
@@ -624,8 +1163,7 @@ class GenealogyTextPipeline:
 
             # Expand left to capture modifiers that dateparser might miss (c., Before, etc.)
             pre_text = text[:start_idx]
-            mod_pattern = r'(?i)\b(?:c\.?|ca\.?|circa|about|abt\.?|before|bef\.?|by|after|aft\.?|bet\.?|between|living\s+in|fl\.?)\s*$'
-            mod_match = re.search(mod_pattern, pre_text)
+            mod_match = PATTERNS.trailing_date_modifier.search(pre_text)
 
             if mod_match:
                 start_idx = mod_match.start()
@@ -634,18 +1172,18 @@ class GenealogyTextPipeline:
 
             # Clean "in" / "at" from end of date_part if dateparser captured it
             # e.g. "April 12, 1880 in"
-            date_part = re.sub(r'\s+(in|at|on)$', '', date_part, flags=re.IGNORECASE)
+            date_part = PATTERNS.trailing_preposition.sub('', date_part)
 
             # Extract Location (everything else)
             prefix = text[:start_idx].strip()
             suffix = text[end_idx:].strip()
 
             # Clean up suffix
-            suffix = re.sub(r'^(in|at|on)\b\s*', '', suffix, flags=re.IGNORECASE)
+            suffix = PATTERNS.leading_preposition.sub('', suffix)
 
             # Clean up prefix: Remove standard event labels if they were part of the string
             # (e.g. "Born: April 12" -> Prefix "Born: ")
-            prefix = re.sub(r'^(Born|Died|Buried|Baptized|Married):?\s*', '', prefix, flags=re.IGNORECASE)
+            prefix = PATTERNS.event_label.sub('', prefix)
 
             # Combine prefix and suffix
             loc_parts = []
@@ -658,7 +1196,7 @@ class GenealogyTextPipeline:
 
             return date_part, location
 
-        # 3. No date found by dateparser
+        # 4. No date found by dateparser
         # Heuristics for "No Year" or fallbacks
 
         lower_text = text.lower()
@@ -666,7 +1204,7 @@ class GenealogyTextPipeline:
         # Specific cleanup for "Unknown date, assume..."
         if "unknown date" in lower_text or "date unknown" in lower_text:
              # Strip that part out
-             cleaned = re.sub(r'\b(unknown date|date unknown)\b', '', text, flags=re.IGNORECASE).strip(" ,;.")
+             cleaned = PATTERNS.unknown_date.sub('', text).strip(" ,;.")
              # Assume the rest is location if it has content
              if cleaned:
                   return "Unknown", cleaned
@@ -775,7 +1313,7 @@ class GenealogyTextPipeline:
         # Regex to find text ending with (note)
         # We capture the main part (lazy) and the content inside the *last* set of parens.
         # This handles cases like "Location (Note)" -> "Location", "Note"
-        match = re.search(r'^(.*?)\s*\(([^)]+)\)$', location_text)
+        match = PATTERNS.trailing_parenthetical.search(location_text)
         if match:
             clean_loc = match.group(1).strip()
             note = match.group(2).strip()
@@ -793,20 +1331,20 @@ class GenealogyTextPipeline:
     def split_sentences(self, text):
         if not text:
             return []
-        text = re.sub(r"^NOTES:\s*", "", text, flags=re.IGNORECASE)
-        parts = re.split(r'[.;]\s+', text)
+        text = PATTERNS.notes_prefix.sub("", text)
+        parts = PATTERNS.sentence_break.split(text)
         return [p.strip() for p in parts if p.strip()]
 
     def extract_year(self, text):
-        matches = list(re.finditer(r'\b(16|17|18|19)\d{2}\b', text))
-        if matches:
-            return int(matches[0].group(0))
+        match = PATTERNS.event_year.search(text)
+        if match:
+            return int(match.group(0))
         return None
 
     def extract_relative_date(self, text, context_year):
         if not context_year:
             return None
-        match = re.search(r'\b(one|two|three|four|five|six|seven|eight|nine|ten|twenty|thirty|forty|fifty)\s+years?\s+(later|after)', text, re.IGNORECASE)
+        match = PATTERNS.relative_years.search(text)
         if match:
             number_map = {
                 "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
@@ -819,11 +1357,10 @@ class GenealogyTextPipeline:
         return None
 
     def extract_location(self, text):
-        loc_regex = r'(?:\b(?:in|at|to|from)\s+)([A-Z][a-zA-Z]+(?:[\s,]+[A-Z][a-zA-Z]+)*)'
-        m = re.search(loc_regex, text)
+        m = PATTERNS.event_location.search(text)
         if m:
             candidate = m.group(1)
-            candidate = re.sub(r'\s+in\s+\d{4}.*', '', candidate)
+            candidate = PATTERNS.location_trailing_year.sub('', candidate)
             ignored = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December", "Harvard", "Yale", "College", "University", "War", "Church"]
             if candidate in ignored:
                 return None
@@ -858,15 +1395,13 @@ class GenealogyTextPipeline:
         associates = []
         # Pattern: [Role: Name (Context)]
         # Supported Roles: Associate, Witness, Neighbor, Partner, Friend
-        pattern = r'\[(Associate|Witness|Neighbor|Partner|Friend)\s*:\s*([^\]]+)\]'
-
-        matches = re.finditer(pattern, text, re.IGNORECASE)
+        matches = PATTERNS.associate_tag.finditer(text)
         for m in matches:
             role = m.group(1).title()
             content = m.group(2).strip()
 
             # Split name and optional paren context
-            name_match = re.search(r'^(.*?)\s*\(([^)]+)\)$', content)
+            name_match = PATTERNS.trailing_parenthetical.search(content)
             if name_match:
                 name = name_match.group(1).strip()
                 context = name_match.group(2).strip()
@@ -881,68 +1416,133 @@ class GenealogyTextPipeline:
             })
         return associates
 
+    def parse_documents(self, sources, workers=None):
+        """
+        Parses every (lineage, path) source, each in its own worker process.
+        Profiles are merged in source order, so IDs and paragraph indices are
+        the same as parsing the documents one after the other.
+        """
+        existing = []
+        for lineage, filename in sources:
+            if os.path.exists(filename):
+                existing.append((lineage, filename))
+            else:
+                print(f"Error: Could not find {filename}")
+
+        if workers is None:
+            workers = min(len(existing), os.cpu_count() or 1)
+
+        self.strings.reset_counts()
+
+        if workers <= 1 or len(existing) < 2:
+            for lineage, filename in existing:
+                with self.metrics.timer("parse_document"):
+                    self.parse_document(filename, lineage)
+        else:
+            print(f"--- Parsing {len(existing)} lineage documents across {workers} processes ---")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_parse_lineage_document, lineage, filename, self.use_parse_cache)
+                           for lineage, filename in existing]
+                # Collect in source order regardless of which worker finishes first
+                for future in futures:
+                    profiles, date_stats, counters, timers = future.result()
+                    # Unpickled strings are fresh copies; share them with this process's table
+                    for p in profiles:
+                        p.intern_strings()
+                        self._intern_story(p["story"])
+                    self.family_data.extend(profiles)
+                    self.metrics.add_counters(counters)
+                    self.metrics.add_timers(timers)
+                    for key, count in date_stats.items():
+                        self.date_stats[key] += count
+
+        self.report_date_stats()
+        self.strings.report()
+        self.metrics.add_counters(self.strings.counters(), prefix="interned_")
+        self.metrics.add_counters(self.date_stats, prefix="dates_")
+        self.metrics.count("dateparser_fallbacks", self.date_stats["split_fallbacks"] + self.date_stats["normalize_fallbacks"])
+        self.metrics.count("profiles", len(self.family_data))
+
+    def report_date_stats(self):
+        stats = self.date_stats
+        print("--- Date Normalization Cache ---")
+        print(f"   Disk cache hits: {_hit_rate(stats['disk_hits'], stats['disk_misses'])}")
+        print(f"   split_date_location memo hits: {_hit_rate(stats['split_hits'], stats['split_misses'])}")
+        print(f"   _normalize_date memo hits: {_hit_rate(stats['normalize_hits'], stats['normalize_misses'])}")
+        print(f"   dateparser fallbacks: {stats['split_fallbacks']} date/location splits, {stats['normalize_fallbacks']} year lookups")
+
     def parse_document(self, docx_path, lineage_label):
         print(f"--- Scanning Narrative Document ({docx_path}) ---")
         try:
-            doc = Document(docx_path)
+            reader = DocxParagraphReader(docx_path)
         except Exception as e:
             print(f"CRITICAL ERROR: Could not load Word doc. {e}")
             return
 
-        total_paragraphs = len(doc.paragraphs)
-        print(f"Total paragraphs in document: {total_paragraphs}")
-
+        parse_cache = ParseCache(self._cache_path("parse", lineage_label, docx_path), self._parser_fingerprint(), enabled=self.use_parse_cache)
+        self.date_cache = DateCache(self._cache_path("dates", lineage_label, docx_path), self._date_parser_version(), enabled=self.use_parse_cache)
+        split_before = self._split_memo.cache_info()
+        normalize_before = self._normalize_memo.cache_info()
+
+        with reader:
+            self._parse_paragraphs(reader, lineage_label, parse_cache)
+
+        print(f"Total paragraphs in document: {reader.paragraph_count}")
+        parse_cache.save()
+        self.date_cache.save()
+        self._record_date_stats(split_before, normalize_before)
+        self.date_cache = None
+        print(f"   Parse cache: reused {parse_cache.hits} profile blocks, reparsed {parse_cache.misses}")
+        self.metrics.count("parse_cache_hits", parse_cache.hits)
+        self.metrics.count("parse_cache_misses", parse_cache.misses)
+        self.metrics.count("paragraphs", reader.paragraph_count)
+        if 0 < len(parse_cache.dirty_ids) <= 20:
+            print(f"   Reparsed profiles: {', '.join(parse_cache.dirty_ids)}")
+
+    def _parse_paragraphs(self, paragraphs, lineage_label, parse_cache):
+        """
+        Consumes (index, text) paragraph tuples in document order and builds
+        profile blocks from them.
+        """
         current_profiles = []
+        current_block = None
         seen_ids = set()
         current_generation = "Uncategorized"
-        
-        # Regex Patterns
-        id_pattern = re.compile(r"\{(\d+(\.\d+)*)\}")
-        born_pattern = re.compile(r"Born:\s*(.*)", re.IGNORECASE)
-        died_pattern = re.compile(r"Died:\s*(.*)", re.IGNORECASE)
-        children_pattern = re.compile(r"Children:\s*(.*)", re.IGNORECASE)
-        notes_start_pattern = re.compile(r"NOTES:\s*(.*)", re.IGNORECASE)
-        source_tag_pattern = re.compile(r"\[source:\s*(.*?)\]", re.IGNORECASE)
-        
-        gen_header_pattern = re.compile(r"^(GENERATION\s+[IVXLCDM]+.*)", re.IGNORECASE)
-
-        for index, para in enumerate(doc.paragraphs):
+
+        for index, para_text in paragraphs:
             if index % 1000 == 0:
-                print(f"Processing paragraph {index}/{total_paragraphs}")
+                print(f"Processing paragraph {index}")
 
-            text = para.text.strip()
+            text = para_text.strip()
             if not text:
                 continue
 
-            gen_match = gen_header_pattern.match(text)
+            gen_match = PATTERNS.generation_header.match(text)
             if gen_match:
-                current_generation = gen_match.group(1).strip()
-                print(f"   > Detected Section: {current_generation}")
                 if current_profiles:
-                    self.family_data.extend(current_profiles)
+                    self._finish_block(current_block, lineage_label, current_generation)
                     current_profiles = []
+                current_generation = gen_match.group(1).strip()
+                print(f"   > Detected Section: {current_generation}")
                 continue
 
-            matches = list(id_pattern.finditer(text))
+            matches = list(PATTERNS.profile_id.finditer(text))
 
             # Guard: If the line is actually a Note or Vital Stat line that happens to reference an ID,
             # ignore it as a profile header.
             # Also exclude cross-reference lines like "See Name..." or relationship pointers "Father of..."
-            see_pattern = re.compile(r"^See\s+", re.IGNORECASE)
-            rel_pointer_pattern = re.compile(r"^(Father|Mother|Parent|Maternal|Paternal)\s+(Grand)?(father|mother|parent|of)\s+", re.IGNORECASE)
-
             is_metadata_line = (
-                born_pattern.match(text) or
-                died_pattern.match(text) or
-                children_pattern.match(text) or
-                notes_start_pattern.match(text) or
-                see_pattern.match(text) or
-                rel_pointer_pattern.match(text)
+                PATTERNS.born_line.match(text) or
+                PATTERNS.died_line.match(text) or
+                PATTERNS.children_line.match(text) or
+                PATTERNS.notes_line.match(text) or
+                PATTERNS.see_reference.match(text) or
+                PATTERNS.relation_pointer.match(text)
             )
 
             if matches and not is_metadata_line:
                 if current_profiles:
-                    self.family_data.extend(current_profiles)
+                    self._finish_block(current_block, lineage_label, current_generation)
                     current_profiles = []
 
                 # Handle First ID (always create)
@@ -950,36 +1550,16 @@ class GenealogyTextPipeline:
 
                 # Name is everything before the first ID
                 raw_name = text[:first_match.start()].strip()
-                clean_name = re.sub(r"\[source:.*?\]", "", raw_name).strip()
+                clean_name = PATTERNS.source_tag_strip.sub("", raw_name).strip()
                 
-                source_match = source_tag_pattern.search(text)
+                source_match = PATTERNS.source_tag.search(text)
                 source_id = source_match.group(1) if source_match else "Unknown"
 
                 # Check First ID
                 uid = first_match.group(1)
                 if uid not in seen_ids:
                     seen_ids.add(uid)
-                    current_profiles.append({
-                        "id": uid,
-                        "name": clean_name,
-                        "lineage": lineage_label,
-                        "generation": current_generation,
-                        "vital_stats": {
-                            "born_date": "Unknown",
-                            "born_location": "Unknown",
-                            "died_date": "Unknown",
-                            "died_location": "Unknown"
-                        },
-                        "story": {
-                            "notes": "",
-                            "voyages": [],
-                            "life_events": []
-                        },
-                        "metadata": {
-                            "source_id": source_id,
-                            "doc_paragraph_index": index + 1
-                        }
-                    })
+                    current_profiles.append(self._new_block_profile(uid, clean_name, lineage_label, current_generation, source_id, index))
 
                 # Check subsequent IDs (aliases)
                 # Logic: Consecutive IDs separated by " & ", " / ", " and "
@@ -990,96 +1570,225 @@ class GenealogyTextPipeline:
                     # Text between matches
                     between = text[prev.end():curr.start()]
 
-                    if re.match(r"^\s*(&|/|and)\s*$", between, re.IGNORECASE):
+                    if PATTERNS.alias_separator.match(between):
                         # It is an alias
                         uid_alias = curr.group(1)
                         if uid_alias not in seen_ids:
                             seen_ids.add(uid_alias)
-                            current_profiles.append({
-                                "id": uid_alias,
-                                "name": clean_name, # Same name
-                                "lineage": lineage_label,
-                                "generation": current_generation,
-                                "vital_stats": {
-                                    "born_date": "Unknown",
-                                    "born_location": "Unknown",
-                                    "died_date": "Unknown",
-                                    "died_location": "Unknown"
-                                },
-                                "story": {
-                                    "notes": "",
-                                    "voyages": [],
-                                    "life_events": []
-                                },
-                                "metadata": {
-                                    "source_id": source_id,
-                                    "doc_paragraph_index": index + 1
-                                }
-                            })
+                            # Same name
+                            current_profiles.append(self._new_block_profile(uid_alias, clean_name, lineage_label, current_generation, source_id, index))
                     else:
                         # Break chain if separator is not alias-like
                         break
 
+                current_block = {
+                    "header_index": index,
+                    "profiles": current_profiles,
+                    "lines": [],
+                    "cache": parse_cache
+                }
                 continue
 
             if current_profiles:
-                # Pre-calculate matches for this line
-                b_match = born_pattern.search(text)
-                d_match = died_pattern.search(text)
-                n_match = notes_start_pattern.search(text)
-                c_match = children_pattern.search(text)
-
-                for current_profile in current_profiles:
-                    if b_match:
-                        raw_born = b_match.group(1).strip()
-                        b_date, b_loc_raw = self.split_date_location(raw_born)
-                        b_loc, b_note = self._extract_location_note(b_loc_raw)
-
-                        current_profile["vital_stats"]["born_date"] = b_date
-                        current_profile["vital_stats"]["born_location"] = b_loc
-                        if b_note:
-                            current_profile["vital_stats"]["born_location_note"] = b_note
-                        current_profile["vital_stats"]["born_year_int"] = self._normalize_date(b_date)
-                        current_profile["vital_stats"]["born_hierarchy"] = self._parse_location_hierarchy(b_loc)
-
-                    if d_match:
-                        raw_died = d_match.group(1).strip()
-                        d_date, d_loc_raw = self.split_date_location(raw_died)
-                        d_loc, d_note = self._extract_location_note(d_loc_raw)
-
-                        current_profile["vital_stats"]["died_date"] = d_date
-                        current_profile["vital_stats"]["died_location"] = d_loc
-                        if d_note:
-                            current_profile["vital_stats"]["died_location_note"] = d_note
-                        current_profile["vital_stats"]["died_year_int"] = self._normalize_date(d_date)
-                        current_profile["vital_stats"]["died_hierarchy"] = self._parse_location_hierarchy(d_loc)
-
-                    if n_match:
-                        notes_text = n_match.group(1).strip()
-                        voyages, cleaned_notes = self._extract_voyages(notes_text)
-                        current_profile["story"]["notes"] = cleaned_notes
-                        current_profile["story"]["voyages"] = voyages
-                        current_profile["story"]["life_events"] = self.extract_events_from_text(cleaned_notes)
-                        current_profile["story"]["associates"] = self._extract_explicit_associates(cleaned_notes)
-
-                    if c_match:
-                        raw_children = c_match.group(1).strip()
-                        # Also check next paragraphs if they look like list items or continuation?
-                        # For now, simplistic parsing of the line
-                        self._parse_children(raw_children, current_profile, lineage_label, current_generation, index)
+                # Body line of the current profile block; derived once the block is complete
+                current_block["lines"].append((index - current_block["header_index"], text))
 
         if current_profiles:
-            self.family_data.extend(current_profiles)
+            self._finish_block(current_block, lineage_label, current_generation)
+
+    def _new_block_profile(self, uid, name, lineage_label, generation, source_id, index):
+        # A header's profile (or alias) before its body lines are applied
+        return new_profile(
+            uid, name, lineage_label, generation,
+            vital_stats={
+                "born_date": "Unknown",
+                "born_location": "Unknown",
+                "died_date": "Unknown",
+                "died_location": "Unknown"
+            },
+            story={
+                "notes": "",
+                "voyages": [],
+                "life_events": []
+            },
+            metadata={
+                "source_id": source_id,
+                "doc_paragraph_index": index + 1
+            }
+        )
+
+    def _cache_path(self, kind, lineage_label, docx_path):
+        # One file per (lineage, document) so parallel parse workers never share a cache file
+        doc_name = os.path.splitext(os.path.basename(docx_path))[0]
+        safe_label = PATTERNS.non_word_run.sub('_', f"{lineage_label} {doc_name}").strip('_').lower() or "default"
+        return os.path.join(self.PARSE_CACHE_DIR, f"{kind}_{safe_label}.json")
+
+    def _parser_fingerprint(self):
+        source = "".join(inspect.getsource(getattr(GenealogyTextPipeline, name)) for name in self.PARSE_METHODS)
+        source += inspect.getsource(pipeline_patterns) + inspect.getsource(date_grammar)
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def _date_parser_version(self):
+        source = "".join(inspect.getsource(getattr(GenealogyTextPipeline, name)) for name in self.DATE_METHODS)
+        source += inspect.getsource(pipeline_patterns) + inspect.getsource(date_grammar)
+        source += getattr(dateparser, "__version__", "")
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def _record_date_stats(self, split_before, normalize_before):
+        split_after = self._split_memo.cache_info()
+        normalize_after = self._normalize_memo.cache_info()
+        stats = self.date_stats
+        stats["disk_hits"] += self.date_cache.hits
+        stats["disk_misses"] += self.date_cache.misses
+        stats["split_hits"] += split_after.hits - split_before.hits
+        stats["split_misses"] += split_after.misses - split_before.misses
+        stats["normalize_hits"] += normalize_after.hits - normalize_before.hits
+        stats["normalize_misses"] += normalize_after.misses - normalize_before.misses
+
+    def _finish_block(self, block, lineage_label, generation):
+        """
+        Applies a completed profile block's body lines to its profiles and
+        appends them (child entries first) to family_data. The derived line
+        data comes from the parse cache when the block's paragraphs are unchanged.
+        """
+        profiles = block["profiles"]
+        parse_cache = block["cache"]
+
+        key = parse_cache.fingerprint(block["lines"])
+        line_ops = parse_cache.get(key)
+        if line_ops is None:
+            line_ops = [(offset, self._derive_line(text)) for offset, text in block["lines"]]
+            parse_cache.put(key, line_ops, [p["id"] for p in profiles])
+
+        for offset, ops in line_ops:
+            index = block["header_index"] + offset
+            for current_profile in profiles:
+                self._apply_line(current_profile, ops, lineage_label, generation, index)
 
-    def _parse_children(self, text, parent_profile, lineage_label, generation, index):
+        self.family_data.extend(profiles)
+
+    def _derive_line(self, text):
+        """
+        Runs the expensive per-line parsing (date/location splitting, voyage,
+        event and associate extraction, children) once for a body line.
+        Returns a JSON-serializable dict so it can be cached.
+        """
+        ops = {}
+
+        b_match = PATTERNS.born_line.search(text)
+        d_match = PATTERNS.died_line.search(text)
+        n_match = PATTERNS.notes_line.search(text)
+        c_match = PATTERNS.children_line.search(text)
+
+        if b_match:
+            raw_born = b_match.group(1).strip()
+            b_date, b_loc_raw, b_year = self._resolve_vital_date(raw_born)
+            b_loc, b_note = self._extract_location_note(b_loc_raw)
+            ops["born"] = {
+                "date": b_date,
+                "location": b_loc,
+                "note": b_note,
+                "year_int": b_year,
+                "hierarchy": self._parse_location_hierarchy(b_loc)
+            }
+
+        if d_match:
+            raw_died = d_match.group(1).strip()
+            d_date, d_loc_raw, d_year = self._resolve_vital_date(raw_died)
+            d_loc, d_note = self._extract_location_note(d_loc_raw)
+            ops["died"] = {
+                "date": d_date,
+                "location": d_loc,
+                "note": d_note,
+                "year_int": d_year,
+                "hierarchy": self._parse_location_hierarchy(d_loc)
+            }
+
+        if n_match:
+            notes_text = n_match.group(1).strip()
+            voyages, cleaned_notes = self._extract_voyages(notes_text)
+            ops["notes"] = {
+                "notes": cleaned_notes,
+                "voyages": voyages,
+                "life_events": self.extract_events_from_text(cleaned_notes),
+                "associates": self._extract_explicit_associates(cleaned_notes)
+            }
+
+        if c_match:
+            raw_children = c_match.group(1).strip()
+            # Also check next paragraphs if they look like list items or continuation?
+            # For now, simplistic parsing of the line
+            ops["children"] = self._derive_children(raw_children)
+
+        return ops
+
+    def _resolve_vital_date(self, raw):
+        """
+        Returns (date, location, year_int) for a raw Born/Died string, from the
+        persistent date cache when possible.
         """
-        Parses the children text block and creates sibling profiles.
+        cached = self.date_cache.get(raw) if self.date_cache is not None else None
+        if cached is not None:
+            return cached
+
+        date, location = self.split_date_location(raw)
+        value = (date, location, self._normalize_date(date))
+        if self.date_cache is not None:
+            self.date_cache.put(raw, value)
+        return value
+
+    def _apply_line(self, current_profile, ops, lineage_label, generation, index):
+        # Each profile gets its own copies: later stages mutate voyages, events, etc. per profile
+        ops = copy.deepcopy(ops)
+
+        if "born" in ops:
+            born = ops["born"]
+            current_profile["vital_stats"]["born_date"] = born["date"]
+            current_profile["vital_stats"]["born_location"] = born["location"]
+            if born["note"]:
+                current_profile["vital_stats"]["born_location_note"] = born["note"]
+            current_profile["vital_stats"]["born_year_int"] = born["year_int"]
+            current_profile["vital_stats"]["born_hierarchy"] = born["hierarchy"]
+
+        if "died" in ops:
+            died = ops["died"]
+            current_profile["vital_stats"]["died_date"] = died["date"]
+            current_profile["vital_stats"]["died_location"] = died["location"]
+            if died["note"]:
+                current_profile["vital_stats"]["died_location_note"] = died["note"]
+            current_profile["vital_stats"]["died_year_int"] = died["year_int"]
+            current_profile["vital_stats"]["died_hierarchy"] = died["hierarchy"]
+
+        if "notes" in ops:
+            story = ops["notes"]
+            current_profile["story"]["notes"] = story["notes"]
+            current_profile["story"]["voyages"] = story["voyages"]
+            current_profile["story"]["life_events"] = story["life_events"]
+            current_profile["story"]["associates"] = story["associates"]
+            self._intern_story(current_profile["story"])
+
+        if "children" in ops:
+            self._add_child_profiles(ops["children"], current_profile, lineage_label, generation, index)
+
+    def _intern_story(self, story):
+        # Voyages and events stay plain dicts; share their repeated strings
+        for voyage in story.get("voyages", []):
+            voyage["ship_name"] = self.strings.intern(voyage["ship_name"], "ship")
+            for key in ("departure", "arrival"):
+                voyage[key] = self.strings.intern(voyage[key], "location")
+        for event in story.get("life_events", []):
+            event["location"] = self.strings.intern(event["location"], "location")
+
+    def _derive_children(self, text):
+        """
+        Parses the children text block into child entries (name and dates).
         Format variations:
         - "Name (Year); Name (Year)"
         - "Name (Year-Year)"
         - "Name [Spouse] (Year)"
         """
-        if not text: return
+        children = []
+        if not text: return children
 
         # Split by semicolon usually separates distinct children entries
         # If no semicolon, maybe commas? But names have commas (Last, First).
@@ -1090,14 +1799,13 @@ class GenealogyTextPipeline:
         # Check if there are years in parens to guide splitting?
         # For now, stick to semicolons or newlines (handled by loop above but here text is one line)
 
-        child_count = 0
         for segment in segments:
             # Extract Name and Year
             # Regex: Name (Date)
             # Name might include [Spouse]
 
             # Find parens with digits (dates)
-            date_match = re.search(r'\(([^)]*\d+[^)]*)\)', segment)
+            date_match = PATTERNS.dated_parenthetical.search(segment)
 
             raw_date = "Unknown"
             clean_name = segment
@@ -1114,42 +1822,8 @@ class GenealogyTextPipeline:
             clean_name = clean_name.strip()
             if not clean_name: continue
 
-            # Generate a unique ID for this child
-            # Format: P<ParentID>_c<Index>
-            # Note: Parent ID must exist.
-            if not parent_profile or 'id' not in parent_profile:
-                continue
-
-            # Check if this child already exists as a main profile?
-            # We will handle this in deduplication or linking phase,
-            # but we need to create the object first.
-
-            child_id = f"{parent_profile['id']}_c{child_count}"
-            child_count += 1
-
-            # Create Child Profile
-            child_profile = {
-                "id": child_id,
-                "name": clean_name,
-                "lineage": lineage_label,
-                "generation": generation, # Technically next gen down, but close enough for now
-                "vital_stats": {
-                    "born_date": raw_date, # Often range "1884-1976" or just "1884"
-                    "born_location": "Unknown",
-                    "died_date": "Unknown", # Extracted later from range
-                    "died_location": "Unknown"
-                },
-                "story": {
-                    "notes": f"Child of {parent_profile['name']}. Source text: {segment}",
-                    "life_events": []
-                },
-                "metadata": {
-                    "source_id": "Derived",
-                    "doc_paragraph_index": index + 1,
-                    "is_child_entry": True,
-                    "parent_id": parent_profile['id']
-                }
-            }
+            born_date = raw_date # Often range "1884-1976" or just "1884"
+            died_date = "Unknown" # Extracted later from range
 
             # Handle Date Ranges in born_date
             # e.g. "1884-1976" -> born 1884, died 1976
@@ -1157,19 +1831,66 @@ class GenealogyTextPipeline:
                 split_char = "–" if "–" in raw_date else "-"
                 parts = raw_date.split(split_char)
                 if len(parts) >= 2:
-                    child_profile["vital_stats"]["born_date"] = parts[0].strip()
-                    child_profile["vital_stats"]["died_date"] = parts[1].strip()
+                    born_date = parts[0].strip()
+                    died_date = parts[1].strip()
 
             # Clean child dates if they are garbage
-            if child_profile["vital_stats"]["born_date"].strip() in ["?", ""]:
-                 child_profile["vital_stats"]["born_date"] = "Unknown"
-            if child_profile["vital_stats"]["died_date"].strip() in ["?", ""]:
-                 child_profile["vital_stats"]["died_date"] = "Unknown"
+            if born_date.strip() in ["?", ""]:
+                 born_date = "Unknown"
+            if died_date.strip() in ["?", ""]:
+                 died_date = "Unknown"
+
+            children.append({
+                "name": clean_name,
+                "segment": segment,
+                "born_date": born_date,
+                "died_date": died_date,
+                "born_year_int": self._normalize_date(born_date),
+                "died_year_int": self._normalize_date(died_date)
+            })
+
+        return children
+
+    def _add_child_profiles(self, children, parent_profile, lineage_label, generation, index):
+        """
+        Creates sibling profiles for a parent from its derived child entries.
+        """
+        # Generate a unique ID for this child
+        # Format: P<ParentID>_c<Index>
+        # Note: Parent ID must exist.
+        if children and parent_profile and 'id' in parent_profile:
+            for child_count, child in enumerate(children):
+                # Check if this child already exists as a main profile?
+                # We will handle this in deduplication or linking phase,
+                # but we need to create the object first.
+                child_id = f"{parent_profile['id']}_c{child_count}"
+
+                # Create Child Profile
+                child_profile = new_profile(
+                    child_id, child["name"], lineage_label,
+                    generation, # Technically next gen down, but close enough for now
+                    vital_stats={
+                        "born_date": child["born_date"],
+                        "born_location": "Unknown",
+                        "died_date": child["died_date"],
+                        "died_location": "Unknown"
+                    },
+                    story={
+                        "notes": f"Child of {parent_profile['name']}. Source text: {child['segment']}",
+                        "life_events": []
+                    },
+                    metadata={
+                        "source_id": "Derived",
+                        "doc_paragraph_index": index + 1,
+                        "is_child_entry": True,
+                        "parent_id": parent_profile['id']
+                    }
+                )
 
-            child_profile["vital_stats"]["born_year_int"] = self._normalize_date(child_profile["vital_stats"]["born_date"])
-            child_profile["vital_stats"]["died_year_int"] = self._normalize_date(child_profile["vital_stats"]["died_date"])
+                child_profile["vital_stats"]["born_year_int"] = child["born_year_int"]
+                child_profile["vital_stats"]["died_year_int"] = child["died_year_int"]
 
-            self.family_data.append(child_profile)
+                self.family_data.append(child_profile)
 
         print(f"Successfully extracted {len(self.family_data)} profiles from text.")
 
@@ -1178,24 +1899,8 @@ class GenealogyTextPipeline:
         start_search = max(0, match_start - 100)
         pre_text = text[start_search:match_start].lower()
 
-        exclusions = [
-            # Singular relationships
-            "mother of", "father of", "sister of", "brother of",
-            "wife of", "husband of", "widow of", "son of", "daughter of",
-            "child of", "spouse of", "married to", "mother to", "father to",
-            "husband was", "father was", "son was", "daughter was", "wife was",
-            "husband's", "father's", "wife's", "son's", "daughter's",
-            "consort of", "relict of",
-            # Plural relationships
-            "sons of", "daughters of", "children of", "brothers of", "sisters of",
-            # Contextual exclusions for spouse death scenarios
-            "husband died", "wife died", "spouse died"
-        ]
-
-        for exc in exclusions:
-            if exc in pre_text:
-                return True
-        return False
+        # One alternation over every exclusion phrase (see EXCLUSION_PHRASES)
+        return PATTERNS.exclusion_context.search(pre_text) is not None
 
     def extract_tags(self, profile):
         tags = []
@@ -1207,8 +1912,7 @@ class GenealogyTextPipeline:
         # Heuristic: Born in UK/Europe, Died in USA/MA/CT
         # Or keyword "immigrant", "came to america"
         is_immigrant = False
-        immigrant_keywords = r'\b(immigrant|emigrated|came to america|arrived in|arrived with)\b'
-        for match in re.finditer(immigrant_keywords, notes, re.IGNORECASE):
+        for match in PATTERNS.tag_immigrant.finditer(notes):
             if not self._has_exclusion_context(notes, match.start()):
                 is_immigrant = True
                 break
@@ -1227,84 +1931,72 @@ class GenealogyTextPipeline:
             tags.append("Immigrant")
 
         # 2. Mayflower
-        mayflower_keywords = r'\bMayflower\b'
-        for match in re.finditer(mayflower_keywords, notes, re.IGNORECASE):
+        for match in PATTERNS.tag_mayflower.finditer(notes):
              if not self._has_exclusion_context(notes, match.start()):
                  tags.append("Mayflower")
                  break
 
         # 3. War Veteran
         # Keywords: War, Revolution, Army, Regiment, Captain, Lieutenant, General, Soldier, Private
-        war_keywords = r'\b(served in|soldier|captain|major|lieutenant|general|ensign|private|sergeant|colonel|veteran|war of|revolutionary war|civil war|french and indian war)\b'
-        for match in re.finditer(war_keywords, notes, re.IGNORECASE):
+        for match in PATTERNS.tag_war.finditer(notes):
              if not self._has_exclusion_context(notes, match.start()):
                  tags.append("War Veteran")
                  break
 
         # Name check for rank
-        name_keywords = r'captain|major|lieutenant|Lt\.|general|ensign|private|sergeant|colonel'
-        if re.search(name_keywords, profile["name"], re.IGNORECASE):
+        if PATTERNS.name_rank.search(profile["name"]):
              # Basic check to avoid Mrs. Captain
-             if not re.search(r'\b(mrs|miss|ms)\b', profile["name"], re.IGNORECASE):
+             if not PATTERNS.name_honorific.search(profile["name"]):
                 tags.append("War Veteran")
 
         # 4. Founder / Settler
-        founder_keywords = r'\b(founder|settler|pioneer|first settler|original proprietor)\b'
-        for match in re.finditer(founder_keywords, notes, re.IGNORECASE):
+        for match in PATTERNS.tag_founder.finditer(notes):
              if not self._has_exclusion_context(notes, match.start()):
                  tags.append("Founder")
                  break
 
         # 5. Salem Witch Trials
-        witch_keywords = r'\b(witch|salem trials|accused of witchcraft)\b'
-        for match in re.finditer(witch_keywords, notes, re.IGNORECASE):
+        for match in PATTERNS.tag_witch.finditer(notes):
              if not self._has_exclusion_context(notes, match.start()):
                  tags.append("Salem Witch Trials")
                  break
 
         # 6. Education
-        edu_keywords = r'\b(Harvard|Yale|College|University)\b'
-        for match in re.finditer(edu_keywords, notes, re.IGNORECASE):
+        for match in PATTERNS.tag_education.finditer(notes):
              if not self._has_exclusion_context(notes, match.start()):
                  tags.append("University Educated")
                  break
 
         # 7. Quaker
-        quaker_keywords = r'\b(Quaker|Friends)\b'
-        for match in re.finditer(quaker_keywords, notes, re.IGNORECASE):
+        for match in PATTERNS.tag_quaker.finditer(notes):
              if not self._has_exclusion_context(notes, match.start()):
                  tags.append("Quaker")
                  break
 
         # 8. Religious Leader
         # Check Name for "Reverend" or "Deacon"
-        if re.search(r'\b(Reverend|Deacon)\b|\bRev\.?', profile["name"], re.IGNORECASE):
+        if PATTERNS.name_religious.search(profile["name"]):
              tags.append("Religious Leader")
 
         # 9. Westward Pioneer
         # Born in East Coast, Died in Midwest/West
-        east_coast = ["CT", "MA", "NY", "NJ", "PA", "VA", "RI", "VT", "NH", "ME", "DE", "MD", "Connecticut", "Massachusetts", "New York", "New Jersey", "Pennsylvania", "Virginia", "Rhode Island", "Vermont", "New Hampshire", "Maine"]
-        westward_states = ["OH", "IL", "MI", "IN", "WI", "MN", "IA", "MO", "KS", "NE", "SD", "ND", "CA", "OR", "WA", "NV", "AZ", "NM", "UT", "CO", "WY", "ID", "MT", "Ohio", "Illinois", "Michigan", "Indiana", "Wisconsin", "Minnesota", "Iowa", "Missouri", "Kansas", "Nebraska", "California", "Oregon", "Washington", "Nevada", "Arizona", "Utah", "Colorado"]
-
-        # Check if born in East Coast and Died in West
-        def is_in_region(loc, region_list):
+        def is_in_region(loc, abbreviation_pattern, region_names):
             if not loc or loc == "Unknown": return False
-            for r in region_list:
-                # Check for full name or abbreviation with boundary
-                if len(r) == 2:
-                    if re.search(r'\b' + r + r'\b', loc): return True
-                else:
-                    if r.lower() in loc.lower(): return True
-            return False
+            # Abbreviations with word boundaries, full names as case-insensitive substrings
+            if abbreviation_pattern.search(loc): return True
+            loc_lower = loc.lower()
+            return any(r.lower() in loc_lower for r in region_names)
 
-        if is_in_region(born_loc, east_coast) and is_in_region(died_loc, westward_states):
+        if (is_in_region(born_loc, PATTERNS.east_coast_abbreviation, EAST_COAST_NAMES) and
+                is_in_region(died_loc, PATTERNS.westward_abbreviation, WESTWARD_NAMES)):
             tags.append("Westward Pioneer")
 
         return list(set(tags))
 
     def link_family_members(self):
         print("--- Linking Family Members ---")
-        id_map = {p['id']: p for p in self.family_data}
+        id_map = self._get_context().id_map
+        links = 0
 
         for p in self.family_data:
             pid = p['id']
@@ -1322,12 +2014,14 @@ class GenealogyTextPipeline:
                 if child_id in id_map:
                     if child_id not in p['relations']['children']:
                         p['relations']['children'].append(child_id)
+                        links += 1
 
                     child_p = id_map[child_id]
                     if 'relations' not in child_p:
                         child_p['relations'] = {"parents": [], "children": [], "spouses": []}
                     if pid not in child_p['relations']['parents']:
                         child_p['relations']['parents'].append(pid)
+                        links += 1
 
             spouse_candidate = None
             if '.' in pid:
@@ -1348,16 +2042,20 @@ class GenealogyTextPipeline:
             if spouse_candidate and spouse_candidate in id_map:
                 if spouse_candidate not in p['relations']['spouses']:
                     p['relations']['spouses'].append(spouse_candidate)
+                    links += 1
+
+        self.metrics.count("family_links", links)
 
     def _analyze_naming_patterns(self):
         print("--- Analyzing Naming Patterns (The Echo) ---")
-        id_map = {p['id']: p for p in self.family_data}
+        context = self._get_context()
+        id_map = context.id_map
         count = 0
 
         for p in self.family_data:
             # 1. Parse Name
             # Remove suffixes for clean splitting
-            clean_name = re.sub(r',?\s+(Jr\.?|Sr\.?|III|IV|Esq\.?)$', '', p['name'], flags=re.IGNORECASE)
+            clean_name = PATTERNS.name_suffix.sub('', p['name'])
             parts = clean_name.split()
 
             # Need at least 3 parts: First Middle Last
@@ -1389,14 +2087,8 @@ class GenealogyTextPipeline:
                     if curr_id not in id_map: continue
                     ancestor = id_map[curr_id]
 
-                    # Extract Ancestor Surnames
-                    # 1. Last Name
-                    anc_parts = re.sub(r',?\s+(Jr\.?|Sr\.?|III|IV|Esq\.?)$', '', ancestor['name'], flags=re.IGNORECASE).split()
-                    anc_surname = anc_parts[-1].strip(".,")
-
-                    # 2. Maiden Name in Parens: "Mary (Greene) Wainwright"
-                    maiden_match = re.search(r'\((.*?)\)', ancestor['name'])
-                    anc_maiden = maiden_match.group(1).strip() if maiden_match else ""
+                    # Extract Ancestor Surnames (last name and maiden name in parens)
+                    anc_surname, anc_maiden = context.surnames(ancestor)
 
                     # Check for Match
                     is_match = False
@@ -1442,10 +2134,11 @@ class GenealogyTextPipeline:
                 count += 1
 
         print(f"Found {count} Naming Echo matches.")
+        self.metrics.count("naming_echoes", count)
 
     def _get_birth_year(self, profile):
         raw = profile.get("vital_stats", {}).get("born_date", "")
-        match = re.search(r'\d{4}', raw)
+        match = PATTERNS.four_digits.search(raw)
         if match:
             return int(match.group(0))
         return None
@@ -1462,7 +2155,7 @@ class GenealogyTextPipeline:
             full_name = p['name']
 
             # Clean: remove [source], {id}, and trailing punctuation
-            clean_name = re.sub(r'\[.*?\]', '', full_name).split('{')[0].strip()
+            clean_name = PATTERNS.bracketed.sub('', full_name).split('{')[0].strip()
             # Remove trailing comma if present (e.g. from "Dodge, Sr.")
             clean_name = clean_name.rstrip(",.")
 
@@ -1472,7 +2165,7 @@ class GenealogyTextPipeline:
             # 2. Base Name (remove suffix)
             # Handle "Jr", "Sr", "III", "IV", "Esq."
             # Using regex to remove suffix at the end
-            base_name = re.sub(r',?\s+(Jr\.?|Sr\.?|III|IV|Esq\.?)$', '', clean_name, flags=re.IGNORECASE)
+            base_name = PATTERNS.name_suffix.sub('', clean_name)
             if base_name != clean_name:
                 name_index[base_name].append(pid)
 
@@ -1508,213 +2201,44 @@ class GenealogyTextPipeline:
 
         return name_index
 
-    def _scan_text_for_mentions(self, text, name_index, source_profile):
-        """
-        Scans a text block for mentions of names in the index.
-        Returns a list of related_link objects.
-        """
-        if not text:
-            return []
-
-        links = []
-        # known_names = set(name_index.keys())
-
-        # Keywords for relationship types
-        # Added: Uncle, Aunt, Nephew, Niece, Executor, Witness
-        keywords = {
-            "partner": "Business Partner",
-            "business": "Business Partner",
-            "firm": "Business Partner",
-            "colleague": "Business Partner",
-            "married": "Spouse",
-            "wife": "Spouse",
-            "husband": "Spouse",
-            "spouse": "Spouse",
-            "wed": "Spouse",
-            "cousin": "Cousin",
-            "friend": "Friend",
-            "neighbor": "Neighbor",
-            "associate": "Associate",
-            "classmate": "Classmate",
-            "tutor": "Tutor",
-            "student": "Student",
-            "enemy": "Rival",
-            "rival": "Rival",
-            "uncle": "Relative",
-            "aunt": "Relative",
-            "nephew": "Relative",
-            "niece": "Relative",
-            "executor": "Legal Associate",
-            "witness": "Legal Associate",
-            "legacy": "Relative",
-            "mother-in-law": "In-Law",
-            "father-in-law": "In-Law",
-            "son-in-law": "In-Law",
-            "daughter-in-law": "In-Law",
-            "brother-in-law": "In-Law",
-            "sister-in-law": "In-Law",
-            "step-mother": "Step-Parent",
-            "step-father": "Step-Parent",
-            "step-son": "Step-Child",
-            "step-daughter": "Step-Child",
-            "fiancé": "Fiancé",
-            "fiancee": "Fiancé",
-            "betrothed": "Fiancé",
-            "mentor": "Professional",
-            "apprentice": "Professional",
-            "godfather": "Godparent",
-            "godmother": "Godparent",
-            "godson": "Godparent",
-            "goddaughter": "Godparent"
-        }
-
-        # Improved Candidate Extraction
-        # Pattern: Capitalized Words sequence
-        # \b(?:[A-Z]\.?|[A-Z][a-z]+)(?:\s+(?:[A-Z]\.?|[A-Z][a-z]+))+\b
-        name_pattern = r'\b(?:[A-Z]\.?|[A-Z][a-z]+)(?:\s+(?:[A-Z]\.?|[A-Z][a-z]+))+\b'
-        candidates = set(re.findall(name_pattern, text))
-
-        # Filter candidates that are known names
-        # Use name_index.keys() which contains all variations
-        valid_candidates = candidates.intersection(set(name_index.keys()))
-
-        if not valid_candidates:
-            return []
-
-        # Verification and Context
-        clauses = re.split(r'[.;,]', text)
-        source_born = self._get_birth_year(source_profile)
-        found_ids = set()
-
-        id_map = {p['id']: p for p in self.family_data}
-
-        for clause in clauses:
-            if not clause.strip(): continue
-
-            for name in valid_candidates:
-                if name not in clause: continue # Fast string check
-
-                # Exact word boundary check
-                if not re.search(r'\b' + re.escape(name) + r'\b', clause):
-                    continue
-
-                # Ambiguity Resolution Strategy
-                # 1. Get all potential IDs for this name
-                potential_ids = name_index[name]
-
-                # 2. Filter out self
-                potential_ids = [pid for pid in potential_ids if pid != source_profile['id']]
-
-                if not potential_ids:
-                    continue
-
-                # 3. Decision Logic
-                target_id = None
-
-                if len(potential_ids) == 1:
-                    # Unambiguous (only 1 candidate) - Accept it regardless of date (could be ancestor)
-                    target_id = potential_ids[0]
-                else:
-                    # Ambiguous (multiple candidates) - Apply Strict Date Filter
-                    candidates_in_range = []
-                    for pid in potential_ids:
-                        target_p = id_map.get(pid)
-                        if not target_p: continue
-
-                        target_born = self._get_birth_year(target_p)
-
-                        # Strict check for disambiguation (must be within 60 years)
-                        if source_born and target_born:
-                            diff = abs(source_born - target_born)
-                            if diff <= 60:
-                                candidates_in_range.append(pid)
-                        else:
-                            # If dates unknown, we can't safely disambiguate by date
-                            # Treat as ambiguous unless it's the only one?
-                            # Safe bet: skip if date unknown and ambiguous
-                            pass
-
-                    if len(candidates_in_range) == 1:
-                        target_id = candidates_in_range[0]
-                    else:
-                         # Priority: Real Profile over Child Entry
-                        real_candidates = [pid for pid in candidates_in_range if "_c" not in pid]
-                        if len(real_candidates) == 1:
-                             target_id = real_candidates[0]
-                        else:
-                            # Still ambiguous
-                            self.ariadne_log["ambiguous"][name].update(potential_ids)
-                            continue
-
-                if target_id in found_ids: continue
-
-                found_ids.add(target_id)
-
-                # 4. Contemporary Check for Relation Type (Loose Check)
-                # Now that we have the target, we check if they are "contemporary" for the purpose
-                # of inferring "Friend", "Partner", etc. vs just "Mentioned".
-                target_p = id_map.get(target_id)
-                target_born = self._get_birth_year(target_p)
-                is_contemporary = True
-                if source_born and target_born:
-                     if abs(source_born - target_born) > 80: # Keep loose check for 'Mentioned' fallback
-                         is_contemporary = False
-
-                # Determine Type
-                rel_type = "Mentioned"
-                lower_clause = clause.lower()
-
-                for k, v in keywords.items():
-                    if re.search(r'\b' + re.escape(k) + r'\b', lower_clause):
-                        # Special handling for Spousal/Partner keywords vs Non-Contemporary matches
-                        if v in ["Spouse", "Business Partner", "Friend", "Classmate"] and not is_contemporary:
-                            rel_type = "Mentioned"
-                        else:
-                            rel_type = v
-                        break
-
-                # Context sentence (find full sentence containing the clause)
-                full_sentences = self.split_sentences(text)
-                source_sentence = clause.strip()
-                for s in full_sentences:
-                    if clause.strip() in s:
-                        source_sentence = s
-                        break
-
-                links.append({
-                    "target_id": target_id,
-                    "relation_type": rel_type,
-                    "source_text": source_sentence.strip()
-                })
-
-                self.ariadne_log["new_links"] += 1
-                self.ariadne_log["clusters"][name] += 1
-
-        return links
-
-    def _find_mentions(self):
+    def _find_mentions(self, workers=1):
         print("--- Ariadne: Weaving Connections ---")
+        context = self._get_context()
 
-        # Build Name Index
+        # Build Name Index and the read-only scanner (matcher + birth years) shared by every profile
         name_index = self._build_name_index()
+        scanner = MentionScanner(name_index, context.birth_years)
 
         # Track discoveries for the journal
-        self.ariadne_log = {
-            "ambiguous": defaultdict(set),
-            "clusters": defaultdict(int),
-            "new_links": 0
-        }
+        self.ariadne_log = new_scan_log()
+        self.ariadne_log["reverse_links"] = 0
 
         count = 0
 
+        scanned_profiles = []
+        jobs = []
         for p in self.family_data:
             p['related_links'] = []
             notes = p['story']['notes']
             if not notes: continue
 
             # Pass the full name_index (with ambiguities)
-            links = self._scan_text_for_mentions(notes, name_index, p)
+            scanned_profiles.append(p)
+            jobs.append((
+                p['id'],
+                self._get_birth_year(p),
+                notes,
+                context.sentences(p, notes),
+                context.clause_spans(p, notes)
+            ))
+
+        if workers > 1:
+            print(f"   Scanning {len(jobs)} notes blocks across {workers} worker processes")
+
+        # Merge in profile order so serial and parallel runs produce identical output
+        for p, (links, log) in zip(scanned_profiles, scan_in_parallel(scanner, jobs, workers)):
             p['related_links'].extend(links)
+            merge_scan_log(self.ariadne_log, log)
             count += len(links)
 
         print(f"Ariadne found {count} text-based connections.")
@@ -1724,7 +2248,14 @@ class GenealogyTextPipeline:
         # ---------------------------
         print("--- Ariadne: Stitching Reverse Links ---")
         reverse_count = 0
-        id_map = {p['id']: p for p in self.family_data}
+        id_map = self._get_context().id_map
+
+        # Index of (profile_id, linked_id) pairs so the duplicate check is a set lookup
+        # instead of a scan over the target's related_links.
+        linked_pairs = set()
+        for pid, linked_p in id_map.items():
+            for r_link in linked_p.get('related_links', []):
+                linked_pairs.add((pid, r_link['target_id']))
 
         for p in self.family_data:
             source_id = p['id']
@@ -1743,17 +2274,9 @@ class GenealogyTextPipeline:
                     target_p['related_links'] = []
 
                 # Check if reverse link already exists (to prevent duplicates)
-                exists = False
-                for r_link in target_p['related_links']:
-                    if r_link['target_id'] == source_id:
-                        # Check context - if it's already linked, maybe we don't need another?
-                        # Or checking source_text match might be too specific if text differs?
-                        # Let's say if A linked to B, B should link to A.
-                        # If B already links to A, we skip.
-                        exists = True
-                        break
-
-                if not exists:
+                # Let's say if A linked to B, B should link to A.
+                # If B already links to A, we skip.
+                if (target_id, source_id) not in linked_pairs:
                     # Determine reverse type
                     rev_type = rel_type
 
@@ -1777,9 +2300,19 @@ class GenealogyTextPipeline:
                         "relation_type": rev_type,
                         "source_text": f"Mentioned in {source_name}'s notes: \"{source_text[:50]}...\""
                     })
+                    linked_pairs.add((target_id, source_id))
                     reverse_count += 1
+                    self.ariadne_log["relation_types"][rev_type] += 1
 
         print(f"Ariadne added {reverse_count} reverse connections.")
+        self.ariadne_log["reverse_links"] = reverse_count
+        self.metrics.add_counters({
+            "notes_blocks_scanned": len(jobs),
+            "regex_scans": self.ariadne_log["regex_scans"],
+            "links_emitted": count,
+            "reverse_links": reverse_count,
+            "ambiguous_names": len(self.ariadne_log["ambiguous"]),
+        })
 
         # Log Interesting Findings (Console for now)
         print("\n--- Ariadne's Notebook ---")
@@ -1809,6 +2342,11 @@ class GenealogyTextPipeline:
         cluster_examples = ", ".join([f"{name} ({freq})" for name, freq in sorted_clusters[:3]])
 
         new_links_count = self.ariadne_log["new_links"]
+        reverse_links_count = self.ariadne_log.get("reverse_links", 0)
+
+        # Links per relation type (forward and reverse), most common first
+        relation_types = sorted(self.ariadne_log.get("relation_types", {}).items(), key=lambda x: (-x[1], x[0]))
+        relation_summary = ", ".join([f"{rel} ({freq})" for rel, freq in relation_types])
 
         if new_links_count == 0 and ambiguous_count == 0:
             print("   Nothing significant to log.")
@@ -1817,6 +2355,12 @@ class GenealogyTextPipeline:
         entry = f"\n## {today} - Automated Link Analysis\n"
         entry += f"**Discovery:** Analyzed narrative text and found {new_links_count} potential connections.\n"
 
+        if reverse_links_count > 0:
+            entry += f"**Symmetry:** Stitched {reverse_links_count} reverse connections.\n"
+
+        if relation_types:
+            entry += f"**Link Types:** {relation_summary}.\n"
+
         if ambiguous_count > 0:
             entry += f"**Ambiguity Report:** {ambiguous_count} ambiguous references found (e.g., {ambiguous_examples}).\n"
 
@@ -1861,7 +2405,7 @@ class GenealogyTextPipeline:
         # State Abbreviations (with boundary checks to avoid false positives like 'me', 'pa')
         # We look for " CT", ",CT", " CT " or end of string.
         # Simplest is regex for \b(CT|MA|NY|NJ|PA|VA|RI|VT|NH|ME|DE|MD|SC|NC|GA|OH|IL|MI)\b
-        if re.search(r'\b(ct|ma|ny|nj|pa|va|ri|vt|nh|me|de|md|sc|nc|ga|oh|il|mi)\b', loc_lower):
+        if PATTERNS.us_state_abbreviation.search(loc_lower):
             return "USA"
 
         return "Unknown"
@@ -1882,7 +2426,7 @@ class GenealogyTextPipeline:
              try:
                  # "1630" or "c. 1630"
                  yb_str = str(voyage["specs"]["year_built"])
-                 match = re.search(r'\d{4}', yb_str)
+                 match = PATTERNS.four_digits.search(yb_str)
                  if match:
                      year = int(match.group(0)) + 5 # Assume voyage is slightly after build
              except:
@@ -1948,30 +2492,22 @@ class GenealogyTextPipeline:
 
         return context
 
-    def clean_and_save(self):
+    def dedupe_child_entries(self):
+        """
+        Child entries that name a real profile are folded into it (the parent
+        is linked to the real profile); the rest are kept as profiles of
+        their own.
+        """
         # 1. First pass: separate "Real" profiles from "Child" entries
-        real_profiles = {}
-        child_entries = []
-
-        for p in self.family_data:
-            if p.get("metadata", {}).get("is_child_entry"):
-                child_entries.append(p)
-            else:
-                pid = p['id']
-                if pid not in real_profiles:
-                    real_profiles[pid] = p
+        # (the shared context does this once, along with the real-name index)
+        context = self._get_context()
+        real_profiles = context.real_profiles
+        child_entries = context.child_entries
 
         # 2. Process Child Entries:
         # If a child entry matches a Real Profile by Name, discard the child entry (the real one is better).
         # Otherwise, keep the child entry.
 
-        # Build Name Map for Real Profiles
-        real_name_map = {}
-        for pid, p in real_profiles.items():
-            # Normalize name: remove parens, extra spaces
-            norm = re.sub(r'\(.*?\)', '', p['name']).strip().lower()
-            real_name_map[norm] = pid
-
         final_profiles = list(real_profiles.values())
 
         for child in child_entries:
@@ -1981,37 +2517,36 @@ class GenealogyTextPipeline:
             # Simple check: if "Grace Dodge" is in the real profile name?
 
             # Simple normalization
-            c_name = re.sub(r'\[.*?\]', '', child['name']) # remove spouses in brackets
-            c_name = re.sub(r'\(.*?\)', '', c_name)
+            c_name = PATTERNS.bracketed.sub('', child['name']) # remove spouses in brackets
+            c_name = PATTERNS.parenthetical.sub('', c_name)
             # Remove suffixes like ", 1st son", ", 2nd daughter", etc.
-            c_name = re.sub(r',\s*\d+(?:st|nd|rd|th)?\s+(?:son|daughter|child)', '', c_name, flags=re.IGNORECASE)
-            c_name = re.sub(r',\s+(?:son|daughter|child)', '', c_name, flags=re.IGNORECASE)
+            c_name = PATTERNS.child_ordinal.sub('', c_name)
+            c_name = PATTERNS.child_role.sub('', c_name)
             c_name = c_name.strip().lower()
 
             match_found = False
-            for real_name, real_id in real_name_map.items():
-                # Check for strong match
-                if c_name == real_name or (len(c_name) > 5 and c_name in real_name):
-                    # Link parent to this REAL profile instead of the child entry
-                    parent_id = child["metadata"]["parent_id"]
-
-                    # Add parent/child link
-                    if parent_id in real_profiles:
-                         parent = real_profiles[parent_id]
-                         if 'relations' not in parent: parent['relations'] = {"children": [], "parents": [], "spouses": []}
-                         if real_id not in parent['relations']['children']:
-                             parent['relations']['children'].append(real_id)
-
-                    real_p = real_profiles[real_id]
-                    if 'relations' not in real_p: real_p['relations'] = {"children": [], "parents": [], "spouses": []}
-
-                    # Prevent linking self as parent (e.g. if child name matches parent name)
-                    if parent_id != real_id:
-                        if parent_id not in real_p['relations']['parents']:
-                            real_p['relations']['parents'].append(parent_id)
-
-                    match_found = True
-                    break
+            # Check for strong match (exact, or substring for names longer than 5 chars)
+            real_id = context.match_real_name(c_name)
+            if real_id is not None:
+                # Link parent to this REAL profile instead of the child entry
+                parent_id = child["metadata"]["parent_id"]
+
+                # Add parent/child link
+                if parent_id in real_profiles:
+                     parent = real_profiles[parent_id]
+                     if 'relations' not in parent: parent['relations'] = {"children": [], "parents": [], "spouses": []}
+                     if real_id not in parent['relations']['children']:
+                         parent['relations']['children'].append(real_id)
+
+                real_p = real_profiles[real_id]
+                if 'relations' not in real_p: real_p['relations'] = {"children": [], "parents": [], "spouses": []}
+
+                # Prevent linking self as parent (e.g. if child name matches parent name)
+                if parent_id != real_id:
+                    if parent_id not in real_p['relations']['parents']:
+                        real_p['relations']['parents'].append(parent_id)
+
+                match_found = True
 
             if not match_found:
                 # Keep this child entry as a new profile
@@ -2031,17 +2566,20 @@ class GenealogyTextPipeline:
                 child['relations']['parents'].append(parent_id)
 
         self.family_data = final_profiles
+        context.set_profiles(final_profiles)
 
-        # Re-deduplicate just in case?
-        # self.family_data already unique by logic above.
-
-        self.link_family_members()
-        self._analyze_naming_patterns()
-        self._find_mentions()
-
+    def enrich_profiles(self):
+        """
+        Geocodes every location, enriches voyages (route countries, ship
+        specs, shipmates, historical context), counts associates and picks
+        each profile's hero image. Leaves the location table for
+        locations.json in self.location_table.
+        """
         # Initialize Services
-        geocoder = GeocodingService()
-        ship_service = ShipEnrichmentService()
+        self.retry_policy.lookups.clear()
+        geocoder = GeocodingService(self.cache_db, self.retry_policy, Gazetteer(self._parse_location_hierarchy),
+                                    api_enabled=self.geocode_api)
+        ship_service = ShipEnrichmentService(self.cache_db, self.retry_policy, batch_size=self.ship_batch_size)
 
         print("--- Fetching Hero Images, Geocoding, and Ship Info ---")
 
@@ -2065,8 +2603,20 @@ class GenealogyTextPipeline:
                             "name": p["name"]
                         })
 
-        final_list = []
-        
+        # Resolve every uncached location, ship and image key up front, with
+        # the services running side by side
+        self.enrich_concurrently(self.family_data, geocoder, ship_service, list(ship_manifest))
+
+        # Geocode each distinct location once; profiles take their coords
+        # from the table. Coverage is reported per distinct location.
+        geocoder.reset_stats()
+        location_table = self.build_location_table(self.family_data, geocoder)
+        geocoder.report_coverage()
+
+        def coords_for(loc):
+            entry = location_table.get(loc)
+            return entry["coords"] if entry else None
+
         for p in self.family_data:
             # Inject Associate Frequency
             if "associates" in p["story"]:
@@ -2077,13 +2627,13 @@ class GenealogyTextPipeline:
             born_loc = p["vital_stats"]["born_location"]
             died_loc = p["vital_stats"]["died_location"]
 
-            p["vital_stats"]["born_coords"] = geocoder.geocode(born_loc)
-            p["vital_stats"]["died_coords"] = geocoder.geocode(died_loc)
+            p["vital_stats"]["born_coords"] = coords_for(born_loc)
+            p["vital_stats"]["died_coords"] = coords_for(died_loc)
 
             # Geocode Life Events
             for event in p["story"]["life_events"]:
                 if "location" in event and event["location"] != "Unknown":
-                    event["coords"] = geocoder.geocode(event["location"])
+                    event["coords"] = coords_for(event["location"])
 
             # Enrich Voyage Data
             if "voyages" in p["story"]:
@@ -2115,58 +2665,356 @@ class GenealogyTextPipeline:
 
             # Fetch Image
             born_year = p["vital_stats"].get("born_year_int")
-            hero_image = self.fetch_wikimedia_image(born_loc, born_year)
-
-            # Extract Tags
-            tags = self.extract_tags(p)
-
-            final_profile = {
-                "id": p["id"],
-                "name": p["name"],
-                "lineage": p.get("lineage", "Unknown"),
-                "generation": p["generation"],
-                "vital_stats": p["vital_stats"],
-                "story": {
-                    "notes": p["story"]["notes"],
-                    "voyages": p["story"].get("voyages", []),
-                    "life_events": p["story"].get("life_events", []),
-                    "tags": tags,
-                    "associates": p["story"].get("associates", []),
-                    "naming_echo": p["story"].get("naming_echo")
-                },
-                "hero_image": hero_image,
-                "relations": p.get("relations", {}),
-                "related_links": p.get("related_links", []),
-                "metadata": {
-                    "source_ref": p["metadata"]["source_id"],
-                    "location_in_doc": f"Paragraph #{p['metadata']['doc_paragraph_index']}"
-                }
-            }
-            final_list.append(final_profile)
+            p["hero_image"] = self.fetch_wikimedia_image(born_loc, born_year)
 
-        # Save Cache
+        self.location_table = location_table
+        self.metrics.add_counters(geocoder.tier_counts, prefix="geocode_")
+        self.metrics.add_counters(self.retry_policy.lookups, prefix="cache_")
+        self.metrics.count("ship_api_requests", ship_service.requests_made)
+
+        # Commit the enrichment store and export the JSON copies the frontend reads
         self.save_cache()
         geocoder.save_cache()
         ship_service.save_cache()
 
-        output_filename = "kinship-app/public/data/family_data.json"
-        with open(output_filename, "w", encoding='utf-8') as f:
-            json.dump(final_list, f, indent=4, ensure_ascii=True)
-        
+    def tag_profiles(self):
+        for p in self.family_data:
+            p["story"]["tags"] = self.extract_tags(p)
+            self.metrics.count("tags", len(p["story"]["tags"]))
+
+    def _final_profile(self, p):
+        # A record is converted once here; the lookups below are then plain dict ones
+        p = as_dict(p)
+        story = p["story"]
+        vital_stats = p["vital_stats"]
+        life_events = story.get("life_events", [])
+        if not self.embed_coords:
+            # The app reads these from locations.json instead
+            vital_stats = {k: v for k, v in vital_stats.items() if k not in ("born_coords", "died_coords")}
+            life_events = [{k: v for k, v in e.items() if k != "coords"} for e in life_events]
+
+        return {
+            "id": p["id"],
+            "name": p["name"],
+            "lineage": p.get("lineage", "Unknown"),
+            "generation": p["generation"],
+            "vital_stats": vital_stats,
+            "story": {
+                "notes": story["notes"],
+                "voyages": story.get("voyages", []),
+                "life_events": life_events,
+                "tags": story["tags"],
+                "associates": story.get("associates", []),
+                "naming_echo": story.get("naming_echo")
+            },
+            "hero_image": p["hero_image"],
+            "relations": p.get("relations", {}),
+            "related_links": p.get("related_links", []),
+            "metadata": {
+                "source_ref": p["metadata"]["source_id"],
+                "location_in_doc": f"Paragraph #{p['metadata']['doc_paragraph_index']}"
+            }
+        }
+
+    def _encode_profile(self, final, strings):
+        """
+        Copy of a final profile with its interned strings (labels,
+        locations, hierarchies, ship names) replaced by codes into strings.
+        """
+        vital_stats = dict(final["vital_stats"])
+        for key in ("born_location", "died_location"):
+            if key in vital_stats:
+                vital_stats[key] = strings.encode(vital_stats[key])
+        for key in ("born_hierarchy", "died_hierarchy"):
+            if vital_stats.get(key):
+                vital_stats[key] = {k: strings.encode(v) for k, v in vital_stats[key].items()}
+
+        story = dict(final["story"])
+        story["voyages"] = [dict(v, ship_name=strings.encode(v["ship_name"]), departure=strings.encode(v["departure"]),
+                                 arrival=strings.encode(v["arrival"])) for v in story["voyages"]]
+        story["life_events"] = [dict(e, location=strings.encode(e["location"])) for e in story["life_events"]]
+
+        return dict(final, lineage=strings.encode(final["lineage"]), generation=strings.encode(final["generation"]),
+                    vital_stats=vital_stats, story=story)
+
+    def _index_entry(self, final, shard):
+        """
+        A final profile cut down to what the list, graph and relationship
+        views need before any detail shard has loaded.
+        """
+        vital_stats = final["vital_stats"]
+        return {
+            "id": final["id"],
+            "name": final["name"],
+            "lineage": final["lineage"],
+            "generation": final["generation"],
+            "vital_stats": {key: vital_stats[key] for key in
+                            ("born_date", "born_location", "died_date", "born_year_int", "died_year_int")
+                            if key in vital_stats},
+            "story": {"tags": final["story"]["tags"]},
+            "has_story": bool(final["story"]["notes"]),
+            "relations": final["relations"],
+            "shard": shard
+        }
+
+    def _detail_shard(self, p):
+        # "Paternal", "GENERATION X:  EIGHT GREAT GRANDPARENTS" -> paternal-generation-x-eight-great-grandparents.json
+        label = f"{p.get('lineage', 'Unknown')} {p['generation']}".lower()
+        slug = "".join(c if c.isalnum() else "-" for c in label)
+        return "-".join(part for part in slug.split("-") if part) + ".json"
+
+    def emit_index(self, index, shards, data_dir, outputs):
+        """
+        Writes family_index.json ({"shards": [...], "profiles": [...]}, each
+        entry's shard being a position in shards) into data_dir, as part of
+        the emit's OutputGroup.
+        """
+        with outputs.writer(os.path.join(data_dir, FAMILY_INDEX_NAME), pretty=self.pretty_json) as out:
+            out.write_object([("shards", list(shards)), ("profiles", iter(index))])
+
+    def emit(self, output_filename=FAMILY_DATA_OUTPUT):
+        self.save_location_table(self.location_table)
+        data_dir = os.path.dirname(output_filename)
+        details_dir = os.path.join(data_dir, DETAILS_DIR_NAME)
+        os.makedirs(details_dir, exist_ok=True)
+        index = []
+        # Shard file -> (its writer, its position in family_index.json)
+        shards = {}
+        # (lineage, generation) -> shard file, so each slug is built once
+        shard_names = {}
+
+        # No output replaces its old file until every one is complete, and
+        # family_index.json, which the app reads first, is replaced last
+        with OutputGroup() as outputs:
+            with contextlib.ExitStack() as shard_files:
+                def finalize():
+                    # Each profile is finalized once, as the writer reaches it,
+                    # and written straight out to family_data.json and to its
+                    # detail shard; only its index entry is kept for
+                    # family_index.json
+                    for p in self.family_data:
+                        final = self._final_profile(p)
+                        label = (final.get("lineage", "Unknown"), final["generation"])
+                        name = shard_names.get(label)
+                        if name is None:
+                            name = shard_names[label] = self._detail_shard(final)
+                        if name not in shards:
+                            shard = shard_files.enter_context(
+                                outputs.writer(os.path.join(details_dir, name), pretty=self.pretty_json))
+                            shard.begin_object()
+                            shards[name] = (shard, len(shards))
+                        shard, number = shards[name]
+                        shard.write_member(final["id"], final)
+                        index.append(self._index_entry(final, number))
+                        yield final
+
+                finals = finalize()
+                with outputs.writer(output_filename, pretty=self.pretty_json) as out:
+                    if self.dictionary_encode:
+                        # DataLoader.jsx decodes this form back into the profile list.
+                        # The string table goes last: encoding may add values to it.
+                        strings = self.strings.dictionary()
+                        out.write_object([("format", "dictionary"),
+                                          ("profiles", (self._encode_profile(p, strings) for p in finals)),
+                                          ("strings", lambda: strings.values)])
+                    else:
+                        out.write_array(finals)
+                for shard, _ in shards.values():
+                    shard.end_object()
+            self.emit_index(index, shards, data_dir, outputs)
+
+        # Only now that the new index is in place can shards it no longer
+        # lists go
+        for name in os.listdir(details_dir):
+            if name.endswith(".json") and name not in shards:
+                os.remove(os.path.join(details_dir, name))
+
         print(f"Data saved to {output_filename}")
+        print(f"Index saved to {os.path.join(data_dir, FAMILY_INDEX_NAME)} ({len(shards)} detail shards)")
+        self.metrics.count("profiles", len(self.family_data))
+        self.metrics.count("bytes_written", os.path.getsize(output_filename))
+        self.metrics.count("detail_shards", len(shards))
+        self.metrics.count("index_bytes", os.path.getsize(os.path.join(data_dir, FAMILY_INDEX_NAME)))
+
+    def build_stages(self, sources, workers=1, parse_workers=None):
+        def code(stage, *extra):
+            return [getattr(GenealogyTextPipeline, name) for name in self.STAGE_METHODS[stage]] + list(extra)
+
+        return [
+            Stage("parse", lambda: self.parse_documents(sources, workers=parse_workers), code("parse", profile_model),
+                  params=lambda: {"parser": self._parser_fingerprint()}),
+            Stage("dedupe", self.dedupe_child_entries, code("dedupe", PipelineContext, pipeline_patterns)),
+            Stage("link", self.link_family_members, code("link", PipelineContext)),
+            Stage("echo", self._analyze_naming_patterns, code("echo", PipelineContext, pipeline_patterns)),
+            Stage("mentions", lambda: self._find_mentions(workers=workers),
+                  code("mentions", PipelineContext, pipeline_patterns, mention_scanner, name_matcher)),
+            Stage("enrich", self.enrich_profiles,
+                  code("enrich", GeocodingService, ShipEnrichmentService, inspect.getmodule(Gazetteer),
+                       inspect.getmodule(WikimediaImageService), inspect.getmodule(EnrichmentJob),
+                       inspect.getmodule(CacheStore)),
+                  params=self._enrichment_inputs),
+            Stage("tag", self.tag_profiles, code("tag", pipeline_patterns)),
+            Stage("emit", self.emit, code("emit", profile_model, json_stream), cache=False),
+        ]
 
-if __name__ == "__main__":
-    files = {
-        "Paternal": "GENEALOGY DSD Paternal Ancestry.docx",
-        "Maternal": "GENEALOGY DSD Maternal Ancestry.docx"
-    }
+    def _enrichment_inputs(self):
+        # What the enrich stage reads besides the profiles: the gazetteer,
+        # the enrichment store (and the JSON files it is seeded from) and
+        # the retry policy. Expired TTLs are not tracked; --force enrich
+        # picks those up.
+        return {
+            "gazetteer": file_fingerprint(GAZETTEER_PATH),
+            "store": store_fingerprint(self.cache_db),
+            "seeds": file_fingerprint(*EXPORT_PATHS.values()),
+            "refresh_negatives": self.retry_policy.refresh_negatives,
+            "geocode_api": self.geocode_api,
+        }
+
+    def dump_state(self):
+        return {"family_data": [as_dict(p) for p in self.family_data], "location_table": self.location_table}
 
+    def load_state(self, state):
+        self.family_data = [Profile.from_dict(p) for p in state["family_data"]]
+        for p in self.family_data:
+            self._intern_story(p["story"])
+        self.location_table = state["location_table"]
+        self.context = None
+
+    def run_stages(self, sources, workers=1, parse_workers=None, from_stage=None, only=None, force=(),
+                   artifact_dir=None):
+        """
+        Runs parse through emit with a StageRunner: stages whose input,
+        code and params are unchanged since a previous run are skipped and
+        their output is read from .pipeline_cache/stages when needed.
+        """
+        runner = StageRunner(self.build_stages(sources, workers, parse_workers), self.dump_state, self.load_state,
+                             artifact_dir or os.path.join(self.PARSE_CACHE_DIR, "stages"), metrics=self.metrics)
+        documents = hashlib.sha256()
+        for lineage, filename in sources:
+            documents.update(f"{lineage}\0{file_fingerprint(filename)}\0".encode("utf-8"))
+        runner.run(documents.hexdigest(), from_stage=from_stage, only=only, force=force)
+        if runner.reused:
+            print(f"--- Reused stage artifacts: {', '.join(runner.reused)}; ran: {', '.join(runner.ran) or 'none'} ---")
+        return runner
+
+    def clean_and_save(self, workers=1):
+        """Runs every stage after parsing, in memory and without stage artifacts."""
+        for name, run in [("dedupe", self.dedupe_child_entries),
+                          ("link", self.link_family_members),
+                          ("echo", self._analyze_naming_patterns),
+                          ("mentions", lambda: self._find_mentions(workers=workers)),
+                          ("enrich", self.enrich_profiles),
+                          ("tag", self.tag_profiles),
+                          ("emit", self.emit)]:
+            with self.metrics.stage(name):
+                run()
+
+def load_sources(config_path):
+    """
+    Returns the (lineage, path) pairs to parse, in merge order. Paths in the
+    config are relative to the config file.
+    """
+    if not os.path.exists(config_path):
+        print(f"No sources config at {config_path}, using the default lineage documents.")
+        return list(DEFAULT_SOURCES)
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    base_dir = os.path.dirname(config_path)
+    return [(doc["lineage"], os.path.join(base_dir, doc["path"])) for doc in config["documents"]]
+
+def _parse_lineage_document(lineage, filename, use_parse_cache):
+    # Runs in a worker process: parse one document and hand its profiles back
     pipeline = GenealogyTextPipeline()
+    pipeline.use_parse_cache = use_parse_cache
+    with pipeline.metrics.timer("parse_document"):
+        pipeline.parse_document(filename, lineage)
+    return pipeline.family_data, pipeline.date_stats, dict(pipeline.metrics.counters), pipeline.metrics.timers
 
-    for lineage, filename in files.items():
-        if os.path.exists(filename):
-            pipeline.parse_document(filename, lineage)
-        else:
-            print(f"Error: Could not find {filename}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse the genealogy documents into family_data.json")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for Ariadne's mention scan (default: 1, serial)")
+    parser.add_argument("--no-parse-cache", action="store_true",
+                        help="Reparse every profile block and date string instead of reusing cached results from .pipeline_cache")
+    parser.add_argument("--sources", default=SOURCES_CONFIG,
+                        help=f"JSON file listing the lineage documents to parse (default: {SOURCES_CONFIG})")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Processes for parsing lineage documents (default: one per document; 1 parses in-process)")
+    parser.add_argument("--image-workers", type=int, default=4,
+                        help="Concurrent Wikimedia lookups when enriching hero images (default: 4)")
+    parser.add_argument("--ship-batch-size", type=int, default=20,
+                        help="Ship names per Gemini request when enriching voyages (default: 20; 1 sends one request per ship)")
+    parser.add_argument("--geocode-api", action="store_true",
+                        help="Look up places missing from the built-in tables and the gazetteer on Nominatim "
+                             "(one request per second; default: fall back to the region or country)")
+    parser.add_argument("--refresh-negatives", action="store_true",
+                        help="Retry cached misses and failed lookups (ships, images, geocodes) once this run, ignoring their TTLs")
+    parser.add_argument("--no-embedded-coords", action="store_true",
+                        help="Leave coordinates out of family_data.json; the app reads them from locations.json")
+    parser.add_argument("--dictionary-encode", action="store_true",
+                        help="Write repeated locations, labels and ship names in family_data.json as codes into one string table "
+                             "(family_index.json and details/ stay unencoded)")
+    parser.add_argument("--pretty-json", action="store_true",
+                        help="Indent family_data.json for reading (default: compact UTF-8)")
+    stage_list = ", ".join(GenealogyTextPipeline.STAGE_NAMES)
+    parser.add_argument("--from-stage", choices=GenealogyTextPipeline.STAGE_NAMES,
+                        help="Rerun this stage and every later one, reusing the last artifacts of the earlier stages")
+    parser.add_argument("--only", type=lambda v: v.split(","), default=None,
+                        help=f"Comma-separated stages to run on top of the last artifacts ({stage_list})")
+    parser.add_argument("--force", type=lambda v: v.split(","), default=(),
+                        help="Comma-separated stages to rerun even if unchanged, or 'all'")
+    parser.add_argument("--no-stage-cache", action="store_true",
+                        help="Run every stage in memory without reading or writing stage artifacts")
+    parser.add_argument("--metrics", default=DEFAULT_METRICS_PATH,
+                        help=f"Where to write per-stage timings, memory and counters (default: {DEFAULT_METRICS_PATH})")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record each stage's tracemalloc peak in the metrics (slows the run down)")
+    parser.add_argument("--profile", nargs="?", const="all", default=None, metavar="TARGETS",
+                        help="Write cProfile .pstats and collapsed-stack files per stage; optionally only for the "
+                             f"comma-separated stages or methods given, e.g. mentions,parse_document (also ${PROFILE_ENV})")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR,
+                        help=f"Where to write profiles (default: {DEFAULT_PROFILE_DIR})")
+    args = parser.parse_args()
+
+    sources = load_sources(args.sources)
 
-    pipeline.clean_and_save()
+    pipeline = GenealogyTextPipeline()
+    pipeline.use_parse_cache = not args.no_parse_cache
+    pipeline.image_workers = args.image_workers
+    pipeline.enrichment_concurrency["images"] = args.image_workers
+    pipeline.ship_batch_size = args.ship_batch_size
+    pipeline.retry_policy = RetryPolicy(refresh_negatives=args.refresh_negatives)
+    pipeline.geocode_api = args.geocode_api
+    pipeline.embed_coords = not args.no_embedded_coords
+    pipeline.dictionary_encode = args.dictionary_encode
+    pipeline.pretty_json = args.pretty_json
+    profiler = profiler_from_env(args.profile, args.profile_dir)
+    if profiler:
+        unknown = profiler.unknown_targets(pipeline, GenealogyTextPipeline.STAGE_NAMES)
+        if unknown:
+            parser.error(f"Unknown profile target(s): {', '.join(unknown)}")
+        profiler.wrap_methods(pipeline, GenealogyTextPipeline.STAGE_NAMES)
+        # Parse worker processes are not profiled, so parse here instead
+        if args.parse_workers != 1 and profiler.needs_in_process("parse", GenealogyTextPipeline.STAGE_NAMES):
+            print("Profiling: parsing the documents in this process (--parse-workers 1)")
+            args.parse_workers = 1
+    pipeline.metrics = PipelineMetrics(trace_memory=args.trace_memory, profiler=profiler)
+    if args.no_stage_cache:
+        with pipeline.metrics.stage("parse"):
+            pipeline.parse_documents(sources, workers=args.parse_workers)
+        pipeline.clean_and_save(workers=args.workers)
+    else:
+        try:
+            pipeline.run_stages(sources, workers=args.workers, parse_workers=args.parse_workers,
+                                from_stage=args.from_stage, only=args.only, force=args.force)
+        except (ValueError, RuntimeError) as e:
+            parser.error(str(e))
+
+    pipeline.metrics.report()
+    if profiler:
+        profiler.save()
+    previous_metrics = pipeline.metrics.save(args.metrics)
+    if previous_metrics:
+        report_comparison(previous_metrics, pipeline.metrics.to_dict())
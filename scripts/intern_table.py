@@ -0,0 +1,95 @@
+"""
+Shared interning table for the strings that repeat across profiles:
+locations ("Hartford, CT" on thousands of births, deaths, events and
+voyages), generation and lineage labels, ship names and sources. Every
+field routed through the table gets one shared copy of each value.
+
+The table counts what goes through it per field, so a run can report how
+many distinct values back how many references, and it hands emitters a
+StringDictionary for writing dictionary-encoded output.
+"""
+from collections import Counter, defaultdict
+
+
+class StringDictionary:
+    """
+    Integer codes for dictionary-encoded output. Seeded values get the
+    lowest codes; anything else is appended the first time it is encoded.
+    Non-strings (None, numbers) are left as they are.
+    """
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value):
+        if not isinstance(value, str):
+            return value
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code):
+        return self.values[code] if isinstance(code, int) else code
+
+
+class InternTable:
+    def __init__(self):
+        self._shared = {}
+        self._distinct = defaultdict(set)
+        self.totals = Counter()
+        self.uses = Counter()
+
+    def intern(self, value, field):
+        """
+        The shared copy of value. Lists and dicts (location hierarchies)
+        have their string items interned in place.
+        """
+        if isinstance(value, str):
+            shared = self._shared.setdefault(value, value)
+            self._distinct[field].add(shared)
+            self.totals[field] += 1
+            self.uses[shared] += 1
+            return shared
+        if isinstance(value, list):
+            value[:] = [self.intern(v, field) for v in value]
+        elif isinstance(value, dict):
+            for key, v in value.items():
+                value[key] = self.intern(v, field)
+        return value
+
+    def reset_counts(self):
+        # The shared copies stay; only the statistics start over
+        self._distinct.clear()
+        self.totals.clear()
+        self.uses.clear()
+
+    def stats(self):
+        """Distinct values and total references per field since the last reset."""
+        return {field: {"distinct": len(self._distinct[field]), "total": self.totals[field]}
+                for field in sorted(self.totals)}
+
+    def counters(self):
+        counters = {}
+        for field, stats in self.stats().items():
+            counters[f"{field}_distinct"] = stats["distinct"]
+            counters[f"{field}_total"] = stats["total"]
+        return counters
+
+    def report(self):
+        print("--- Interned Strings ---")
+        for field, stats in self.stats().items():
+            print(f"   {field}: {stats['distinct']} distinct values for {stats['total']} references")
+
+    def dictionary(self):
+        """A StringDictionary giving the most used values the shortest codes."""
+        ranked = sorted(self.uses, key=lambda value: (-self.uses[value], value))
+        return StringDictionary(ranked)
+
+
+# The table the parser and the profile records share within a process
+STRINGS = InternTable()
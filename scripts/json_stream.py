@@ -0,0 +1,159 @@
+"""
+Streaming JSON writer for family_data.json. Arrays are serialized an item
+at a time as their generator yields, so the whole document never exists
+in memory as one list or one string. Output goes to a uniquely named temp
+file next to path, which is synced to disk and renamed over path only once
+the document is complete; a run that fails halfway leaves the previous file
+in place. Files that belong together (family_data.json, its detail shards
+and family_index.json) are written through one OutputGroup, which holds
+every rename back until all of them are complete.
+
+Compact mode (the default) writes no whitespace and keeps non-ASCII
+characters as UTF-8. Pretty mode is for reading the file: it matches
+json.dump(..., indent=4, ensure_ascii=True) byte for byte.
+"""
+import json
+import os
+import tempfile
+
+INDENT = 4
+
+# Temp files are created 0600; outputs get the mode open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class OutputGroup:
+    """
+    Writers whose files replace the old ones together: each completed file
+    waits as its temp file until the group exits, then all are renamed into
+    place in the order they completed. A failure anywhere in the group
+    leaves every old file in place.
+    """
+
+    def __init__(self):
+        self._complete = []
+
+    def writer(self, path, pretty=False):
+        return JSONStreamWriter(path, pretty=pretty, group=self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for out in self._complete:
+            if exc_type is None:
+                os.replace(out.tmp_path, out.path)
+            else:
+                os.remove(out.tmp_path)
+        return False
+
+
+class JSONStreamWriter:
+    def __init__(self, path, pretty=False, group=None):
+        self.path = path
+        self.tmp_path = None
+        self.pretty = pretty
+        self.group = group
+        self._file = None
+        # [depth, still empty] of each object being written
+        self._objects = []
+
+    def __enter__(self):
+        # A unique name per writer, so concurrent runs never share a temp file
+        self._file = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=os.path.dirname(self.path) or ".",
+            prefix=os.path.basename(self.path) + ".", suffix=".tmp", delete=False)
+        self.tmp_path = self._file.name
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._file.close()
+            os.remove(self.tmp_path)
+            return False
+        # The data must be on disk before the rename, or a crash can leave
+        # an empty file under the final name
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.chmod(self.tmp_path, 0o666 & ~_UMASK)
+        except BaseException:
+            self._file.close()
+            os.remove(self.tmp_path)
+            raise
+        if self.group is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            self.group._complete.append(self)
+        return False
+
+    def _dumps(self, value, depth):
+        if not self.pretty:
+            return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        text = json.dumps(value, indent=INDENT, ensure_ascii=True)
+        # Strings never hold a raw newline, so every newline starts a nested line
+        return text.replace("\n", "\n" + " " * (INDENT * depth)) if depth else text
+
+    def _open(self, bracket, first, depth):
+        # Separator before a member: the bracket itself for the first one
+        if not self.pretty:
+            return bracket if first else ","
+        return (bracket if first else ",") + "\n" + " " * (INDENT * (depth + 1))
+
+    def _close(self, bracket, empty, depth):
+        if empty:
+            return bracket
+        return ("\n" + " " * (INDENT * depth) if self.pretty else "") + bracket
+
+    def write_array(self, items, depth=0):
+        """Writes items (any iterable) as a JSON array; returns how many were written."""
+        count = 0
+        for item in items:
+            self._file.write(self._open("[", count == 0, depth))
+            self._file.write(self._dumps(item, depth + 1))
+            count += 1
+        if count == 0:
+            self._file.write("[")
+        self._file.write(self._close("]", count == 0, depth))
+        return count
+
+    def write_object(self, members, depth=0):
+        """
+        Writes (key, value) pairs as a JSON object. Generator values are
+        streamed as arrays, and callables are called when their member is
+        reached, so a value can depend on what was streamed before it.
+        """
+        self.begin_object(depth)
+        for key, value in members:
+            self.write_member(key, value)
+        self.end_object()
+
+    def begin_object(self, depth=0):
+        """
+        Opens an object whose members are then written one call at a time
+        with write_member(), for callers that produce them across several
+        writers at once; end_object() closes it.
+        """
+        self._objects.append([depth, True])
+
+    def write_member(self, key, value):
+        """Writes one member of the object opened last, as write_object() does."""
+        state = self._objects[-1]
+        depth, first = state
+        self._file.write(self._open("{", first, depth))
+        self._file.write(self._dumps(key, 0) + (": " if self.pretty else ":"))
+        if callable(value):
+            value = value()
+        if isinstance(value, (list, dict, str, int, float, bool)) or value is None:
+            self._file.write(self._dumps(value, depth + 1))
+        else:
+            self.write_array(value, depth + 1)
+        state[1] = False
+
+    def end_object(self):
+        depth, empty = self._objects.pop()
+        if empty:
+            self._file.write("{")
+        self._file.write(self._close("}", empty, depth))
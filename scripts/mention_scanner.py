@@ -0,0 +1,267 @@
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from name_matcher import NameMatcher
+from pipeline_patterns import PATTERNS
+
+# Keywords for relationship types
+# Added: Uncle, Aunt, Nephew, Niece, Executor, Witness
+RELATION_KEYWORDS = {
+    "partner": "Business Partner",
+    "business": "Business Partner",
+    "firm": "Business Partner",
+    "colleague": "Business Partner",
+    "married": "Spouse",
+    "wife": "Spouse",
+    "husband": "Spouse",
+    "spouse": "Spouse",
+    "wed": "Spouse",
+    "cousin": "Cousin",
+    "friend": "Friend",
+    "neighbor": "Neighbor",
+    "associate": "Associate",
+    "classmate": "Classmate",
+    "tutor": "Tutor",
+    "student": "Student",
+    "enemy": "Rival",
+    "rival": "Rival",
+    "uncle": "Relative",
+    "aunt": "Relative",
+    "nephew": "Relative",
+    "niece": "Relative",
+    "executor": "Legal Associate",
+    "witness": "Legal Associate",
+    "legacy": "Relative",
+    "mother-in-law": "In-Law",
+    "father-in-law": "In-Law",
+    "son-in-law": "In-Law",
+    "daughter-in-law": "In-Law",
+    "brother-in-law": "In-Law",
+    "sister-in-law": "In-Law",
+    "step-mother": "Step-Parent",
+    "step-father": "Step-Parent",
+    "step-son": "Step-Child",
+    "step-daughter": "Step-Child",
+    "fiancé": "Fiancé",
+    "fiancee": "Fiancé",
+    "betrothed": "Fiancé",
+    "mentor": "Professional",
+    "apprentice": "Professional",
+    "godfather": "Godparent",
+    "godmother": "Godparent",
+    "godson": "Godparent",
+    "goddaughter": "Godparent"
+}
+
+# Compiled once; order matters (first keyword found in the clause wins)
+_KEYWORD_PATTERNS = [(re.compile(r'\b' + re.escape(k) + r'\b'), v) for k, v in RELATION_KEYWORDS.items()]
+
+
+def new_scan_log():
+    return {
+        "ambiguous": defaultdict(set),
+        "clusters": defaultdict(int),
+        "relation_types": defaultdict(int),
+        "new_links": 0,
+        "regex_scans": 0
+    }
+
+
+def merge_scan_log(target, log):
+    """Folds one profile's scan log into target, preserving first-seen order."""
+    for name, ids in log["ambiguous"].items():
+        target["ambiguous"][name].update(ids)
+    for name, freq in log["clusters"].items():
+        target["clusters"][name] += freq
+    for rel_type, freq in log["relation_types"].items():
+        target["relation_types"][rel_type] += freq
+    target["new_links"] += log["new_links"]
+    target["regex_scans"] += log["regex_scans"]
+
+
+class MentionScanner:
+    """
+    Read-only snapshot of everything Ariadne needs to scan one notes block:
+    the name index, its NameMatcher and the birth-year table. It holds no
+    profiles, so it can be shipped to worker processes once per run.
+    """
+
+    def __init__(self, name_index, birth_years):
+        self.name_index = dict(name_index)
+        # Only the years of profiles that can be link targets are needed
+        self.birth_years = {pid: birth_years[pid] for ids in self.name_index.values() for pid in ids if pid in birth_years}
+        self.name_matcher = NameMatcher(self.name_index.keys())
+
+    def scan(self, source_id, source_born, text, sentences, clause_spans):
+        """
+        Scans a text block for mentions of names in the index.
+        sentences and clause_spans are the profile's precomputed splits of text.
+        Returns (related_link objects, scan log).
+        """
+        links = []
+        log = new_scan_log()
+        if not text:
+            return links, log
+
+        name_index = self.name_index
+        birth_years = self.birth_years
+
+        # Candidate names: runs of capitalized words
+        candidates = set(PATTERNS.name_candidate.findall(text))
+        log["regex_scans"] += 1
+
+        # Single pass over the notes with the prebuilt automaton.
+        # A known name only counts if it also appears somewhere as a full candidate run.
+        occurrences = self.name_matcher.find_all(text)
+        valid_candidates = {name for _, _, name in occurrences if name in candidates}
+
+        if not valid_candidates:
+            return links, log
+
+        found_ids = set()
+
+        occ_idx = 0
+        for clause_start, clause_end in clause_spans:
+            clause = text[clause_start:clause_end]
+
+            # Names occurring inside this clause, in order of first appearance
+            clause_names = []
+            while occ_idx < len(occurrences) and occurrences[occ_idx][0] < clause_end:
+                start, end, name = occurrences[occ_idx]
+                occ_idx += 1
+                if start < clause_start or end > clause_end:
+                    continue # Spans a clause separator
+                if name in valid_candidates and name not in clause_names:
+                    clause_names.append(name)
+
+            if not clause.strip(): continue
+
+            for name in clause_names:
+                # Ambiguity Resolution Strategy
+                # 1. Get all potential IDs for this name
+                potential_ids = name_index[name]
+
+                # 2. Filter out self
+                potential_ids = [pid for pid in potential_ids if pid != source_id]
+
+                if not potential_ids:
+                    continue
+
+                # 3. Decision Logic
+                target_id = None
+
+                if len(potential_ids) == 1:
+                    # Unambiguous (only 1 candidate) - Accept it regardless of date (could be ancestor)
+                    target_id = potential_ids[0]
+                else:
+                    # Ambiguous (multiple candidates) - Apply Strict Date Filter
+                    candidates_in_range = []
+                    for pid in potential_ids:
+                        if pid not in birth_years: continue
+
+                        target_born = birth_years[pid]
+
+                        # Strict check for disambiguation (must be within 60 years)
+                        # If dates unknown, we can't safely disambiguate by date, so skip
+                        if source_born and target_born:
+                            diff = abs(source_born - target_born)
+                            if diff <= 60:
+                                candidates_in_range.append(pid)
+
+                    if len(candidates_in_range) == 1:
+                        target_id = candidates_in_range[0]
+                    else:
+                        # Priority: Real Profile over Child Entry
+                        real_candidates = [pid for pid in candidates_in_range if "_c" not in pid]
+                        if len(real_candidates) == 1:
+                            target_id = real_candidates[0]
+                        else:
+                            # Still ambiguous
+                            log["ambiguous"][name].update(potential_ids)
+                            continue
+
+                if target_id in found_ids: continue
+
+                found_ids.add(target_id)
+
+                # 4. Contemporary Check for Relation Type (Loose Check)
+                # Now that we have the target, we check if they are "contemporary" for the purpose
+                # of inferring "Friend", "Partner", etc. vs just "Mentioned".
+                target_born = birth_years.get(target_id)
+                is_contemporary = True
+                if source_born and target_born:
+                    if abs(source_born - target_born) > 80: # Keep loose check for 'Mentioned' fallback
+                        is_contemporary = False
+
+                # Determine Type
+                rel_type = "Mentioned"
+                lower_clause = clause.lower()
+
+                for pattern, v in _KEYWORD_PATTERNS:
+                    log["regex_scans"] += 1
+                    if pattern.search(lower_clause):
+                        # Special handling for Spousal/Partner keywords vs Non-Contemporary matches
+                        if v in ["Spouse", "Business Partner", "Friend", "Classmate"] and not is_contemporary:
+                            rel_type = "Mentioned"
+                        else:
+                            rel_type = v
+                        break
+
+                # Context sentence (find full sentence containing the clause)
+                source_sentence = clause.strip()
+                for s in sentences:
+                    if clause.strip() in s:
+                        source_sentence = s
+                        break
+
+                links.append({
+                    "target_id": target_id,
+                    "relation_type": rel_type,
+                    "source_text": source_sentence.strip()
+                })
+
+                log["new_links"] += 1
+                log["clusters"][name] += 1
+                log["relation_types"][rel_type] += 1
+
+        return links, log
+
+    def scan_jobs(self, jobs):
+        """Scans (source_id, source_born, text, sentences, clause_spans) jobs in order."""
+        return [self.scan(*job) for job in jobs]
+
+
+# --- Process pool support ---
+# Each worker receives the scanner once (via the initializer) and then only
+# the per-profile jobs for its shard.
+
+_worker_scanner = None
+
+
+def _init_worker(scanner):
+    global _worker_scanner
+    _worker_scanner = scanner
+
+
+def _scan_shard(jobs):
+    return _worker_scanner.scan_jobs(jobs)
+
+
+def scan_in_parallel(scanner, jobs, workers):
+    """
+    Shards jobs across a process pool and returns per-job results in the
+    original job order, so the merge is identical to a serial scan.
+    """
+    if workers <= 1 or len(jobs) < 2:
+        return scanner.scan_jobs(jobs)
+
+    # A few shards per worker keeps the pool busy when notes lengths vary
+    shard_size = max(1, -(-len(jobs) // (workers * 4)))
+    shards = [jobs[i:i + shard_size] for i in range(0, len(jobs), shard_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(scanner,)) as executor:
+        for shard_results in executor.map(_scan_shard, shards):
+            results.extend(shard_results)
+    return results
@@ -0,0 +1,94 @@
+from collections import deque
+
+
+def _is_word_char(ch):
+    # Mirrors the `\w` class used by `\b` in the original per-name regexes
+    return ch.isalnum() or ch == "_"
+
+
+class NameMatcher:
+    """
+    Aho-Corasick automaton over every key of the Ariadne name index.
+    Built once per run and reused for every profile's notes, so finding all
+    known names in a notes block is a single linear pass over the text.
+    """
+
+    def __init__(self, names):
+        # Trie stored as parallel lists indexed by state number
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for name in names:
+            if name:
+                self._add(name)
+        self._build_failure_links()
+
+    def _add(self, name):
+        state = 0
+        for ch in name:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if name not in self._out[state]:
+            self._out[state].append(name)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                # Inherit matches that end at the fallback state (suffix names)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def find_all(self, text):
+        """
+        Returns every known-name occurrence in text as (start, end, name),
+        ordered by start offset. Only occurrences with a word boundary on both
+        sides (same semantics as `\\bName\\b`) are returned.
+        """
+        if not text:
+            return []
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        text_len = len(text)
+        hits = []
+
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+
+            end = i + 1
+            for name in out[state]:
+                start = end - len(name)
+                if not self._has_boundary(text, start, text_len):
+                    continue
+                if not self._has_boundary(text, end, text_len):
+                    continue
+                hits.append((start, end, name))
+
+        hits.sort(key=lambda h: (h[0], h[1]))
+        return hits
+
+    @staticmethod
+    def _has_boundary(text, pos, text_len):
+        before = pos > 0 and _is_word_char(text[pos - 1])
+        after = pos < text_len and _is_word_char(text[pos])
+        return before != after
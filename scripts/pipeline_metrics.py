@@ -0,0 +1,306 @@
+"""
+Per-stage instrumentation for the genealogy pipeline: wall time, CPU time
+(including worker processes), RSS growth and, optionally, the tracemalloc
+peak of each stage, plus named counters and hot-function timers. Each run
+is written to pipeline_metrics.json and compared with the previous one.
+
+Usage: python scripts/pipeline_metrics.py OLD.json NEW.json
+"""
+import contextlib
+import datetime
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage
+    resource = None
+
+DEFAULT_METRICS_PATH = "./.pipeline_cache/pipeline_metrics.json"
+
+# A stage is flagged when it is this much slower (or bigger) than last run...
+REGRESSION_RATIO = 0.20
+# ...and the difference is above the noise floor
+MIN_SECONDS = 0.25
+MIN_MB = 10.0
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _child_cpu():
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+class StageMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.status = "ran"
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.child_cpu_s = 0.0
+        # ru_maxrss is the peak over the whole process so far, so every stage
+        # after the biggest one reports that one's peak; rss_growth_mb is how
+        # far this stage raised it
+        self.process_peak_rss_mb = None
+        self.rss_growth_mb = None
+        self.tracemalloc_peak_mb = None
+        self.counters = defaultdict(int)
+        self.timers = {}
+
+    def to_dict(self):
+        if self.status != "ran":
+            return {"status": self.status}
+        data = {
+            "status": self.status,
+            "wall_s": round(self.wall_s, 4),
+            "cpu_s": round(self.cpu_s, 4),
+            "child_cpu_s": round(self.child_cpu_s, 4),
+            "process_peak_rss_mb": _round(self.process_peak_rss_mb),
+            "rss_growth_mb": _round(self.rss_growth_mb),
+            "counters": dict(sorted(self.counters.items())),
+            "timers": {name: {"calls": t["calls"], "seconds": round(t["seconds"], 4)}
+                       for name, t in sorted(self.timers.items())},
+        }
+        if self.tracemalloc_peak_mb is not None:
+            data["tracemalloc_peak_mb"] = _round(self.tracemalloc_peak_mb)
+        return data
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+class PipelineMetrics:
+    """
+    Collects one StageMetrics per stage. Counters and timers recorded
+    outside a stage go to a "run" bucket. With trace_memory, tracemalloc
+    runs for the whole pipeline (slowing it down noticeably) and each
+    stage records how far its allocations peaked above where it started.
+    With a PipelineProfiler, each stage also runs under profiler.profile().
+    """
+
+    def __init__(self, trace_memory=False, profiler=None):
+        self.trace_memory = trace_memory
+        self.profiler = profiler
+        self.stages = {}
+        self.current = None
+        self.started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._outside = StageMetrics("run")
+
+    def _bucket(self):
+        return self.current or self._outside
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        metrics = StageMetrics(name)
+        self.stages[name] = metrics
+        previous, self.current = self.current, metrics
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        rss_before = _peak_rss_mb()
+        child_before = _child_cpu()
+        cpu_before = time.process_time()
+        start = time.perf_counter()
+        try:
+            if self.profiler is None:
+                yield metrics
+            else:
+                with self.profiler.profile(name):
+                    yield metrics
+        finally:
+            metrics.wall_s = time.perf_counter() - start
+            metrics.cpu_s = time.process_time() - cpu_before
+            metrics.child_cpu_s = _child_cpu() - child_before
+            metrics.process_peak_rss_mb = _peak_rss_mb()
+            if rss_before is not None:
+                metrics.rss_growth_mb = metrics.process_peak_rss_mb - rss_before
+            if self.trace_memory:
+                metrics.tracemalloc_peak_mb = (tracemalloc.get_traced_memory()[1] - traced_before) / (1024 * 1024)
+            self.current = previous
+
+    def skip(self, name, status="reused"):
+        """Records a stage that was not run (e.g. its artifact was reused)."""
+        metrics = StageMetrics(name)
+        metrics.status = status
+        self.stages[name] = metrics
+
+    @property
+    def counters(self):
+        """Counters of the current stage, or of the run outside any stage."""
+        return self._bucket().counters
+
+    def count(self, name, n=1):
+        self._bucket().counters[name] += n
+
+    def add_counters(self, counters, prefix=""):
+        bucket = self._bucket().counters
+        for name, n in counters.items():
+            bucket[prefix + name] += n
+
+    @property
+    def timers(self):
+        """Timers of the current stage, or of the run outside any stage."""
+        return self._bucket().timers
+
+    def add_timers(self, timers):
+        """Merges {name: {"calls": n, "seconds": s}} timers, e.g. recorded in a worker process."""
+        bucket = self._bucket().timers
+        for name, t in timers.items():
+            entry = bucket.setdefault(name, {"calls": 0, "seconds": 0.0})
+            entry["calls"] += t["calls"]
+            entry["seconds"] += t["seconds"]
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """Accumulates calls and wall time of a hot function within the current stage."""
+        timers = self._bucket().timers
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = timers.setdefault(name, {"calls": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += time.perf_counter() - start
+
+    def to_dict(self):
+        stages = {name: m.to_dict() for name, m in self.stages.items()}
+        if self._outside.counters or self._outside.timers:
+            stages["run"] = self._outside.to_dict()
+        return {
+            "started_at": self.started_at,
+            "wall_s": round(time.perf_counter() - self._start, 4),
+            "cpu_s": round(time.process_time() - self._start_cpu, 4),
+            "peak_rss_mb": _round(_peak_rss_mb()),
+            "trace_memory": self.trace_memory,
+            "profiled": self.profiler is not None,
+            "stages": stages,
+        }
+
+    def save(self, path=DEFAULT_METRICS_PATH):
+        """
+        Writes this run's metrics and returns the previous run's (None if
+        there was none), which is kept alongside as <name>.prev.json.
+        """
+        previous = load_metrics(path)
+        data = self.to_dict()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if previous is not None:
+            os.replace(path, _prev_path(path))
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+        print(f"Metrics saved to {path}")
+        return previous
+
+    def report(self):
+        print("--- Stage Metrics ---")
+        print(f"   {'stage':<10} {'wall':>8} {'cpu':>8} {'workers':>8} {'rss +':>9} {'proc peak':>9}")
+        for name, m in self.stages.items():
+            if m.status != "ran":
+                print(f"   {name:<10} {m.status:>8}")
+                continue
+            growth = f"{m.rss_growth_mb:.0f}MB" if m.rss_growth_mb is not None else "n/a"
+            rss = f"{m.process_peak_rss_mb:.0f}MB" if m.process_peak_rss_mb is not None else "n/a"
+            print(f"   {name:<10} {m.wall_s:>7.2f}s {m.cpu_s:>7.2f}s {m.child_cpu_s:>7.2f}s {growth:>9} {rss:>9}")
+
+
+def _prev_path(path):
+    root, ext = os.path.splitext(path)
+    return f"{root}.prev{ext}"
+
+
+def load_metrics(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return None
+
+
+def compare_metrics(previous, current):
+    """
+    Compares two runs stage by stage. Returns (timings, counters,
+    regressions): wall time, CPU time and memory of every stage that ran
+    both times, counters whose value changed, and the timing lines that
+    crossed the regression thresholds. Memory is the stage's tracemalloc
+    peak when both runs traced it, else its RSS growth; the cumulative
+    process peak is not compared. Runs with and without tracemalloc or
+    profiling are not compared for regressions, since tracing alone slows
+    a stage.
+    """
+    timings, counters, regressions = [], [], []
+    comparable = all(previous.get(flag, False) == current.get(flag, False) for flag in ("trace_memory", "profiled"))
+    for name, stage in current["stages"].items():
+        before = previous["stages"].get(name)
+        if not before or stage["status"] != "ran" or before["status"] != "ran":
+            continue
+        memory = "tracemalloc_peak_mb" if "tracemalloc_peak_mb" in before and "tracemalloc_peak_mb" in stage \
+            else "rss_growth_mb"
+        for field, unit, floor in (("wall_s", "s", MIN_SECONDS), ("cpu_s", "s", MIN_SECONDS),
+                                   (memory, "MB", MIN_MB)):
+            old, new = before.get(field), stage.get(field)
+            if old is None or new is None:
+                continue
+            # A stage that grew no RSS last time has no ratio; the floor decides
+            change = (new - old) / old if old else None
+            line = f"{name}.{field}: {old:.2f}{unit} -> {new:.2f}{unit}" + \
+                (f" ({change:+.0%})" if change is not None else "")
+            timings.append(line)
+            if comparable and new - old > floor and (change is None or change > REGRESSION_RATIO):
+                regressions.append(line)
+        for counter, new in stage["counters"].items():
+            old = before["counters"].get(counter)
+            if old != new:
+                counters.append(f"{name}.{counter}: {old} -> {new}")
+    return timings, counters, regressions
+
+
+def report_comparison(previous, current, verbose=False):
+    """Prints regressions and changed counters; returns the regressions."""
+    timings, counters, regressions = compare_metrics(previous, current)
+    print(f"--- Compared with the run of {previous.get('started_at', 'unknown')} ---")
+    for line in timings if verbose else []:
+        print(f"   {line}")
+    for line in regressions:
+        print(f"   REGRESSION {line}")
+    for line in counters if verbose else counters[:20]:
+        print(f"   {line}")
+    if not regressions:
+        print(f"   No stage regressed beyond {REGRESSION_RATIO:.0%} "
+              f"(noise floor {MIN_SECONDS}s, {MIN_MB:.0f}MB)")
+    return regressions
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+    previous, current = load_metrics(sys.argv[1]), load_metrics(sys.argv[2])
+    if previous is None or current is None:
+        print("Could not read both metrics files")
+        sys.exit(2)
+    sys.exit(1 if report_comparison(previous, current, verbose=True) else 0)
+
+
+if __name__ == "__main__":
+    main()
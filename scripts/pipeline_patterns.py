@@ -0,0 +1,208 @@
+import re
+import time
+
+
+class _TimedPattern:
+    """
+    Stand-in for a compiled pattern that records how often it is used, how
+    many matches it produced and the cumulative time spent in it.
+    """
+
+    def __init__(self, name, pattern):
+        self.name = name
+        self.pattern = pattern
+        self.calls = 0
+        self.matches = 0
+        self.seconds = 0.0
+
+    def _timed(self, method, counter, *args, **kwargs):
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        self.seconds += time.perf_counter() - start
+        self.calls += 1
+        self.matches += counter(result)
+        return result
+
+    def search(self, *args, **kwargs):
+        return self._timed(self.pattern.search, _found, *args, **kwargs)
+
+    def match(self, *args, **kwargs):
+        return self._timed(self.pattern.match, _found, *args, **kwargs)
+
+    def fullmatch(self, *args, **kwargs):
+        return self._timed(self.pattern.fullmatch, _found, *args, **kwargs)
+
+    def findall(self, *args, **kwargs):
+        return self._timed(self.pattern.findall, len, *args, **kwargs)
+
+    def split(self, *args, **kwargs):
+        return self._timed(self.pattern.split, lambda parts: 1 if len(parts) > 1 else 0, *args, **kwargs)
+
+    def sub(self, repl, string, count=0):
+        result, n = self._timed(self.pattern.subn, lambda r: r[1], repl, string, count)
+        return result
+
+    def subn(self, repl, string, count=0):
+        return self._timed(self.pattern.subn, lambda r: r[1], repl, string, count)
+
+    def finditer(self, *args, **kwargs):
+        # Matching happens lazily while the caller iterates, so time each step
+        self.calls += 1
+        iterator = self.pattern.finditer(*args, **kwargs)
+        while True:
+            start = time.perf_counter()
+            m = next(iterator, None)
+            self.seconds += time.perf_counter() - start
+            if m is None:
+                return
+            self.matches += 1
+            yield m
+
+
+def _found(m):
+    return 0 if m is None else 1
+
+
+class PatternRegistry:
+    """
+    Every regular expression used by the pipeline, compiled once at import.
+    Patterns are read as attributes (PATTERNS.born.search(text)) so hot loops
+    never go through re's compile cache, and instrument() can swap in timed
+    wrappers for benchmarking without touching the call sites.
+    """
+
+    def __init__(self):
+        self._compiled = {}
+        self._timed = None
+
+    def add(self, name, pattern, flags=0):
+        if name in self._compiled:
+            raise ValueError(f"Pattern '{name}' is already registered")
+        compiled = re.compile(pattern, flags)
+        self._compiled[name] = compiled
+        setattr(self, name, compiled)
+        return compiled
+
+    def names(self):
+        return list(self._compiled)
+
+    def instrument(self):
+        """Replaces every pattern with a counting, timing wrapper."""
+        self._timed = {name: _TimedPattern(name, p) for name, p in self._compiled.items()}
+        for name, timed in self._timed.items():
+            setattr(self, name, timed)
+
+    def uninstrument(self):
+        for name, compiled in self._compiled.items():
+            setattr(self, name, compiled)
+        self._timed = None
+
+    def stats(self):
+        """Per-pattern usage since instrument(), slowest first."""
+        if not self._timed:
+            return []
+        rows = [{"name": t.name, "calls": t.calls, "matches": t.matches, "seconds": t.seconds}
+                for t in self._timed.values()]
+        rows.sort(key=lambda r: (-r["seconds"], r["name"]))
+        return rows
+
+
+PATTERNS = PatternRegistry()
+
+# --- Document structure ---
+PATTERNS.add("profile_id", r"\{(\d+(\.\d+)*)\}")
+PATTERNS.add("born_line", r"Born:\s*(.*)", re.IGNORECASE)
+PATTERNS.add("died_line", r"Died:\s*(.*)", re.IGNORECASE)
+PATTERNS.add("children_line", r"Children:\s*(.*)", re.IGNORECASE)
+PATTERNS.add("notes_line", r"NOTES:\s*(.*)", re.IGNORECASE)
+PATTERNS.add("source_tag", r"\[source:\s*(.*?)\]", re.IGNORECASE)
+PATTERNS.add("source_tag_strip", r"\[source:.*?\]")
+PATTERNS.add("generation_header", r"^(GENERATION\s+[IVXLCDM]+.*)", re.IGNORECASE)
+PATTERNS.add("see_reference", r"^See\s+", re.IGNORECASE)
+PATTERNS.add("relation_pointer", r"^(Father|Mother|Parent|Maternal|Paternal)\s+(Grand)?(father|mother|parent|of)\s+", re.IGNORECASE)
+PATTERNS.add("alias_separator", r"^\s*(&|/|and)\s*$", re.IGNORECASE)
+PATTERNS.add("non_word_run", r"\W+")
+
+# --- Dates and locations ---
+PATTERNS.add("year_candidate", r"\b(1[0-9]{3}|20[0-2][0-9])")
+PATTERNS.add("century", r"\b(\d{2})(?:th|nd|st|rd)\s+century\b")
+PATTERNS.add("modifier_before", r"\b(bef\.?|before|by)\b")
+PATTERNS.add("modifier_after", r"\b(aft\.?|after)\b")
+PATTERNS.add("modifier_between", r"\bbetween\b")
+PATTERNS.add("modifier_living", r"\b(living in|fl\.?)\b")
+PATTERNS.add("modifier_circa", r"\b(c\.?|ca\.?|circa|about|abt\.?)\b")
+PATTERNS.add("in_separator", r"\s+in\s+", re.IGNORECASE)
+PATTERNS.add("bare_year", r"^\d{4}$")
+PATTERNS.add("event_label", r"^(Born|Died|Buried|Baptized|Married):?\s*", re.IGNORECASE)
+PATTERNS.add("trailing_date_modifier", r"(?i)\b(?:c\.?|ca\.?|circa|about|abt\.?|before|bef\.?|by|after|aft\.?|bet\.?|between|living\s+in|fl\.?)\s*$")
+PATTERNS.add("trailing_preposition", r"\s+(in|at|on)$", re.IGNORECASE)
+PATTERNS.add("leading_preposition", r"^(in|at|on)\b\s*", re.IGNORECASE)
+PATTERNS.add("unknown_date", r"\b(unknown date|date unknown)\b", re.IGNORECASE)
+PATTERNS.add("trailing_parenthetical", r"^(.*?)\s*\(([^)]+)\)$")
+PATTERNS.add("four_digits", r"\d{4}")
+PATTERNS.add("dated_parenthetical", r"\(([^)]*\d+[^)]*)\)")
+PATTERNS.add("us_state_abbreviation", r"\b(ct|ma|ny|nj|pa|va|ri|vt|nh|me|de|md|sc|nc|ga|oh|il|mi)\b")
+PATTERNS.add("location_qualifier", r"^(?:assumed?|presumably|probably|prob\.|possibly|poss\.|likely|perhaps|near|nr\.?)\s+", re.IGNORECASE)
+PATTERNS.add("location_city_state", r"^(.*[a-z])\s+([A-Z]{2})$")
+PATTERNS.add("county_suffix", r"\s+(?:County|Co\.?)$", re.IGNORECASE)
+PATTERNS.add("compass_prefix", r"^([NSEW])\.\s*(?=[A-Z])")
+
+# --- Notes ---
+PATTERNS.add("notes_prefix", r"^NOTES:\s*", re.IGNORECASE)
+PATTERNS.add("sentence_break", r"[.;]\s+")
+PATTERNS.add("clause_break", r"[.;,]")
+PATTERNS.add("event_year", r"\b(16|17|18|19)\d{2}\b")
+PATTERNS.add("relative_years", r"\b(one|two|three|four|five|six|seven|eight|nine|ten|twenty|thirty|forty|fifty)\s+years?\s+(later|after)", re.IGNORECASE)
+PATTERNS.add("event_location", r"(?:\b(?:in|at|to|from)\s+)([A-Z][a-zA-Z]+(?:[\s,]+[A-Z][a-zA-Z]+)*)")
+PATTERNS.add("location_trailing_year", r"\s+in\s+\d{4}.*")
+PATTERNS.add("associate_tag", r"\[(Associate|Witness|Neighbor|Partner|Friend)\s*:\s*([^\]]+)\]", re.IGNORECASE)
+PATTERNS.add("ship_tag", r"\[Ship:\s*([^\]]+)\]", re.IGNORECASE)
+PATTERNS.add("voyage_quoted", r"(?:arrived|sailed|came|passage|travelled)\b[^.;]*?\b(?:on|aboard)\b(?:\s+(?:the|a)\b)?(?:\s*ship)?\s*[“\"'‘]([^”\"'’]+)[”\"'’]", re.IGNORECASE)
+# Case-insensitive context, case-sensitive (capitalized) ship name
+PATTERNS.add("voyage_capitalized", r"(?i:(?:arrived|sailed|came|passage|travelled)\b[^.;]*?\b(?:on|aboard)\b(?:\s+(?:the|a)\b)?(?:\s*ship)?\s+)"
+                                   r"([A-Z][a-z]+(?:(?:\s+(?:and|&)\s+|\s+)[A-Z][a-z]+)*)")
+PATTERNS.add("repeated_space", r"\s{2,}")
+PATTERNS.add("html_tag", r"<[^>]+>")
+
+# --- Names ---
+PATTERNS.add("name_suffix", r",?\s+(Jr\.?|Sr\.?|III|IV|Esq\.?)$", re.IGNORECASE)
+PATTERNS.add("maiden_name", r"\((.*?)\)")
+PATTERNS.add("parenthetical", r"\(.*?\)")
+PATTERNS.add("bracketed", r"\[.*?\]")
+PATTERNS.add("child_ordinal", r",\s*\d+(?:st|nd|rd|th)?\s+(?:son|daughter|child)", re.IGNORECASE)
+PATTERNS.add("child_role", r",\s+(?:son|daughter|child)", re.IGNORECASE)
+PATTERNS.add("name_candidate", r"\b(?:[A-Z]\.?|[A-Z][a-z]+)(?:\s+(?:[A-Z]\.?|[A-Z][a-z]+))+\b")
+
+# --- Tags ---
+EXCLUSION_PHRASES = [
+    # Singular relationships
+    "mother of", "father of", "sister of", "brother of",
+    "wife of", "husband of", "widow of", "son of", "daughter of",
+    "child of", "spouse of", "married to", "mother to", "father to",
+    "husband was", "father was", "son was", "daughter was", "wife was",
+    "husband's", "father's", "wife's", "son's", "daughter's",
+    "consort of", "relict of",
+    # Plural relationships
+    "sons of", "daughters of", "children of", "brothers of", "sisters of",
+    # Contextual exclusions for spouse death scenarios
+    "husband died", "wife died", "spouse died"
+]
+PATTERNS.add("exclusion_context", "|".join(re.escape(p) for p in EXCLUSION_PHRASES))
+PATTERNS.add("tag_immigrant", r"\b(immigrant|emigrated|came to america|arrived in|arrived with)\b", re.IGNORECASE)
+PATTERNS.add("tag_mayflower", r"\bMayflower\b", re.IGNORECASE)
+PATTERNS.add("tag_war", r"\b(served in|soldier|captain|major|lieutenant|general|ensign|private|sergeant|colonel|veteran|war of|revolutionary war|civil war|french and indian war)\b", re.IGNORECASE)
+PATTERNS.add("tag_founder", r"\b(founder|settler|pioneer|first settler|original proprietor)\b", re.IGNORECASE)
+PATTERNS.add("tag_witch", r"\b(witch|salem trials|accused of witchcraft)\b", re.IGNORECASE)
+PATTERNS.add("tag_education", r"\b(Harvard|Yale|College|University)\b", re.IGNORECASE)
+PATTERNS.add("tag_quaker", r"\b(Quaker|Friends)\b", re.IGNORECASE)
+PATTERNS.add("name_rank", r"captain|major|lieutenant|Lt\.|general|ensign|private|sergeant|colonel", re.IGNORECASE)
+PATTERNS.add("name_honorific", r"\b(mrs|miss|ms)\b", re.IGNORECASE)
+PATTERNS.add("name_religious", r"\b(Reverend|Deacon)\b|\bRev\.?", re.IGNORECASE)
+
+EAST_COAST_STATES = ["CT", "MA", "NY", "NJ", "PA", "VA", "RI", "VT", "NH", "ME", "DE", "MD"]
+EAST_COAST_NAMES = ["Connecticut", "Massachusetts", "New York", "New Jersey", "Pennsylvania", "Virginia", "Rhode Island", "Vermont", "New Hampshire", "Maine"]
+WESTWARD_STATES = ["OH", "IL", "MI", "IN", "WI", "MN", "IA", "MO", "KS", "NE", "SD", "ND", "CA", "OR", "WA", "NV", "AZ", "NM", "UT", "CO", "WY", "ID", "MT"]
+WESTWARD_NAMES = ["Ohio", "Illinois", "Michigan", "Indiana", "Wisconsin", "Minnesota", "Iowa", "Missouri", "Kansas", "Nebraska", "California", "Oregon", "Washington", "Nevada", "Arizona", "Utah", "Colorado"]
+# Abbreviations only count as whole words and are case-sensitive
+PATTERNS.add("east_coast_abbreviation", r"\b(?:" + "|".join(EAST_COAST_STATES) + r")\b")
+PATTERNS.add("westward_abbreviation", r"\b(?:" + "|".join(WESTWARD_STATES) + r")\b")
@@ -0,0 +1,157 @@
+"""
+Opt-in profiling for the genealogy pipeline. Targets are stage names
+(parse, mentions, ...) or pipeline method names (parse_document,
+_find_mentions, ...); "all" profiles every stage. Each target gets:
+
+  <target>.pstats     cProfile stats (python -m pstats, snakeviz, ...)
+  <target>.collapsed  sampled stacks, one "frame;frame;frame count" line
+                      per stack, for flamegraph.pl / speedscope / inferno
+
+Enabled with --profile [TARGETS] or KINSHIP_PROFILE=TARGETS. When neither
+is given no profiler object exists, so nothing is wrapped or timed.
+
+The sampler uses a CPU-time interval timer (SIGPROF) and records the main
+thread's stack, so it is only available on Unix. Worker processes are
+not profiled: when the parse stage or any method is targeted, the pipeline
+parses the documents in-process; for mentions, run with --workers 1.
+"""
+import cProfile
+import contextlib
+import functools
+import os
+import signal
+from collections import Counter
+
+PROFILE_ENV = "KINSHIP_PROFILE"
+DEFAULT_PROFILE_DIR = "./.pipeline_cache/profiles"
+SAMPLE_INTERVAL = 0.005
+
+
+def profile_targets(value):
+    """Parses "mentions,parse_document" / "all" into a set of targets."""
+    targets = {t.strip() for t in (value or "").split(",") if t.strip()}
+    return {"all"} if targets & {"all", "1"} else targets
+
+
+class StackSampler:
+    """Counts the main thread's stack every `interval` seconds of CPU time."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.available = hasattr(signal, "setitimer") and hasattr(signal, "SIGPROF")
+
+    def _sample(self, signum, frame):
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        self.stacks[";".join(reversed(frames))] += 1
+
+    @contextlib.contextmanager
+    def running(self):
+        if not self.available:
+            yield
+            return
+        previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class PipelineProfiler:
+    """
+    Profiles the selected stages (via PipelineMetrics, which opens
+    profile(name) around every stage) and methods (via wrap_methods).
+    Repeated calls of a target accumulate into one profile. Only one
+    target is profiled at a time: a method target called inside a
+    profiled stage is already covered by the stage's profile.
+    """
+
+    def __init__(self, targets, output_dir=DEFAULT_PROFILE_DIR, interval=SAMPLE_INTERVAL):
+        self.targets = set(targets)
+        self.output_dir = output_dir
+        self.interval = interval
+        self.profiles = {}
+        self._active = None
+
+    def wants(self, name):
+        return name in self.targets or "all" in self.targets
+
+    @contextlib.contextmanager
+    def profile(self, name):
+        if self._active is not None or not self.wants(name):
+            yield
+            return
+
+        profile, sampler = self.profiles.setdefault(name, (cProfile.Profile(), StackSampler(self.interval)))
+        self._active = name
+        try:
+            with sampler.running():
+                profile.enable()
+                try:
+                    yield
+                finally:
+                    profile.disable()
+        finally:
+            self._active = None
+
+    def wrap_methods(self, obj, stage_names=()):
+        """
+        Wraps each targeted method of obj (that is not a stage name) so
+        every call is profiled. Returns the names it wrapped.
+        """
+        wrapped = []
+        for name in sorted(self.targets - set(stage_names) - {"all"}):
+            method = getattr(obj, name, None)
+            if not callable(method):
+                continue
+
+            def profiled(*args, _method=method, _name=name, **kwargs):
+                with self.profile(_name):
+                    return _method(*args, **kwargs)
+
+            setattr(obj, name, functools.wraps(method)(profiled))
+            wrapped.append(name)
+        return wrapped
+
+    def needs_in_process(self, stage, stage_names):
+        """
+        Whether stage has to run in this process to be profiled: it is a
+        target, or a method target (which may be called under it) is.
+        """
+        return self.wants(stage) or bool(self.targets - set(stage_names) - {"all"})
+
+    def unknown_targets(self, obj, stage_names):
+        return sorted(t for t in self.targets - {"all"} - set(stage_names) if not callable(getattr(obj, t, None)))
+
+    def save(self):
+        """Writes <target>.pstats and <target>.collapsed for every target that ran."""
+        if not self.profiles:
+            return []
+        os.makedirs(self.output_dir, exist_ok=True)
+        written = []
+        for name, (profile, sampler) in self.profiles.items():
+            base = os.path.join(self.output_dir, name.strip("_") or name)
+            profile.dump_stats(base + ".pstats")
+            written.append(base + ".pstats")
+            if sampler.available:
+                sampler.write(base + ".collapsed")
+                written.append(base + ".collapsed")
+        print(f"--- Profiles written to {self.output_dir}: {', '.join(os.path.basename(p) for p in written)} ---")
+        return written
+
+
+def profiler_from_env(cli_value=None, output_dir=DEFAULT_PROFILE_DIR):
+    """A PipelineProfiler for --profile or $KINSHIP_PROFILE, or None when profiling is off."""
+    targets = profile_targets(cli_value if cli_value is not None else os.environ.get(PROFILE_ENV))
+    return PipelineProfiler(targets, output_dir) if targets else None
@@ -0,0 +1,223 @@
+"""
+Slotted records for parsed profiles. A profile used to be a tree of dicts
+(vital_stats, story, metadata) built per profile and per alias; these
+records hold the same fields in __slots__, with the lineage, generation,
+source and location strings routed through the shared interning table
+(intern_table.STRINGS) so every profile shares one copy.
+
+Records answer the dict-style access the stages already use
+(p["story"]["notes"], p.get("relations", {}), "associates" in story), so a
+stage works the same on records and on plain dict profiles. A field that
+was never set behaves like a missing key. to_dict() gives the
+family_data.json schema and is only needed at emit and for stage
+artifacts; from_dict() reads such a dict back.
+"""
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+from intern_table import STRINGS
+
+
+class _Unset:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "UNSET"
+
+    def __reduce__(self):
+        # Unpickles (parallel parse workers) to the module's single instance
+        return "UNSET"
+
+
+# Default of every field: reads as a missing key
+UNSET = _Unset()
+
+
+class Record:
+    """
+    Mapping-style access over a dataclass's slots. Keys that are not
+    fields go to `extra`, a dict created on first use. Subclasses list the
+    fields whose strings are interned in INTERNED, mapped to the table
+    field they are counted under.
+    """
+
+    __slots__ = ()
+    INTERNED = {}
+    _FIELDS = ()
+    _FIELD_SET = frozenset()
+
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            if value is not UNSET:
+                return value
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.INTERNED:
+            value = STRINGS.intern(value, self.INTERNED[key])
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        if key in self._FIELD_SET:
+            return getattr(self, key) is not UNSET
+        return self.extra is not None and key in self.extra
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def items(self):
+        for name, value in zip(self._FIELDS, self._VALUES(self)):
+            if value is not UNSET:
+                yield name, value
+        if self.extra:
+            yield from self.extra.items()
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def to_dict(self):
+        """Set fields in declaration order, then extras."""
+        data = {name: value for name, value in zip(self._FIELDS, self._VALUES(self)) if value is not UNSET}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def intern_strings(self):
+        """Routes the interned fields, nested records' included, through the table again."""
+        for name in self._FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, Record):
+                value.intern_strings()
+            elif name in self.INTERNED and value is not UNSET:
+                self[name] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls()
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+
+def record(cls):
+    """Makes cls a slotted dataclass whose fields all default to UNSET."""
+    for name in cls.__annotations__:
+        setattr(cls, name, None if name == "extra" else UNSET)
+    cls = dataclass(slots=True, eq=False, repr=False)(cls)
+    cls._FIELDS = tuple(f.name for f in fields(cls) if f.name != "extra")
+    cls._FIELD_SET = frozenset(cls._FIELDS)
+    # Every field's value in one call, for to_dict() and items()
+    cls._VALUES = staticmethod(attrgetter(*cls._FIELDS))
+    return cls
+
+
+@record
+class VitalStats(Record):
+    # Declaration order is the key order in family_data.json
+    born_date: str
+    born_location: str
+    died_date: str
+    died_location: str
+    born_location_note: str
+    born_year_int: int
+    born_hierarchy: list
+    died_location_note: str
+    died_year_int: int
+    died_hierarchy: list
+    born_coords: dict
+    died_coords: dict
+    extra: dict
+
+    INTERNED = {"born_location": "location", "died_location": "location",
+                "born_hierarchy": "location", "died_hierarchy": "location"}
+
+
+@record
+class Story(Record):
+    notes: str
+    voyages: list
+    life_events: list
+    associates: list
+    tags: list
+    naming_echo: dict
+    extra: dict
+
+
+@record
+class Metadata(Record):
+    source_id: str
+    doc_paragraph_index: int
+    is_child_entry: bool
+    parent_id: str
+    extra: dict
+
+    INTERNED = {"source_id": "source"}
+
+
+@record
+class Profile(Record):
+    id: str
+    name: str
+    lineage: str
+    generation: str
+    vital_stats: VitalStats
+    story: Story
+    metadata: Metadata
+    relations: dict
+    related_links: list
+    hero_image: dict
+    extra: dict
+
+    INTERNED = {"lineage": "lineage", "generation": "generation"}
+    NESTED = {"vital_stats": VitalStats, "story": Story, "metadata": Metadata}
+
+    def to_dict(self):
+        """Set fields in declaration order, then extras; nested records included."""
+        data = Record.to_dict(self)
+        for key in self.NESTED:
+            value = data.get(key)
+            if isinstance(value, Record):
+                data[key] = value.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        profile = cls()
+        for key, value in data.items():
+            nested = cls.NESTED.get(key)
+            profile[key] = nested.from_dict(value) if nested and isinstance(value, dict) else value
+        return profile
+
+
+def new_profile(uid, name, lineage, generation, vital_stats, story, metadata):
+    """Builds a Profile from plain field dicts, interning the shared strings."""
+    profile = Profile()
+    profile["id"] = uid
+    profile["name"] = name
+    profile["lineage"] = lineage
+    profile["generation"] = generation
+    profile["vital_stats"] = VitalStats.from_dict(vital_stats)
+    profile["story"] = Story.from_dict(story)
+    profile["metadata"] = Metadata.from_dict(metadata)
+    return profile
+
+
+def as_dict(value):
+    """A record as its dict; anything else unchanged."""
+    return value.to_dict() if isinstance(value, Record) else value
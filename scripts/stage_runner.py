@@ -0,0 +1,218 @@
+import contextlib
+import hashlib
+import inspect
+import json
+import os
+
+DEFAULT_ARTIFACT_DIR = "./.pipeline_cache/stages"
+
+# Artifacts kept per stage; older ones are deleted when a new one is written
+KEEP_PER_STAGE = 3
+
+
+def source_fingerprint(*objects):
+    """sha256 over the source of the given functions, classes or modules."""
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def file_fingerprint(*paths):
+    """sha256 over the path and bytes of each file; missing files count as empty."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(str(path).encode("utf-8"))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Stage:
+    """
+    One named step of the pipeline. run() works on the pipeline's in-memory
+    state. The stage's version is the source of `code` (functions, classes,
+    modules) plus whatever params() returns, e.g. config or the fingerprint
+    of an external input. Stages with cache=False (emit) have no artifact
+    and run every time they are reached.
+    """
+
+    def __init__(self, name, run, code=(), params=None, cache=True):
+        self.name = name
+        self.run = run
+        self.code = tuple(code)
+        self.params = params or (lambda: {})
+        self.cache = cache
+        self._code_fingerprint = None
+
+    def key(self, input_hash):
+        if self._code_fingerprint is None:
+            self._code_fingerprint = source_fingerprint(*self.code)
+        payload = json.dumps([self.name, input_hash, self._code_fingerprint, self.params()], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class StageRunner:
+    """
+    Runs stages in order, each taking the previous stage's output as its
+    input. After a stage runs, the state it leaves behind (dump_state())
+    is written to a content-addressed artifact: <stage>-<sha256 of the
+    state>.json. The index maps each stage key (input hash + code version
+    + params) to the hash of the output it produced, so a stage whose key
+    is already indexed is skipped without loading anything; the state is
+    only read back (load_state()) when a later stage has to run.
+
+    With a PipelineMetrics, each stage that runs is measured (including
+    loading its input and writing its artifact) and reused ones are noted.
+    """
+
+    def __init__(self, stages, dump_state, load_state, artifact_dir=DEFAULT_ARTIFACT_DIR, metrics=None):
+        self.stages = list(stages)
+        self.dump_state = dump_state
+        self.load_state = load_state
+        self.artifact_dir = artifact_dir
+        self.metrics = metrics
+        self.index_path = os.path.join(artifact_dir, "index.json")
+        self.index = {"keys": {}, "latest": {}}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                try:
+                    self.index = json.load(f)
+                except json.JSONDecodeError:
+                    pass
+        self.ran = []
+        self.reused = []
+
+    @property
+    def names(self):
+        return [stage.name for stage in self.stages]
+
+    def _check_names(self, names):
+        unknown = [name for name in names if name not in self.names]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (stages: {', '.join(self.names)})")
+
+    def artifact_path(self, stage_name, output_hash):
+        return os.path.join(self.artifact_dir, f"{stage_name}-{output_hash}.json")
+
+    def run(self, initial_hash, from_stage=None, only=None, force=()):
+        """
+        initial_hash identifies the pipeline's starting input (the source
+        documents). from_stage reruns that stage and everything after it on
+        top of the latest artifacts of the earlier stages; only runs just
+        the listed stages, the same way; force reruns the listed stages
+        ("all" for every stage) even when their key is indexed.
+        """
+        force = set(self.names) if "all" in force else set(force)
+        self._check_names(list(force) + list(only or []) + ([from_stage] if from_stage else []))
+        if only:
+            start = min(self.names.index(name) for name in only)
+            selected = set(only)
+        elif from_stage:
+            start = self.names.index(from_stage)
+            selected = set(self.names[start:])
+        else:
+            start = 0
+            selected = None
+
+        input_hash = initial_hash
+        # The pipeline starts out holding the initial input
+        in_memory = initial_hash
+        for position, stage in enumerate(self.stages):
+            if position < start or (selected is not None and stage.name not in selected):
+                # Upstream of the requested stages (or between them): take
+                # whatever the stage last produced
+                input_hash = self._latest(stage.name) if stage.cache else input_hash
+                continue
+
+            key = stage.key(input_hash)
+            known = self.index["keys"].get(stage.name, {})
+            reusable = key in known and os.path.exists(self.artifact_path(stage.name, known[key]))
+            if stage.cache and reusable and stage.name not in force and selected is None:
+                print(f"--- Stage {stage.name}: unchanged, reusing artifact ---")
+                input_hash = known[key]
+                self._register(stage.name, [key], input_hash)
+                self.reused.append(stage.name)
+                if self.metrics:
+                    self.metrics.skip(stage.name)
+                continue
+
+            with self._measure(stage.name):
+                if in_memory != input_hash:
+                    self._load(self.stages[position - 1].name, input_hash)
+                    in_memory = input_hash
+
+                print(f"--- Stage {stage.name} ---")
+                stage.run()
+                self.ran.append(stage.name)
+                if not stage.cache:
+                    in_memory = None
+                    continue
+
+                output_hash = self._save(stage.name, self.dump_state())
+            # Stages that write to an external input (the enrichment store)
+            # see a different key next time; the output is valid for both
+            self._register(stage.name, [key, stage.key(input_hash)], output_hash)
+            input_hash = in_memory = output_hash
+
+        self._save_index()
+
+    def _measure(self, stage_name):
+        return self.metrics.stage(stage_name) if self.metrics else contextlib.nullcontext()
+
+    def _latest(self, stage_name):
+        output_hash = self.index["latest"].get(stage_name)
+        if output_hash is None or not os.path.exists(self.artifact_path(stage_name, output_hash)):
+            raise RuntimeError(f"No artifact for stage '{stage_name}'; run the pipeline once without --from-stage/--only")
+        return output_hash
+
+    def _load(self, stage_name, output_hash):
+        print(f"   Loading {stage_name} artifact {output_hash[:12]}")
+        with open(self.artifact_path(stage_name, output_hash), "r", encoding="utf-8") as f:
+            self.load_state(json.load(f))
+
+    def _save(self, stage_name, state):
+        text = json.dumps(state, ensure_ascii=True)
+        output_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = self.artifact_path(stage_name, output_hash)
+        if not os.path.exists(path):
+            os.makedirs(self.artifact_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        return output_hash
+
+    def _register(self, stage_name, keys, output_hash):
+        # Most recently used keys last, so pruning drops the oldest
+        known = self.index["keys"].setdefault(stage_name, {})
+        for key in keys:
+            known.pop(key, None)
+            known[key] = output_hash
+        self.index["latest"][stage_name] = output_hash
+
+    def _save_index(self):
+        # Keep the newest outputs per stage and delete artifacts nothing points to
+        referenced = set()
+        for stage_name, known in self.index["keys"].items():
+            outputs = []
+            for output_hash in reversed(list(known.values())):
+                if output_hash not in outputs:
+                    outputs.append(output_hash)
+            kept = set(outputs[:KEEP_PER_STAGE])
+            self.index["keys"][stage_name] = {k: h for k, h in known.items() if h in kept}
+            referenced.update(self.artifact_path(stage_name, h) for h in kept)
+        referenced.update(self.artifact_path(name, h) for name, h in self.index["latest"].items())
+
+        os.makedirs(self.artifact_dir, exist_ok=True)
+        for filename in os.listdir(self.artifact_dir):
+            path = os.path.join(self.artifact_dir, filename)
+            if filename != "index.json" and path not in referenced:
+                os.remove(path)
+
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,132 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache_store import ERROR, HIT, NEGATIVE
+from pipeline_patterns import PATTERNS
+from rate_limit import TokenBucket
+
+
+def image_cache_key(location, year):
+    """
+    Returns (cache_key, century label) for a hero image lookup, or None when
+    the location cannot be searched.
+    """
+    if not location or location.lower() == "unknown":
+        return None
+
+    # Determine Century
+    if year:
+        c_val = (year // 100) + 1
+        century = f"{c_val}th century"
+    else:
+        century = "historical"
+
+    return f"{location}|{century}", century
+
+
+class WikimediaImageService:
+    """
+    Wikimedia Commons image search over one keep-alive session. Every
+    request, from any thread, first takes a token from a shared bucket, so
+    the overall request rate stays polite however many workers are used.
+    """
+
+    API_URL = "https://commons.wikimedia.org/w/api.php"
+    USER_AGENT = "GenealogyApp/1.0 (contact@example.com)"
+
+    def __init__(self, api_url=API_URL, workers=4, requests_per_second=10.0, timeout=5):
+        self.api_url = api_url
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(requests_per_second, capacity=1)
+        # Off for offline benchmarks: every search finds nothing
+        self.api_enabled = True
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = self.USER_AGENT
+        # Enough pooled connections for every worker to keep its own alive
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self.requests_made = 0
+        self.errors = 0
+
+    def close(self):
+        self.session.close()
+
+    def search(self, query, location):
+        """Runs one Commons search. Returns an image dict, or None if nothing was found."""
+        params = {
+            "action": "query",
+            "generator": "search",
+            "gsrnamespace": "6", # File namespace
+            "gsrsearch": query,
+            "gsrlimit": "1",
+            "prop": "imageinfo",
+            "iiprop": "url|extmetadata",
+            "iiurlwidth": "1024",
+            "format": "json"
+        }
+
+        if not self.api_enabled:
+            return None
+        self.rate_limiter.acquire()
+        with self._lock:
+            self.requests_made += 1
+        response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+        data = response.json()
+
+        if "query" in data and "pages" in data["query"]:
+            # Get first result
+            page_id = list(data["query"]["pages"].keys())[0]
+            page = data["query"]["pages"][page_id]
+
+            if "imageinfo" in page:
+                info = page["imageinfo"][0]
+                thumb_url = info.get("thumburl", info.get("url"))
+
+                metadata = info.get("extmetadata", {})
+                description = metadata.get("ImageDescription", {}).get("value", query)
+                # Simple regex to strip HTML tags
+                description = PATTERNS.html_tag.sub('', description)[:150] + "..."
+
+                return {
+                    "src": thumb_url,
+                    "alt": f"Historical image of {location}",
+                    "caption": description,
+                    "style": { "filter": "sepia(20%) contrast(110%)" } # Default vintage style
+                }
+        return None
+
+    def lookup(self, location, century):
+        """
+        Tries the map query, then the generic one. Returns (kind, image):
+        a hit with the first image found, a negative when both searches ran
+        and found nothing, or an error when a search failed and nothing was
+        found, so the key is retried later instead of cached as a miss.
+        """
+        queries = [
+            f"{location} {century} map",
+            f"{location} historical"
+        ]
+
+        failed = False
+        for q in queries:
+            try:
+                result = self.search(q, location)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                print(f"   [Wikimedia] Error fetching for '{q}': {e}")
+                failed = True
+                continue
+
+            if result:
+                print(f"   [Wikimedia] Found image for '{q}'")
+                return HIT, result
+        return (ERROR if failed else NEGATIVE), None
+
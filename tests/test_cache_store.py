@@ -0,0 +1,152 @@
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from cache_store import CacheStore, RetryPolicy, ERROR, HIT, NEGATIVE
+
+
+class TestCacheStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "cache", "enrichment.sqlite")
+        self.seed = os.path.join(self.tmp.name, "ship_cache.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_seeds_from_json_and_exports_in_order(self):
+        with open(self.seed, "w") as f:
+            json.dump({"Mayflower": {"masts": 3}, "Arbella": None}, f, indent=4)
+
+        store = CacheStore("ships", self.db, seed_json=self.seed)
+        self.assertEqual(list(store), ["Mayflower", "Arbella"])
+        self.assertIsNone(store["Arbella"])
+        self.assertEqual(store.updated_at("Mayflower"), os.path.getmtime(self.seed))
+        self.assertEqual(store.writes, 0)
+
+        store["Hector"] = {"masts": 2}
+        store["Mayflower"] = {"masts": 4}
+        store.export_json(self.seed)
+        store.close()
+
+        with open(self.seed) as f:
+            exported = json.load(f)
+        self.assertEqual(list(exported), ["Mayflower", "Arbella", "Hector"])
+        self.assertEqual(exported["Mayflower"], {"masts": 4})
+        self.assertFalse(os.path.exists(self.seed + ".tmp"))
+
+        # The store wins over the JSON file for keys it already has
+        reopened = CacheStore("ships", self.db, seed_json=self.seed)
+        self.assertEqual(reopened["Mayflower"], {"masts": 4})
+        self.assertEqual(len(reopened), 3)
+        reopened.close()
+
+    def test_namespaces_are_separate(self):
+        ships = CacheStore("ships", self.db)
+        images = CacheStore("wikimedia", self.db)
+        ships["Hector"] = {"masts": 2}
+        images["Salem, MA|historical"] = None
+        ships.close()
+        images.close()
+
+        self.assertEqual(list(CacheStore("ships", self.db)), ["Hector"])
+        self.assertEqual(list(CacheStore("wikimedia", self.db)), ["Salem, MA|historical"])
+
+    def test_writes_are_committed_in_batches(self):
+        store = CacheStore("ships", self.db, batch_size=3, max_batch_age=3600)
+        for i in range(4):
+            store[f"Ship{i}"] = i
+
+        # A second connection only sees committed batches, as would a run
+        # restarted after a crash
+        def committed():
+            conn = sqlite3.connect(self.db)
+            try:
+                return conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+            finally:
+                conn.close()
+
+        self.assertEqual(committed(), 3)
+        store.commit()
+        self.assertEqual(committed(), 4)
+
+        store.compact()
+        self.assertEqual(list(CacheStore("ships", self.db)), ["Ship0", "Ship1", "Ship2", "Ship3"])
+        store.close()
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CacheStore("wikimedia", os.path.join(self.tmp.name, "enrichment.sqlite"))
+        self.now = [1000.0]
+        self.policy = RetryPolicy(negative_ttl=100, error_backoff=10, max_error_backoff=35, clock=lambda: self.now[0])
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_negatives_expire_and_hits_do_not(self):
+        self.store.set("Hartford, CT|19th century", {"src": "x"}, timestamp=1000)
+        self.store.set_negative("Nowhere|18th century", timestamp=1000)
+        self.assertEqual(self.store.counts(), {HIT: 1, NEGATIVE: 1, ERROR: 0})
+
+        self.now[0] = 1099
+        self.assertTrue(self.policy.is_fresh(self.store, "Nowhere|18th century"))
+        self.now[0] = 1100
+        self.assertFalse(self.policy.is_fresh(self.store, "Nowhere|18th century"))
+        self.now[0] = 10 ** 9
+        self.assertTrue(self.policy.is_fresh(self.store, "Hartford, CT|19th century"))
+        self.assertFalse(self.policy.is_fresh(self.store, "Salem, MA|historical"))
+
+    def test_errors_back_off_exponentially(self):
+        backoffs = []
+        for _ in range(4):
+            self.store.set_error("Salem, MA|historical", timestamp=self.now[0])
+            self.assertIsNone(self.store["Salem, MA|historical"])
+            backoffs.append(self.policy.ttl(ERROR, self.store.attempts("Salem, MA|historical")))
+        self.assertEqual(backoffs, [10, 20, 35, 35])
+
+        # A clean answer resets the failure count
+        self.store.set_negative("Salem, MA|historical")
+        self.assertEqual(self.store.attempts("Salem, MA|historical"), 0)
+
+    def test_refresh_negatives_retries_old_entries_once(self):
+        self.store.set_negative("Nowhere|18th century", timestamp=900)
+        self.store.set_error("Salem, MA|historical", timestamp=900)
+        self.store.set("Hartford, CT|19th century", {"src": "x"}, timestamp=900)
+
+        policy = RetryPolicy(refresh_negatives=True, clock=lambda: self.now[0])
+        self.assertFalse(policy.is_fresh(self.store, "Nowhere|18th century"))
+        self.assertFalse(policy.is_fresh(self.store, "Salem, MA|historical"))
+        self.assertTrue(policy.is_fresh(self.store, "Hartford, CT|19th century"))
+
+        # Rewritten during this run, so not retried again
+        self.store.set_negative("Nowhere|18th century", timestamp=1000)
+        self.assertTrue(policy.is_fresh(self.store, "Nowhere|18th century"))
+
+    def test_export_leaves_out_errors(self):
+        self.store["Hartford, CT|19th century"] = {"src": "x"}
+        self.store.set_negative("Nowhere|18th century")
+        self.store.set_error("Salem, MA|historical")
+        path = os.path.join(self.tmp.name, "wikimedia_cache.json")
+        self.store.export_json(path)
+
+        with open(path) as f:
+            self.assertEqual(json.load(f), {"Hartford, CT|19th century": {"src": "x"}, "Nowhere|18th century": None})
+
+        # Kinds survive a reopen
+        self.store.commit()
+        reopened = CacheStore("wikimedia", self.store.db_path)
+        self.assertEqual(reopened.kind("Salem, MA|historical"), ERROR)
+        self.assertEqual(reopened.kind("Nowhere|18th century"), NEGATIVE)
+        reopened.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from genealogy_pipeline import DateCache, GenealogyTextPipeline
+
+
+class TestDateCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "dates_test.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        cache = DateCache(self.path, "v1")
+        cache.put("c. 1700 in Salem, MA", ("c. 1700", "Salem, MA", 1700))
+        cache.save()
+
+        reloaded = DateCache(self.path, "v1")
+        self.assertEqual(reloaded.get("c. 1700 in Salem, MA"), ["c. 1700", "Salem, MA", 1700])
+        self.assertIsNone(reloaded.get("1805"))
+        self.assertEqual((reloaded.hits, reloaded.misses), (1, 1))
+
+    def test_version_change_invalidates(self):
+        cache = DateCache(self.path, "v1")
+        cache.put("1805", ("1805", "Unknown", 1805))
+        cache.save()
+
+        self.assertIsNone(DateCache(self.path, "v2").get("1805"))
+
+    def test_disabled_cache_does_not_write(self):
+        cache = DateCache(self.path, "v1", enabled=False)
+        cache.put("1805", ("1805", "Unknown", 1805))
+        cache.save()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resolved_dates_match_uncached_parse(self):
+        pipeline = GenealogyTextPipeline()
+        pipeline.date_cache = DateCache(self.path, "v1")
+        raw = "9/4/1805, Hartford, CT"
+
+        first = pipeline._resolve_vital_date(raw)
+        second = pipeline._resolve_vital_date(raw)
+
+        date, location = pipeline._split_date_location_uncached(raw)
+        self.assertEqual(tuple(first), (date, location, pipeline._normalize_date_uncached(date)))
+        self.assertEqual(list(first), list(second))
+        self.assertEqual(pipeline.date_cache.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
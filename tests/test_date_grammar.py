@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from date_grammar import split_vital_date
+from genealogy_pipeline import GenealogyTextPipeline
+
+# Regenerate with scripts/benchmarks/build_date_corpus.py
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "vital_date_corpus.json")
+
+
+class TestDateGrammar(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+            cls.corpus = json.load(f)
+        cls.pipeline = GenealogyTextPipeline()
+
+    def test_fast_path_matches_dateparser_on_corpus(self):
+        covered = 0
+        for raw, date, location, _ in self.corpus:
+            fast = split_vital_date(raw)
+            if fast is None:
+                continue
+            covered += 1
+            self.assertEqual(fast, (date, location), raw)
+
+        # The documented formats make up the bulk of the real strings
+        self.assertGreater(covered, 0.9 * len(self.corpus))
+
+    def test_split_date_location_output_unchanged(self):
+        for raw, date, location, year_int in self.corpus:
+            self.assertEqual(self.pipeline._split_date_location_uncached(raw), (date, location), raw)
+            self.assertEqual(self.pipeline._normalize_date_uncached(date), year_int, raw)
+
+    def test_fast_path_falls_back_on_date_vocabulary(self):
+        # dateparser glues these onto the date, so the grammar must not guess
+        self.assertIsNone(split_vital_date("1697, MA"))
+        self.assertIsNone(split_vital_date("c. 1590, St. Albans, Hertfordshire, England"))
+        self.assertIsNone(split_vital_date("1692, probably Sudbury, MA, but records for year lost"))
+        self.assertIsNone(split_vital_date("after 2/29/1661, Carrickfergus, Antrim, Ireland"))
+        self.assertIsNone(split_vital_date("1640/41, New Haven, CT"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from docx_stream import DocxParagraphReader
+
+
+class TestDocxParagraphReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "sample.docx")
+
+        doc = Document()
+        doc.add_paragraph("GENERATION IV: GREAT GRANDPARENTS")
+        doc.add_paragraph("William Earl Dodge, Sr. {1}")
+        doc.add_paragraph("")
+        p = doc.add_paragraph("Born:")
+        p.add_run().add_tab()
+        p.add_run("9/4/1805, Hartford, CT")
+        p = doc.add_paragraph("NOTES: first line")
+        run = p.add_run()
+        run.add_break()
+        run.add_text("second line")
+        run.add_break(WD_BREAK.PAGE)
+        # Table paragraphs are not body paragraphs and must not shift indices
+        doc.add_table(rows=1, cols=2).cell(0, 0).text = "Inside a table"
+        doc.add_paragraph("Melissa Phelps {2}")
+        doc.save(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_python_docx(self):
+        expected = list(enumerate(p.text for p in Document(self.path).paragraphs))
+        with DocxParagraphReader(self.path) as reader:
+            streamed = list(reader)
+        self.assertEqual(streamed, expected)
+        self.assertEqual(reader.paragraph_count, len(expected))
+        self.assertIn((3, "Born:\t9/4/1805, Hartford, CT"), streamed)
+
+    def test_rejects_non_docx(self):
+        bad_path = os.path.join(self.tmp.name, "not_a_doc.docx")
+        with open(bad_path, "w") as f:
+            f.write("plain text")
+        with self.assertRaises(Exception):
+            DocxParagraphReader(bad_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from enrichment_engine import EnrichmentJob, run_enrichment
+
+
+class SlowService:
+    """Blocking lookup with fixed latency that records its peak concurrency."""
+
+    def __init__(self, latency, barrier=None):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        # The first lookup waits here until the other services' first lookups arrive
+        self.barrier = barrier
+        self.met = False
+
+    def resolve(self, key):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            meet, self.met = self.barrier is not None and not self.met, True
+        if meet:
+            self.barrier.wait()
+        time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+        return f"{key}!"
+
+
+class TestEnrichmentEngine(unittest.TestCase):
+    def test_results_come_back_in_key_order(self):
+        service = SlowService(0)
+        results = run_enrichment([EnrichmentJob("geocode", ["b", "a", "c"], service.resolve, concurrency=3),
+                                  EnrichmentJob("ships", [], service.resolve)])
+        self.assertEqual(results, {"geocode": ["b!", "a!", "c!"]})
+
+    def test_concurrency_caps_are_per_service(self):
+        geocode, images = SlowService(0.02), SlowService(0.02)
+        run_enrichment([EnrichmentJob("geocode", range(6), geocode.resolve, concurrency=1),
+                        EnrichmentJob("images", range(12), images.resolve, concurrency=4)])
+        self.assertEqual(geocode.max_in_flight, 1)
+        self.assertEqual(images.max_in_flight, 4)
+
+    def test_services_run_side_by_side(self):
+        # Each service's first lookup blocks until all three services have
+        # one in flight, which a one-after-another run never reaches (the
+        # barrier then times out and the stage fails)
+        barrier = threading.Barrier(3, timeout=5)
+        services = [SlowService(0, barrier) for _ in range(3)]
+        jobs = [EnrichmentJob(name, range(6), service.resolve, concurrency=2)
+                for name, service in zip(("geocode", "ships", "images"), services)]
+
+        results = run_enrichment(jobs)
+        self.assertEqual(results["images"], [f"{key}!" for key in range(6)])
+        self.assertFalse(barrier.broken)
+        self.assertTrue(all(service.met for service in services))
+
+if __name__ == "__main__":
+    unittest.main()
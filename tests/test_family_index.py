@@ -0,0 +1,109 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from genealogy_pipeline import GenealogyTextPipeline
+from profile_model import new_profile
+
+
+def make_profile(uid, lineage, generation, notes=""):
+    p = new_profile(
+        uid, f"Person {uid}", lineage, generation,
+        vital_stats={"born_date": "1700", "born_location": "Hartford, CT",
+                     "died_date": "1760", "died_location": "Boston, MA", "born_year_int": 1700},
+        story={"notes": notes, "voyages": [], "life_events": [], "tags": ["Mariner"]},
+        metadata={"source_id": lineage, "doc_paragraph_index": 1},
+    )
+    p["hero_image"] = None
+    p["relations"] = {"parents": [], "children": [], "spouses": []}
+    return p
+
+
+class TestFamilyIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self.tmp.name
+        self.pipeline = GenealogyTextPipeline()
+        self.pipeline.save_location_table = lambda table: None
+        self.pipeline.family_data = [
+            make_profile("1", "Paternal", "GENERATION I: PARENTS", notes="Sailed to Boston."),
+            make_profile("1.1", "Paternal", "GENERATION II:  GRANDPARENTS"),
+            make_profile("M1", "Maternal", "GENERATION I: PARENTS"),
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def load(self, *parts):
+        with open(os.path.join(self.data_dir, *parts), encoding="utf-8") as f:
+            return json.load(f)
+
+    def emit(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.pipeline.emit(os.path.join(self.data_dir, "family_data.json"))
+
+    def test_index_and_shards(self):
+        self.emit()
+        full = {p["id"]: p for p in self.load("family_data.json")}
+        index = self.load("family_index.json")
+        self.assertEqual(index["shards"], ["paternal-generation-i-parents.json",
+                                           "paternal-generation-ii-grandparents.json",
+                                           "maternal-generation-i-parents.json"])
+
+        entry = index["profiles"][0]
+        self.assertEqual(entry["shard"], 0)
+        self.assertTrue(entry["has_story"])
+        self.assertNotIn("notes", entry["story"])
+        self.assertNotIn("died_location", entry["vital_stats"])
+        self.assertEqual(entry["vital_stats"]["born_year_int"], 1700)
+        self.assertEqual(entry["relations"], full["1"]["relations"])
+
+        # Every index entry resolves to its full profile in its shard
+        for entry in index["profiles"]:
+            shard = self.load("details", index["shards"][entry["shard"]])
+            self.assertEqual(shard[entry["id"]], full[entry["id"]])
+
+    def test_stale_shards_are_removed(self):
+        self.emit()
+        self.pipeline.family_data = self.pipeline.family_data[:1]
+        self.emit()
+        self.assertEqual(os.listdir(os.path.join(self.data_dir, "details")), ["paternal-generation-i-parents.json"])
+        self.assertEqual(len(self.load("family_index.json")["profiles"]), 1)
+
+    def test_failed_emit_keeps_the_previous_shards(self):
+        self.emit()
+        before = self.load("details", "paternal-generation-i-parents.json")
+        # The last profile fails to finalize once the other shards are open
+        self.pipeline.family_data[2]["story"] = None
+        with self.assertRaises(AttributeError):
+            self.emit()
+        self.assertEqual(self.load("details", "paternal-generation-i-parents.json"), before)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.data_dir, "details"))),
+                         ["maternal-generation-i-parents.json", "paternal-generation-i-parents.json",
+                          "paternal-generation-ii-grandparents.json"])
+
+    def test_failed_index_keeps_the_previous_data(self):
+        self.emit()
+        before = self.load("family_data.json")
+        self.pipeline.family_data = self.pipeline.family_data[:1]
+
+        def failing(*args):
+            raise OSError("disk full")
+
+        self.pipeline.emit_index = failing
+        with self.assertRaises(OSError):
+            self.emit()
+        # family_data.json and the shards it would have dropped stay as they were
+        self.assertEqual(self.load("family_data.json"), before)
+        self.assertEqual(len(self.load("family_index.json")["profiles"]), 3)
+        self.assertEqual(len(os.listdir(os.path.join(self.data_dir, "details"))), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
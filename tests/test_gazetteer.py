@@ -0,0 +1,179 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from cache_store import ERROR, NEGATIVE, RetryPolicy
+from gazetteer import Gazetteer, normalize_location
+from genealogy_pipeline import GenealogyTextPipeline, GeocodingService
+from rate_limit import TokenBucket
+
+
+class TestNormalizeLocation(unittest.TestCase):
+    def test_variants_share_one_form(self):
+        for raw in ["Simsbury CT", "Simsbury, CT", "Simsbury, Hartford County, CT", "Simsbury, Connecticut",
+                    "probably Simsbury, Conn.", "Simsbury, CT, USA"]:
+            self.assertEqual(normalize_location(raw).replace("Hartford, ", ""), "Simsbury, CT", raw)
+
+    def test_punctuation_and_abbreviations(self):
+        self.assertEqual(normalize_location("E. Greenwich, RI"), "East Greenwich, RI")
+        self.assertEqual(normalize_location("New London*, CT"), "New London, CT")
+        self.assertEqual(normalize_location("assume England"), "England")
+        self.assertEqual(normalize_location("Dedham (Essex), England?"), "Dedham, England")
+        self.assertEqual(normalize_location(" ? "), "")
+
+
+class TestGazetteer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.gazetteer = Gazetteer(GenealogyTextPipeline()._parse_location_hierarchy)
+
+    def resolve(self, location):
+        coords, level = self.gazetteer.resolve(location)
+        return (coords["lat"], coords["lng"], coords["tier"], level) if coords else None
+
+    def test_town_level_hits(self):
+        self.assertEqual(self.resolve("Simsbury CT"), (41.8759, -72.8012, 1, "place"))
+        self.assertEqual(self.resolve("Dedham, Essex, England"), (51.959, 0.993, 1, "place"))
+        # Same name, different state
+        self.assertNotEqual(self.resolve("Charlestown, MA"), self.resolve("Charlestown, NH"))
+
+    def test_bare_names_prefer_the_colonial_town(self):
+        self.assertEqual(self.resolve("Windsor"), self.resolve("Windsor, CT"))
+        self.assertEqual(self.resolve("Jamaica, Queens"), self.resolve("Jamaica, NY"))
+        # Two towns of that name in New England: no guess
+        self.assertIsNone(self.resolve("Watertown"))
+
+    def test_falls_back_to_region_then_country(self):
+        # An Essex village missing from the place list lands on the county
+        self.assertEqual(self.resolve("Toppesfield, Essex, England")[2:], (3, "region"))
+        self.assertEqual(self.resolve("Toppesfield, Essex, England")[:2], self.resolve("Essex, England")[:2])
+        # A namesake elsewhere is not used for a state we know
+        self.assertEqual(self.resolve("Dorchester, SC")[2:], (3, "region"))
+        self.assertEqual(self.resolve("Nowhere, Ireland")[2:], (3, "country"))
+        self.assertIsNone(self.resolve("lost at sea"))
+
+
+class TestGeocodingTiers(unittest.TestCase):
+    def test_tiers_and_coverage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            gazetteer = Gazetteer(GenealogyTextPipeline()._parse_location_hierarchy)
+            geocoder = GeocodingService(os.path.join(tmp, "enrichment.sqlite"), gazetteer=gazetteer)
+
+            # The built-in tables still win over the gazetteer
+            self.assertEqual(geocoder.geocode("Massachusetts Bay Colony")["tier"], 2)
+            self.assertEqual(geocoder.geocode("Wickford, RI")["tier"], 1)
+            self.assertFalse(geocoder.needs_lookup("Wickford, RI"))
+            # Villages only need the API when it is switched on
+            self.assertFalse(geocoder.needs_lookup("Toppesfield, Essex, England"))
+            geocoder.api_enabled = True
+            self.assertTrue(geocoder.needs_lookup("Toppesfield, Essex, England"))
+            geocoder.api_enabled = False
+            self.assertEqual(geocoder.geocode("Toppesfield, Essex, England")["tier"], 3)
+            self.assertIsNone(geocoder.geocode("on voyage"))
+
+            self.assertEqual(dict(geocoder.tier_counts),
+                             {"historical": 1, "gazetteer_place": 1, "gazetteer_region": 1, "miss": 1})
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                geocoder.report_coverage()
+            self.assertIn("gazetteer_place", out.getvalue())
+            geocoder.cache.close()
+
+
+class StubNominatim:
+    """Local stand-in for Nominatim: finds "Toppesfield", nothing else."""
+
+    def __init__(self):
+        self.queries = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)["q"][0]
+                stub.queries.append(query)
+                found = [{"lat": "51.99", "lon": "0.49"}] if query.startswith("Toppesfield") else []
+                body = json.dumps(found).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/search"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestGeocodingApi(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubNominatim()
+        # Avoid local proxy settings for the loopback server
+        self.env = {k: os.environ.pop(k) for k in list(os.environ) if k.lower().endswith("_proxy")}
+        self.tmp = tempfile.TemporaryDirectory()
+        self.gazetteer = Gazetteer(GenealogyTextPipeline()._parse_location_hierarchy)
+
+    def tearDown(self):
+        self.stub.close()
+        self.tmp.cleanup()
+        os.environ.update(self.env)
+
+    def make_geocoder(self, api_url=None, retry_policy=None):
+        geocoder = GeocodingService(os.path.join(self.tmp.name, "enrichment.sqlite"), retry_policy, self.gazetteer,
+                                    api_enabled=True, api_url=api_url or self.stub.url)
+        geocoder.rate_limiter = TokenBucket(1000.0)
+        self.addCleanup(geocoder.cache.close)
+        return geocoder
+
+    def geocode(self, geocoder, location):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return geocoder.geocode(location)
+
+    def test_hits_and_misses_are_cached(self):
+        geocoder = self.make_geocoder()
+        self.assertEqual(self.geocode(geocoder, "Toppesfield, Essex, England")["tier"], 4)
+        # Not found: cached as a miss, and the county centroid is used
+        self.assertEqual(self.geocode(geocoder, "Nowhere Green, Essex, England")["tier"], 3)
+        self.assertEqual(geocoder.cache.kind("Nowhere Green, Essex, England"), NEGATIVE)
+
+        # Both are now served without the API, the miss still from the county
+        self.assertFalse(geocoder.needs_lookup("Toppesfield, Essex, England"))
+        self.assertFalse(geocoder.needs_lookup("Nowhere Green, Essex, England"))
+        self.assertEqual(self.geocode(geocoder, "Toppesfield, Essex, England")["tier"], 4)
+        self.assertEqual(self.geocode(geocoder, "Nowhere Green, Essex, England")["tier"], 3)
+        self.assertEqual(len(self.stub.queries), 2)
+
+        # --refresh-negatives retries the miss once
+        geocoder.retry_policy = RetryPolicy(refresh_negatives=True)
+        self.assertTrue(geocoder.needs_lookup("Nowhere Green, Essex, England"))
+        self.geocode(geocoder, "Nowhere Green, Essex, England")
+        self.assertEqual(len(self.stub.queries), 3)
+
+    def test_failures_back_off(self):
+        self.stub.close()
+        geocoder = self.make_geocoder(api_url=self.stub.url)
+        self.assertEqual(self.geocode(geocoder, "Toppesfield, Essex, England")["tier"], 3)
+        self.assertEqual(geocoder.cache.kind("Toppesfield, Essex, England"), ERROR)
+        # Within the backoff window the failure is not retried
+        self.assertFalse(geocoder.needs_lookup("Toppesfield, Essex, England"))
+
+        now = [geocoder.cache.updated_at("Toppesfield, Essex, England") + 2 * 60 * 60]
+        geocoder.retry_policy = RetryPolicy(clock=lambda: now[0])
+        self.assertTrue(geocoder.needs_lookup("Toppesfield, Essex, England"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from genealogy_pipeline import GenealogyTextPipeline
+from intern_table import InternTable, StringDictionary
+
+
+def fresh(text):
+    # A new string object with the same value, as the parser produces per line
+    return "".join(list(text))
+
+
+class TestInternTable(unittest.TestCase):
+    def test_shared_copies_and_stats(self):
+        table = InternTable()
+        a = table.intern(fresh("Hartford, CT"), "location")
+        b = table.intern(fresh("Hartford, CT"), "location")
+        self.assertIs(a, b)
+        table.intern(fresh("Boston, MA"), "location")
+        table.intern("GENERATION IV", "generation")
+        hierarchy = table.intern({"raw": fresh("Hartford, CT"), "county": None}, "location")
+        self.assertIs(hierarchy["raw"], a)
+
+        self.assertEqual(table.stats(), {"generation": {"distinct": 1, "total": 1},
+                                         "location": {"distinct": 2, "total": 4}})
+        self.assertEqual(table.counters()["location_total"], 4)
+
+        table.reset_counts()
+        self.assertEqual(table.stats(), {})
+        self.assertIs(table.intern(fresh("Boston, MA"), "location"), table.intern("Boston, MA", "ship"))
+
+    def test_dictionary_codes(self):
+        table = InternTable()
+        for value in ["Boston", "Hartford", "Hartford", "Unknown", "Unknown", "Unknown"]:
+            table.intern(value, "location")
+        strings = table.dictionary()
+        self.assertEqual(strings.values, ["Unknown", "Hartford", "Boston"])
+        self.assertEqual(strings.encode("Hartford"), 1)
+        self.assertEqual(strings.encode("Salem"), 3)
+        self.assertIsNone(strings.encode(None))
+        self.assertEqual(strings.decode(3), "Salem")
+
+
+class TestDictionaryEncodedProfile(unittest.TestCase):
+    def test_encoded_profile_decodes(self):
+        final = {
+            "id": "1", "name": "John", "lineage": "Paternal", "generation": "GENERATION I",
+            "vital_stats": {"born_date": "1700", "born_location": "Hartford, CT",
+                            "born_hierarchy": {"raw": "Hartford, CT", "city": "Hartford", "county": None},
+                            "died_hierarchy": None},
+            "story": {"notes": "", "voyages": [{"ship_name": "Hector", "departure": "Unknown",
+                                                 "arrival": "Hartford, CT", "year": "1700"}],
+                      "life_events": [{"year": 1701, "location": "Unknown", "label": "x"}]},
+        }
+        strings = StringDictionary(["Unknown"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            encoded = GenealogyTextPipeline()._encode_profile(final, strings)
+
+        self.assertEqual(encoded["story"]["life_events"][0]["location"], 0)
+        self.assertEqual(encoded["vital_stats"]["born_hierarchy"]["raw"], encoded["vital_stats"]["born_location"])
+        self.assertEqual(final["story"]["voyages"][0]["ship_name"], "Hector")
+
+        decode = strings.decode
+        self.assertEqual(decode(encoded["lineage"]), "Paternal")
+        self.assertEqual(decode(encoded["story"]["voyages"][0]["arrival"]), "Hartford, CT")
+        self.assertEqual(encoded["story"]["voyages"][0]["year"], "1700")
+        self.assertIsNone(encoded["vital_stats"]["died_hierarchy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from json_stream import JSONStreamWriter, OutputGroup
+
+PROFILES = [
+    {"id": "1", "name": "José Smith", "story": {"voyages": [], "tags": ["Mariner"]}, "hero_image": None},
+    {"id": "1.1", "name": "John", "vital_stats": {"born_year_int": 1700, "born_coords": {"lat": 41.5}}},
+]
+
+
+class TestJSONStreamWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "family_data.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_pretty_matches_json_dump(self):
+        for value in (PROFILES, []):
+            with JSONStreamWriter(self.path, pretty=True) as out:
+                out.write_array(iter(value))
+            self.assertEqual(self.read(), json.dumps(value, indent=4, ensure_ascii=True))
+
+    def test_compact_is_utf8_without_whitespace(self):
+        with JSONStreamWriter(self.path) as out:
+            self.assertEqual(out.write_array(p for p in PROFILES), 2)
+        text = self.read()
+        self.assertEqual(json.loads(text), PROFILES)
+        self.assertIn("José", text)
+        self.assertNotIn("\n", text)
+        self.assertNotIn(", ", text)
+
+    def test_object_with_streamed_and_late_members(self):
+        strings = []
+
+        def profiles():
+            for p in PROFILES:
+                strings.append(p["id"])
+                yield p
+
+        expected = {"format": "dictionary", "profiles": PROFILES, "strings": ["1", "1.1"]}
+        for pretty in (True, False):
+            strings.clear()
+            with JSONStreamWriter(self.path, pretty=pretty) as out:
+                out.write_object([("format", "dictionary"), ("profiles", profiles()), ("strings", lambda: strings)])
+            self.assertEqual(json.loads(self.read()), expected)
+        with JSONStreamWriter(self.path, pretty=True) as out:
+            out.write_object([("format", "dictionary"), ("profiles", iter(PROFILES)), ("strings", lambda: ["1", "1.1"])])
+        self.assertEqual(self.read(), json.dumps(expected, indent=4))
+
+    def test_objects_filled_member_by_member(self):
+        # Two writers open at once, members alternating between them
+        other = os.path.join(self.tmp.name, "other.json")
+        for pretty in (True, False):
+            with JSONStreamWriter(self.path, pretty=pretty) as out, JSONStreamWriter(other, pretty=pretty) as out2:
+                out.begin_object()
+                out2.begin_object()
+                for p in PROFILES:
+                    out.write_member(p["id"], p)
+                    out2.write_member(p["id"], p["name"])
+                out.end_object()
+                out2.end_object()
+            self.assertEqual(json.loads(self.read()), {p["id"]: p for p in PROFILES})
+            with open(other, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), {p["id"]: p["name"] for p in PROFILES})
+        self.assertEqual(self.read(), json.dumps({p["id"]: p for p in PROFILES}, separators=(",", ":"), ensure_ascii=False))
+
+        with JSONStreamWriter(self.path, pretty=True) as out:
+            out.begin_object()
+            out.end_object()
+        self.assertEqual(self.read(), "{}")
+
+    def test_failed_run_keeps_the_previous_file(self):
+        with JSONStreamWriter(self.path) as out:
+            out.write_array(PROFILES)
+
+        def failing():
+            yield PROFILES[0]
+            raise ValueError("enrichment data missing")
+
+        with self.assertRaises(ValueError):
+            with JSONStreamWriter(self.path) as out:
+                out.write_array(failing())
+        self.assertEqual(json.loads(self.read()), PROFILES)
+        self.assertEqual(os.listdir(self.tmp.name), ["family_data.json"])
+
+    def test_concurrent_writers_do_not_share_a_temp_file(self):
+        with JSONStreamWriter(self.path) as first, JSONStreamWriter(self.path) as second:
+            self.assertNotEqual(first.tmp_path, second.tmp_path)
+            first.write_array(PROFILES[:1])
+            second.write_array(PROFILES)
+        # The writer to finish last wins, and its file is whole
+        self.assertEqual(json.loads(self.read()), PROFILES[:1])
+        self.assertEqual(os.listdir(self.tmp.name), ["family_data.json"])
+
+    def test_group_replaces_files_only_once_all_are_complete(self):
+        index = os.path.join(self.tmp.name, "family_index.json")
+        with OutputGroup() as outputs:
+            with outputs.writer(self.path) as out:
+                out.write_array(PROFILES)
+            with outputs.writer(index) as out:
+                out.write_array([p["id"] for p in PROFILES])
+            # Both complete, neither in place yet
+            self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(json.loads(self.read()), PROFILES)
+
+        with self.assertRaises(ValueError):
+            with OutputGroup() as outputs:
+                with outputs.writer(self.path) as out:
+                    out.write_array([])
+                with outputs.writer(index) as out:
+                    raise ValueError("index failed")
+        self.assertEqual(json.loads(self.read()), PROFILES)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["family_data.json", "family_index.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from genealogy_pipeline import GenealogyTextPipeline
+
+
+class CountingGeocoder:
+    """Stands in for GeocodingService; records every location it is asked for."""
+
+    def __init__(self, known):
+        self.known = known
+        self.calls = []
+
+    def geocode(self, location):
+        self.calls.append(location)
+        return self.known.get(location)
+
+
+def make_profile(born, died, events=()):
+    return {"vital_stats": {"born_location": born, "died_location": died},
+            "story": {"life_events": [{"year": 1700, "location": loc} for loc in events]}}
+
+
+class TestLocationTable(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = GenealogyTextPipeline()
+        self.geocoder = CountingGeocoder({"Hartford, CT": {"lat": 41.7658, "lng": -72.6734, "tier": 1}})
+        self.profiles = [
+            make_profile("Hartford, CT", "Hartford, CT", ["Hartford, CT", "at sea"]),
+            make_profile("Unknown", "Hartford, CT"),
+            make_profile("at sea", "Unknown", ["Unknown"]),
+        ]
+
+    def test_each_location_is_geocoded_once(self):
+        table = self.pipeline.build_location_table(self.profiles, self.geocoder)
+
+        self.assertEqual(self.geocoder.calls, ["Hartford, CT", "at sea"])
+        self.assertEqual(list(table), ["Hartford, CT", "at sea"])
+        # Counted once per profile, however often a profile mentions it
+        self.assertEqual(table["Hartford, CT"]["profiles"], 2)
+        self.assertEqual(table["at sea"], {"coords": None, "profiles": 2})
+
+    def test_locations_json(self):
+        table = self.pipeline.build_location_table(self.profiles, self.geocoder)
+        table["Salem, MA"] = {"coords": {"lat": 42.5195, "lng": -70.8967, "tier": 1}, "profiles": 5}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "locations.json")
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.pipeline.save_location_table(table, path)
+            with open(path) as f:
+                locations = json.load(f)
+
+        self.assertEqual(list(locations), ["Salem, MA", "Hartford, CT", "at sea"])
+        self.assertEqual(locations["Hartford, CT"], {"lat": 41.7658, "lng": -72.6734, "tier": 1, "profiles": 2})
+        self.assertEqual(locations["at sea"], {"lat": None, "lng": None, "tier": None, "profiles": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from name_matcher import NameMatcher
+
+NAMES = ["John Smith", "Smith", "John", "Mary Ann", "Ann", "Anna", "Ann Smith", "Smith jr.", "jr.", "José", "Zoë"]
+
+
+def regex_hits(names, text):
+    # The per-name `\bName\b` scans the matcher replaces
+    hits = []
+    for name in set(names):
+        for m in re.finditer(r'\b' + re.escape(name) + r'\b', text):
+            hits.append((m.start(), m.end(), name))
+    return sorted(hits)
+
+
+class TestNameMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = NameMatcher(NAMES)
+
+    def check(self, text):
+        self.assertEqual(sorted(self.matcher.find_all(text)), regex_hits(NAMES, text), text)
+
+    def test_overlapping_names(self):
+        # "Mary Ann Smith": Mary Ann, Ann, Ann Smith and Smith all overlap
+        self.check("He married Mary Ann Smith in 1702.")
+        self.check("Anna and Ann, daughters of John Smith, sailed with Smith.")
+        hits = self.matcher.find_all("Mary Ann Smith")
+        self.assertEqual([name for _, _, name in hits], ["Mary Ann", "Ann", "Ann Smith", "Smith"])
+
+    def test_suffix_names(self):
+        # Smith is a suffix of John Smith and Ann Smith; Ann a suffix of Mary Ann
+        self.check("John Smith")
+        self.check("Witnessed by Ann Smith and John Smithson.")
+        self.assertEqual(self.matcher.find_all("Smithson"), [])
+
+    def test_names_ending_in_punctuation(self):
+        # `\b` after "." needs a word character next, as in the original regexes
+        self.check("Signed by Smith jr. and Smith jr.x, then jr.Smith.")
+        self.check("jr.")
+        self.check("Smith jr.1702")
+
+    def test_word_characters_around_a_match(self):
+        self.check("_Smith and Smith_ and Smith_jr. and John_Smith")
+        self.check("José, Josés and éJosé; Zoë and Zoëy met Smithé")
+        self.check("Anna² and éAnn Smithè")
+
+    def test_empty(self):
+        self.assertEqual(self.matcher.find_all(""), [])
+        self.assertEqual(NameMatcher([]).find_all("John Smith"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import contextlib
+import copy
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from genealogy_pipeline import GenealogyTextPipeline
+
+
+def make_profile(pid, name, born, notes):
+    return {
+        "id": pid,
+        "name": name,
+        "lineage": "Test",
+        "generation": "GENERATION I: TEST",
+        "vital_stats": {"born_date": born, "died_date": "Unknown"},
+        "story": {"notes": notes, "life_events": []},
+        "metadata": {"source_id": "Test", "doc_paragraph_index": 1},
+        "relations": {"parents": [], "children": [], "spouses": []},
+    }
+
+
+PROFILES = [
+    make_profile("1", "William Earl Dodge", "1805", "He was a business partner of Anson Greene Phelps; friend of Thomas Powell."),
+    make_profile("2", "Anson Greene Phelps", "1781", "Father-in-law of William E. Dodge. Married Olivia Egleston."),
+    make_profile("3", "Olivia Egleston", "1790", "Wife of Anson Phelps, cousin of Mary Smith."),
+    make_profile("4", "Thomas Powell", "1700", "Settled in Westbury; neighbor of John Frost."),
+    make_profile("5", "Thomas Powell", "1790", "Mentioned with William Dodge and Mary Smith in the firm records."),
+    make_profile("6", "Mary Smith", "1795", "Witness to the will of Olivia Egleston; spoke of Thomas Powell."),
+    make_profile("7", "John Frost", "1705", "Friend of Thomas Powell. Executor for Mary Smith."),
+    make_profile("5.1", "John Frost", "1650", ""),
+]
+
+
+class TestParallelMentions(unittest.TestCase):
+    def run_mentions(self, workers):
+        pipeline = GenealogyTextPipeline()
+        pipeline.family_data = copy.deepcopy(PROFILES)
+        pipeline.update_ariadne_journal = lambda: None
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline._find_mentions(workers=workers)
+        log = {k: (sorted((n, sorted(ids)) for n, ids in v.items()) if k == "ambiguous" else v)
+               for k, v in pipeline.ariadne_log.items()}
+        return json.dumps(pipeline.family_data), json.dumps(log), list(pipeline.ariadne_log["ambiguous"])
+
+    def test_parallel_output_is_identical(self):
+        serial = self.run_mentions(workers=1)
+        self.assertIn("related_links", serial[0])
+        self.assertGreater(json.loads(serial[1])["new_links"], 0)
+        for workers in (2, 3):
+            self.assertEqual(serial, self.run_mentions(workers=workers))
+
+
+if __name__ == '__main__':
+    unittest.main()
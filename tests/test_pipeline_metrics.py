@@ -0,0 +1,122 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from pipeline_metrics import PipelineMetrics, compare_metrics, load_metrics
+from stage_runner import Stage, StageRunner
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+class TestPipelineMetrics(unittest.TestCase):
+    def test_counters_and_timers_go_to_the_current_stage(self):
+        metrics = PipelineMetrics()
+        metrics.count("outside")
+        with metrics.stage("parse"):
+            metrics.count("profiles", 3)
+            metrics.add_counters({"hits": 2, "misses": 1}, prefix="cache_")
+            for _ in range(2):
+                with metrics.timer("parse_document"):
+                    pass
+        metrics.skip("link")
+
+        data = metrics.to_dict()
+        parse = data["stages"]["parse"]
+        self.assertEqual(parse["counters"], {"cache_hits": 2, "cache_misses": 1, "profiles": 3})
+        self.assertEqual(parse["timers"]["parse_document"]["calls"], 2)
+        self.assertGreaterEqual(parse["wall_s"], 0)
+        self.assertEqual(data["stages"]["link"], {"status": "reused"})
+        self.assertEqual(data["stages"]["run"]["counters"], {"outside": 1})
+
+    def test_worker_timers_are_merged(self):
+        metrics = PipelineMetrics()
+        with metrics.stage("parse"):
+            with metrics.timer("parse_document"):
+                pass
+            metrics.add_timers({"parse_document": {"calls": 2, "seconds": 1.5}})
+        timer = metrics.to_dict()["stages"]["parse"]["timers"]["parse_document"]
+        self.assertEqual(timer["calls"], 3)
+        self.assertGreaterEqual(timer["seconds"], 1.5)
+
+    def test_trace_memory(self):
+        metrics = PipelineMetrics(trace_memory=True)
+        with metrics.stage("parse"):
+            blob = [str(i) for i in range(100000)]
+        del blob
+        self.assertGreater(metrics.to_dict()["stages"]["parse"]["tracemalloc_peak_mb"], 1)
+
+    def test_save_keeps_the_previous_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pipeline_metrics.json")
+            first = PipelineMetrics()
+            with first.stage("tag"):
+                first.count("tags", 5)
+            self.assertIsNone(quiet(first.save, path))
+
+            second = PipelineMetrics()
+            with second.stage("tag"):
+                second.count("tags", 7)
+            previous = quiet(second.save, path)
+
+            self.assertEqual(previous["stages"]["tag"]["counters"], {"tags": 5})
+            self.assertEqual(load_metrics(os.path.join(tmp, "pipeline_metrics.prev.json")), previous)
+            self.assertEqual(load_metrics(path)["stages"]["tag"]["counters"], {"tags": 7})
+
+    def test_regressions_need_ratio_and_noise_floor(self):
+        def run(parse_s, tag_s, links):
+            stage = lambda s, counters: {"status": "ran", "wall_s": s, "cpu_s": s, "process_peak_rss_mb": 100.0,
+                                         "rss_growth_mb": 5.0, "counters": counters}
+            return {"stages": {"parse": stage(parse_s, {"links": links}), "tag": stage(tag_s, {}),
+                               "emit": {"status": "reused"}}}
+
+        timings, counters, regressions = compare_metrics(run(1.0, 0.01, 10), run(2.0, 0.05, 12))
+        # parse doubled well above the floor; tag's 5x is under it
+        self.assertEqual([line.split(":")[0] for line in regressions], ["parse.wall_s", "parse.cpu_s"])
+        self.assertEqual(counters, ["parse.links: 10 -> 12"])
+        self.assertFalse(any(line.startswith("emit.") for line in timings))
+
+    def test_memory_regressions_use_the_stage_own_growth(self):
+        def run(emit_growth, emit_traced=None):
+            # parse sets the process peak; emit only ever reports that peak
+            stages = {"parse": {"status": "ran", "wall_s": 1.0, "cpu_s": 1.0, "process_peak_rss_mb": 500.0,
+                                "rss_growth_mb": 400.0, "counters": {}},
+                      "emit": {"status": "ran", "wall_s": 1.0, "cpu_s": 1.0, "process_peak_rss_mb": 500.0,
+                               "rss_growth_mb": emit_growth, "counters": {}}}
+            if emit_traced is not None:
+                stages["emit"]["tracemalloc_peak_mb"] = emit_traced
+            return {"trace_memory": emit_traced is not None, "stages": stages}
+
+        regressions = compare_metrics(run(0.0), run(60.0))[2]
+        self.assertEqual([line.split(":")[0] for line in regressions], ["emit.rss_growth_mb"])
+        self.assertEqual(compare_metrics(run(0.0), run(5.0))[2], [])
+
+        # With tracemalloc in both runs its peak is compared instead
+        regressions = compare_metrics(run(0.0, 20.0), run(0.0, 80.0))[2]
+        self.assertEqual([line.split(":")[0] for line in regressions], ["emit.tracemalloc_peak_mb"])
+
+
+class TestStageRunnerMetrics(unittest.TestCase):
+    def test_ran_and_reused_stages(self):
+        state = {"values": [1]}
+        stages = [Stage("parse", lambda: None), Stage("emit", lambda: None, cache=False)]
+        with tempfile.TemporaryDirectory() as tmp:
+            for _ in range(2):
+                metrics = PipelineMetrics()
+                runner = StageRunner(stages, lambda: state, state.update, tmp, metrics=metrics)
+                quiet(runner.run, "input")
+
+        data = metrics.to_dict()["stages"]
+        self.assertEqual(data["parse"], {"status": "reused"})
+        self.assertEqual(data["emit"]["status"], "ran")
+
+
+if __name__ == "__main__":
+    unittest.main()
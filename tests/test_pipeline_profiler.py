@@ -0,0 +1,101 @@
+import contextlib
+import io
+import os
+import pstats
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from pipeline_metrics import PipelineMetrics
+from pipeline_profiler import PROFILE_ENV, PipelineProfiler, profile_targets, profiler_from_env
+
+
+def busy(seconds=0.05):
+    end = time.process_time() + seconds
+    total = 0
+    while time.process_time() < end:
+        total += sum(range(100))
+    return total
+
+
+class Worker:
+    def parse_document(self):
+        return busy()
+
+    def parse(self):
+        return self.parse_document()
+
+
+class TestPipelineProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def profiler(self, targets):
+        return PipelineProfiler(profile_targets(targets), self.tmp.name, interval=0.001)
+
+    def save(self, profiler):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [os.path.basename(p) for p in profiler.save()]
+
+    def test_off_by_default(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(profiler_from_env())
+        with mock.patch.dict(os.environ, {PROFILE_ENV: "mentions, parse_document"}):
+            self.assertEqual(profiler_from_env().targets, {"mentions", "parse_document"})
+        self.assertEqual(profile_targets("1"), {"all"})
+
+    def test_stage_profiles(self):
+        profiler = self.profiler("mentions")
+        metrics = PipelineMetrics(profiler=profiler)
+        for stage in ("parse", "mentions"):
+            with metrics.stage(stage):
+                busy()
+
+        self.assertEqual(self.save(profiler), ["mentions.pstats", "mentions.collapsed"])
+        stats = pstats.Stats(os.path.join(self.tmp.name, "mentions.pstats"))
+        self.assertTrue(any(func[2] == "busy" for func in stats.stats))
+        with open(os.path.join(self.tmp.name, "mentions.collapsed")) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any("busy (test_pipeline_profiler.py" in line for line in lines))
+
+    def test_method_targets(self):
+        worker = Worker()
+        profiler = self.profiler("_find_mentions,parse_document")
+        self.assertEqual(profiler.unknown_targets(worker, ["parse"]), ["_find_mentions"])
+        self.assertEqual(profiler.wrap_methods(worker, ["parse"]), ["parse_document"])
+
+        worker.parse()
+        worker.parse()
+        self.assertEqual(self.save(profiler)[0], "parse_document.pstats")
+        stats = pstats.Stats(os.path.join(self.tmp.name, "parse_document.pstats"))
+        calls = [s[1] for func, s in stats.stats.items() if func[2] == "parse_document"]
+        self.assertEqual(calls, [2])
+
+    def test_parse_runs_in_process_when_targeted(self):
+        stages = ["parse", "mentions"]
+        for targets, expected in (("parse", True), ("all", True), ("parse_document", True),
+                                  ("_find_mentions", True), ("mentions", False)):
+            self.assertEqual(self.profiler(targets).needs_in_process("parse", stages), expected, targets)
+
+    def test_nested_targets_use_the_outer_profile(self):
+        worker = Worker()
+        profiler = self.profiler("parse,parse_document")
+        profiler.wrap_methods(worker, ["parse"])
+        with profiler.profile("parse"):
+            worker.parse()
+
+        self.assertEqual(list(profiler.profiles), ["parse"])
+
+
+if __name__ == "__main__":
+    unittest.main()
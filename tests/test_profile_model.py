@@ -0,0 +1,71 @@
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from profile_model import Profile, Story, VitalStats, as_dict, new_profile
+
+
+def make_profile(uid="1.2", born_location="Boston, Massachusetts"):
+    return new_profile(
+        uid, "John Smith", "Paternal", "GENERATION II",
+        vital_stats={"born_date": "1700", "born_location": born_location,
+                     "died_date": "Unknown", "died_location": "Unknown"},
+        story={"notes": "", "voyages": [], "life_events": []},
+        metadata={"source_id": "Paternal", "doc_paragraph_index": 4},
+    )
+
+
+class TestProfileModel(unittest.TestCase):
+    def test_dict_access(self):
+        p = make_profile()
+        self.assertEqual(p["vital_stats"]["born_date"], "1700")
+        self.assertNotIn("relations", p)
+        self.assertEqual(p.get("relations", {}), {})
+        with self.assertRaises(KeyError):
+            p["story"]["associates"]
+
+        p["relations"] = {"spouses": []}
+        p["story"].setdefault("associates", []).append("x")
+        self.assertIn("relations", p)
+        self.assertEqual(p["story"]["associates"], ["x"])
+        self.assertEqual(list(p["metadata"].keys()), ["source_id", "doc_paragraph_index"])
+
+    def test_shared_strings_are_interned(self):
+        # Built from separate string objects, as the parser does per line
+        a = make_profile("1", "".join(["Boston, ", "Massachusetts"]))
+        b = make_profile("2", "".join(["Boston", ", Massachusetts"]))
+        self.assertIs(a["vital_stats"]["born_location"], b["vital_stats"]["born_location"])
+        a["vital_stats"]["born_hierarchy"] = ["".join(["Mass", "achusetts"])]
+        b["vital_stats"]["born_hierarchy"] = ["".join(["Massa", "chusetts"])]
+        self.assertIs(a["vital_stats"]["born_hierarchy"][0], b["vital_stats"]["born_hierarchy"][0])
+
+    def test_to_dict_keeps_the_schema_order(self):
+        p = make_profile()
+        p["vital_stats"]["died_year_int"] = 1760
+        p["vital_stats"]["born_year_int"] = 1700
+        p["story"]["custom"] = True
+        data = as_dict(p)
+        self.assertEqual(list(data), ["id", "name", "lineage", "generation", "vital_stats", "story", "metadata"])
+        self.assertEqual(list(data["vital_stats"])[-2:], ["born_year_int", "died_year_int"])
+        self.assertEqual(data["story"], {"notes": "", "voyages": [], "life_events": [], "custom": True})
+        self.assertEqual(as_dict({"plain": 1}), {"plain": 1})
+
+    def test_round_trips(self):
+        p = make_profile()
+        p["hero_image"] = None
+        restored = Profile.from_dict(as_dict(p))
+        self.assertIsInstance(restored["story"], Story)
+        self.assertIsInstance(restored["vital_stats"], VitalStats)
+        self.assertEqual(as_dict(restored), as_dict(p))
+
+        # Unset fields stay unset across processes (parallel parse workers)
+        unpickled = pickle.loads(pickle.dumps(p))
+        self.assertNotIn("relations", unpickled)
+        self.assertEqual(as_dict(unpickled), as_dict(p))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from cache_store import RetryPolicy, ERROR, NEGATIVE
+from genealogy_pipeline import ShipEnrichmentService
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeClient:
+    """Stands in for genai.Client; answers each prompt from a scripted list."""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.prompts = []
+        self.models = self
+
+    def generate_content(self, model, contents, config):
+        self.prompts.append(contents)
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return FakeResponse(answer)
+
+
+class TestShipRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "enrichment.sqlite")
+        # The service seeds from ./kinship-app/public/data/ship_cache.json
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def make_service(self, answers, policy=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            service = ShipEnrichmentService(self.db, policy)
+        service.client = FakeClient(answers)
+        return service
+
+    def enrich(self, service, name):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return service.enrich_ship(name)
+
+    def test_known_bad_ships_are_not_requeried(self):
+        service = self.make_service([TimeoutError("deadline exceeded"), ""])
+        self.assertIsNone(self.enrich(service, "Ghost"))
+        self.assertIsNone(self.enrich(service, "Nameless"))
+        self.assertEqual(service.cache.kind("Ghost"), ERROR)
+        self.assertEqual(service.cache.kind("Nameless"), NEGATIVE)
+        service.cache.commit()
+
+        # A repeat run makes no requests for either
+        rerun = self.make_service([])
+        self.assertIsNone(self.enrich(rerun, "Ghost"))
+        self.assertIsNone(self.enrich(rerun, "Nameless"))
+        self.assertEqual(rerun.client.prompts, [])
+        self.assertEqual(rerun.requests_made, 0)
+
+    def test_failures_are_retried_after_backoff_or_refresh(self):
+        service = self.make_service([TimeoutError("deadline exceeded")])
+        self.enrich(service, "Ghost")
+        service.cache.set_negative("Nameless")
+        service.cache.commit()
+
+        # Back online once the error backoff has passed
+        later = RetryPolicy(error_backoff=0)
+        rerun = self.make_service([RuntimeError("quota"), ""], later)
+        self.enrich(rerun, "Ghost")
+        self.enrich(rerun, "Nameless")
+        self.assertEqual(len(rerun.client.prompts), 1)
+        self.assertEqual(rerun.cache.attempts("Ghost"), 2)
+        rerun.cache.commit()
+
+        # --refresh-negatives retries both once, then trusts the new entries
+        refresh = self.make_service(["", ""], RetryPolicy(refresh_negatives=True))
+        for _ in range(2):
+            self.enrich(refresh, "Ghost")
+            self.enrich(refresh, "Nameless")
+        self.assertEqual(len(refresh.client.prompts), 2)
+        self.assertEqual(refresh.cache.kind("Ghost"), NEGATIVE)
+
+
+def make_spec(name):
+    return {"year_built": "1620", "location_built": "Unknown", "deck_length": "Unknown", "beam": "Unknown",
+            "gross_tonnage": "180", "masts": 3, "owner": "Unknown", "description": f"The {name}."}
+
+
+class FakeFleetClient:
+    """
+    Answers batch prompts from the ship list embedded in them. Answers for
+    more than max_names ships come back cut off, like a response that hit
+    the output token limit.
+    """
+
+    def __init__(self, max_names=100, overrides=None, fail_batches=False):
+        self.max_names = max_names
+        self.overrides = overrides or {}
+        self.fail_batches = fail_batches
+        self.batches = []
+        self.singles = []
+        self.models = self
+
+    def generate_content(self, model, contents, config):
+        if "the ship named '" in contents:
+            name = contents.split("the ship named '")[1].split("' (")[0]
+            self.singles.append(name)
+            return FakeResponse(json.dumps(make_spec(name)))
+
+        names = [json.loads(line.strip()[2:]) for line in contents.split("Ships:")[1].split("Keys:")[0].strip().splitlines()]
+        self.batches.append(names)
+        if self.fail_batches:
+            raise TimeoutError("deadline exceeded")
+
+        answer = {}
+        for name in names:
+            if name in self.overrides:
+                if self.overrides[name] != "omit":
+                    answer[name] = self.overrides[name]
+            else:
+                answer[name] = dict(make_spec(name), confidence="high")
+        text = json.dumps(answer)
+        return FakeResponse(text if len(names) <= self.max_names else text[:len(text) // 2])
+
+
+class TestShipBatching(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "enrichment.sqlite")
+        # The service seeds from ./kinship-app/public/data/ship_cache.json
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_batch(self, names, client, batch_size=20):
+        with contextlib.redirect_stdout(io.StringIO()):
+            service = ShipEnrichmentService(self.db, batch_size=batch_size)
+            service.client = client
+            service.request_delay = 0
+            service.enrich_ships(names)
+        return service
+
+    def test_packs_many_ships_per_request(self):
+        names = [f"Ship {i}" for i in range(45)]
+        client = FakeFleetClient()
+        service = self.run_batch(names + names[:5], client)
+
+        self.assertEqual([len(b) for b in client.batches], [20, 20, 5])
+        self.assertEqual(client.singles, [])
+        self.assertEqual(service.requests_made, 3)
+        # Records are trimmed to the spec keys
+        self.assertEqual(service.cache["Ship 7"], make_spec("Ship 7"))
+
+        # Everything is cached, so a second pass sends nothing
+        client.batches.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(service.enrich_ships(names), 0)
+            self.assertEqual(service.enrich_ship("Ship 44"), make_spec("Ship 44"))
+        self.assertEqual(client.batches, [])
+
+    def test_splits_batches_whose_answer_is_cut_off(self):
+        names = [f"Ship {i}" for i in range(20)]
+        client = FakeFleetClient(max_names=8)
+        service = self.run_batch(names, client)
+
+        self.assertEqual([len(b) for b in client.batches], [20, 10, 5, 5, 10, 5, 5])
+        self.assertTrue(all(service.cache.kind(name) == "hit" for name in names))
+
+    def test_invalid_or_missing_records_fall_back_to_single_requests(self):
+        names = ["Mayflower", "Hector", "Ghost Ship", "Arbella"]
+        broken = make_spec("Hector")
+        del broken["beam"]
+        client = FakeFleetClient(overrides={"Hector": broken, "Arbella": "omit", "Ghost Ship": None})
+        service = self.run_batch(names, client)
+
+        self.assertEqual(len(client.batches), 1)
+        self.assertEqual(client.singles, ["Hector", "Arbella"])
+        self.assertEqual(service.cache["Hector"], make_spec("Hector"))
+        self.assertEqual(service.cache.kind("Ghost Ship"), NEGATIVE)
+
+    def test_failed_batch_backs_off_without_single_requests(self):
+        client = FakeFleetClient(fail_batches=True)
+        service = self.run_batch(["Mayflower", "Hector"], client)
+
+        self.assertEqual(client.singles, [])
+        self.assertEqual(service.cache.kind("Mayflower"), ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
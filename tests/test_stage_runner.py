@@ -0,0 +1,138 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import stage_runner
+from stage_runner import Stage, StageRunner
+
+
+def double(values):
+    return [v * 2 for v in values]
+
+
+class ToyPipeline:
+    """Three stages over a list of numbers; records which stages actually ran."""
+
+    def __init__(self, source, artifact_dir):
+        self.source = source
+        self.artifact_dir = artifact_dir
+        self.values = None
+        self.calls = []
+        self.emitted = None
+        self.offset = 1
+
+    def stage(self, name, fn, **kwargs):
+        def run():
+            self.calls.append(name)
+            fn()
+        return Stage(name, run, **kwargs)
+
+    def stages(self):
+        return [
+            self.stage("parse", lambda: setattr(self, "values", list(self.source)), code=[ToyPipeline]),
+            self.stage("double", lambda: setattr(self, "values", double(self.values)), code=[double]),
+            self.stage("shift", lambda: setattr(self, "values", [v + self.offset for v in self.values]),
+                       code=[ToyPipeline.stages], params=lambda: {"offset": self.offset}),
+            self.stage("emit", lambda: setattr(self, "emitted", list(self.values)), cache=False),
+        ]
+
+    def run(self, **kwargs):
+        runner = StageRunner(self.stages(), lambda: {"values": self.values}, self.load, self.artifact_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            runner.run(repr(self.source), **kwargs)
+        return runner
+
+    def load(self, state):
+        self.values = state["values"]
+
+
+class TestStageRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.artifact_dir = os.path.join(self.tmp.name, "stages")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def pipeline(self, source=(1, 2, 3)):
+        return ToyPipeline(source, self.artifact_dir)
+
+    def test_unchanged_stages_are_skipped(self):
+        self.pipeline().run()
+        pipeline = self.pipeline()
+        runner = pipeline.run()
+
+        self.assertEqual(runner.reused, ["parse", "double", "shift"])
+        # Emit always runs, from the last artifact
+        self.assertEqual(pipeline.calls, ["emit"])
+        self.assertEqual(pipeline.emitted, [3, 5, 7])
+
+    def test_changed_params_rerun_only_that_stage_on(self):
+        self.pipeline().run()
+        pipeline = self.pipeline()
+        pipeline.offset = 10
+        pipeline.run()
+
+        self.assertEqual(pipeline.calls, ["shift", "emit"])
+        self.assertEqual(pipeline.emitted, [12, 14, 16])
+
+    def test_changed_input_reruns_everything(self):
+        self.pipeline().run()
+        pipeline = self.pipeline(source=(5,))
+        pipeline.run()
+
+        self.assertEqual(pipeline.calls, ["parse", "double", "shift", "emit"])
+        self.assertEqual(pipeline.emitted, [11])
+
+    def test_identical_output_keeps_downstream_artifacts(self):
+        self.pipeline().run()
+        pipeline = self.pipeline()
+        pipeline.run(force=["parse"])
+
+        # parse produced the same bytes, so the same double/shift keys apply
+        self.assertEqual(pipeline.calls, ["parse", "emit"])
+
+    def test_force_all_and_from_stage(self):
+        self.pipeline().run()
+        pipeline = self.pipeline()
+        pipeline.run(force=["all"])
+        self.assertEqual(pipeline.calls, ["parse", "double", "shift", "emit"])
+
+        pipeline = self.pipeline()
+        pipeline.run(from_stage="shift")
+        self.assertEqual(pipeline.calls, ["shift", "emit"])
+        self.assertEqual(pipeline.emitted, [3, 5, 7])
+
+    def test_only_runs_the_selected_stages(self):
+        self.pipeline().run()
+        pipeline = self.pipeline()
+        pipeline.run(only=["double"])
+
+        self.assertEqual(pipeline.calls, ["double"])
+        self.assertIsNone(pipeline.emitted)
+
+    def test_selection_needs_earlier_artifacts(self):
+        with self.assertRaises(RuntimeError):
+            self.pipeline().run(from_stage="shift")
+        with self.assertRaises(ValueError):
+            self.pipeline().run(only=["tag"])
+
+    def test_old_artifacts_are_pruned(self):
+        for source in [(1,), (2,), (3,), (4,), (5,)]:
+            self.pipeline(source).run()
+
+        files = [f for f in os.listdir(self.artifact_dir) if f.startswith("parse-")]
+        self.assertEqual(len(files), stage_runner.KEEP_PER_STAGE)
+        # The newest survives and is still reused
+        pipeline = self.pipeline((5,))
+        pipeline.run()
+        self.assertEqual(pipeline.calls, ["emit"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts", "benchmarks"))
+
+from docx_stream import DocxParagraphReader
+from genealogy_pipeline import GenealogyTextPipeline
+from synthetic_tree import SyntheticTree, roman, write_synthetic_tree
+
+
+class TestSyntheticTree(unittest.TestCase):
+    def test_pedigree_ids(self):
+        tree = SyntheticTree(10)
+        self.assertEqual(tree.levels, [["1"], ["1.1", "1.2"], ["1.1.1", "1.1.2", "1.2.1", "1.2.2"],
+                                       ["1.1.1.1", "1.1.1.2", "1.1.2.1"]])
+        # Large trees start several probands
+        self.assertEqual(SyntheticTree(10000).levels[0], ["1", "2", "3"])
+        self.assertEqual(roman(12), "XII")
+
+    def test_deterministic_and_consistent(self):
+        a, b = SyntheticTree(500, seed=3), SyntheticTree(500, seed=3)
+        self.assertEqual(list(a.paragraphs()), list(b.paragraphs()))
+        self.assertNotEqual(list(a.paragraphs()), list(SyntheticTree(500, seed=4).paragraphs()))
+        # Fathers share the child's surname and are older than the child
+        self.assertEqual(a.surname("1.1.1"), a.surname("1"))
+        self.assertLess(a.birth_year("1.2"), a.birth_year("1"))
+
+
+class TestSyntheticDocumentParses(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tree = SyntheticTree(300)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "synthetic.docx")
+            cls.paragraphs = write_synthetic_tree(path, 300)
+            with DocxParagraphReader(path) as reader:
+                cls.texts = [text for _, text in reader]
+
+            cls.pipeline = GenealogyTextPipeline()
+            cls.pipeline.use_parse_cache = False
+            with contextlib.redirect_stdout(io.StringIO()):
+                cls.pipeline.parse_documents([("Synthetic", path)])
+                cls.pipeline.dedupe_child_entries()
+                cls.pipeline.link_family_members()
+
+    def test_document_round_trips(self):
+        self.assertEqual(self.texts, list(self.tree.paragraphs()))
+        self.assertEqual(len(self.texts), self.paragraphs)
+
+    def test_every_profile_is_parsed(self):
+        profiles = {p["id"]: p for p in self.pipeline.family_data if "_c" not in p["id"]}
+        self.assertEqual(set(profiles), set(self.tree.ids))
+        self.assertEqual(profiles["1.1.2"]["generation"], "GENERATION VI: GRANDPARENTS")
+        self.assertEqual(profiles["1.1"]["relations"]["spouses"], ["1.2"])
+        self.assertIn("1", profiles["1.1"]["relations"]["children"])
+
+        # Dates keep the generated year; bef./aft. move it by one
+        for pid, p in profiles.items():
+            if p["vital_stats"]["born_date"] != "Unknown":
+                self.assertLessEqual(abs(p["vital_stats"]["born_year_int"] - self.tree.birth_year(pid)), 1, pid)
+
+    def test_notes_carry_voyages_and_associates(self):
+        stories = [p["story"] for p in self.pipeline.family_data]
+        self.assertTrue(any(s["voyages"] for s in stories))
+        self.assertTrue(any(s.get("associates") for s in stories))
+
+
+class TestParallelParseMetrics(unittest.TestCase):
+    def test_worker_parse_timers_reach_the_stage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sources = []
+            for lineage, seed in (("Paternal", 1), ("Maternal", 2)):
+                path = os.path.join(tmp, f"{lineage}.docx")
+                write_synthetic_tree(path, 40, seed=seed)
+                sources.append((lineage, path))
+
+            pipeline = GenealogyTextPipeline()
+            pipeline.use_parse_cache = False
+            with contextlib.redirect_stdout(io.StringIO()), pipeline.metrics.stage("parse"):
+                pipeline.parse_documents(sources, workers=2)
+
+        timer = pipeline.metrics.to_dict()["stages"]["parse"]["timers"]["parse_document"]
+        self.assertEqual(timer["calls"], 2)
+        self.assertGreater(timer["seconds"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
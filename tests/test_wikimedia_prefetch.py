@@ -0,0 +1,244 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from cache_store import CacheStore, RetryPolicy, ERROR, NEGATIVE
+from genealogy_pipeline import GenealogyTextPipeline
+from rate_limit import TokenBucket
+from wikimedia_images import WikimediaImageService
+
+
+class StubCommons:
+    """Local stand-in for the Commons API that records every request."""
+
+    def __init__(self, latency=0.02):
+        self.latency = latency
+        self.queries = []
+        self.times = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        # Optional barrier the first gate.parties requests wait at together
+        self.gate = None
+        self.gated = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)["gsrsearch"][0]
+                with stub.lock:
+                    stub.queries.append(query)
+                    stub.times.append(time.monotonic())
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    wait = stub.gate is not None and stub.gated < stub.gate.parties
+                    stub.gated += wait
+                if wait:
+                    stub.gate.wait()
+                time.sleep(stub.latency)
+                with stub.lock:
+                    stub.in_flight -= 1
+
+                body = json.dumps(stub.respond(query)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/w/api.php"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def respond(self, query):
+        # Map queries find an image for "Hartford", the fallback query for "Salem"
+        if query.startswith("Hartford") and query.endswith("map") or query.startswith("Salem") and query.endswith("historical"):
+            return {"query": {"pages": {"1": {"imageinfo": [{
+                "thumburl": f"https://example.org/{query}.jpg",
+                "extmetadata": {"ImageDescription": {"value": f"<b>{query}</b>"}}
+            }]}}}}
+        return {"batchcomplete": ""}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_profile(pid, location, year):
+    return {"id": pid, "vital_stats": {"born_location": location, "born_year_int": year, "died_location": "Unknown"},
+            "story": {"life_events": []}}
+
+
+class CachedService:
+    """Geocoder and ship service with nothing left to look up, so only the images job runs."""
+
+    def __init__(self):
+        self.cache = self
+
+    def commit(self):
+        pass
+
+    def needs_lookup(self, location):
+        return False
+
+    def ship_batches(self, ship_names):
+        return []
+
+    def geocode(self, location):
+        raise AssertionError("nothing to geocode")
+
+    def enrich_batch(self, batch):
+        raise AssertionError("no ships to enrich")
+
+
+class TestWikimediaPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubCommons()
+        # Avoid local proxy settings for the loopback server
+        self.env = {k: os.environ.pop(k) for k in list(os.environ) if k.lower().endswith("_proxy")}
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.stub.close()
+        self.tmp.cleanup()
+        os.environ.update(self.env)
+
+    def make_pipeline(self, workers, rate):
+        pipeline = GenealogyTextPipeline()
+        pipeline.image_cache = CacheStore("wikimedia", os.path.join(self.tmp.name, f"cache_{workers}.sqlite"))
+        pipeline.image_cache["Boston, MA|18th century"] = None
+        pipeline.image_service = WikimediaImageService(api_url=self.stub.url, workers=workers, requests_per_second=rate)
+        pipeline.enrichment_concurrency["images"] = workers
+        pipeline.save_cache = lambda: None
+        return pipeline
+
+    def enrich(self, pipeline, profiles):
+        services = CachedService()
+        pipeline.enrich_concurrently(profiles, services, services, [])
+
+    def test_images_job_resolves_each_missing_key_once(self):
+        profiles = [
+            make_profile("1", "Hartford, CT", 1805),
+            make_profile("2", "Hartford, CT", 1850),  # same century, same key
+            make_profile("3", "Salem, MA", None),
+            make_profile("4", "Boston, MA", 1750),   # already cached
+            make_profile("5", "Unknown", 1700),
+            make_profile("6", "Nowhere", 1700),
+        ]
+        pipeline = self.make_pipeline(workers=3, rate=200)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.enrich(pipeline, profiles)
+
+        cache = pipeline.image_cache
+        self.assertEqual(list(cache), ["Boston, MA|18th century", "Hartford, CT|19th century",
+                                       "Salem, MA|historical", "Nowhere|18th century"])
+        self.assertEqual(cache["Hartford, CT|19th century"]["src"], "https://example.org/Hartford, CT 19th century map.jpg")
+        self.assertEqual(cache["Hartford, CT|19th century"]["caption"], "Hartford, CT 19th century map...")
+        self.assertEqual(cache["Salem, MA|historical"]["alt"], "Historical image of Salem, MA")
+        self.assertIsNone(cache["Nowhere|18th century"])
+        # 1 query for Hartford, 2 each for Salem and Nowhere
+        self.assertEqual(len(self.stub.queries), 5)
+
+        # The per-profile loop is now served from the cache
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline.fetch_wikimedia_image("Hartford, CT", 1805)
+        self.assertEqual(len(self.stub.queries), 5)
+
+    def test_outage_is_cached_as_error_and_retried_later(self):
+        profiles = [make_profile("1", "Hartford, CT", 1805), make_profile("6", "Nowhere", 1700)]
+        pipeline = self.make_pipeline(workers=2, rate=200)
+        self.stub.close()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.enrich(pipeline, profiles)
+        self.assertEqual(pipeline.image_cache.kind("Hartford, CT|19th century"), ERROR)
+        self.assertEqual(pipeline.image_service.requests_made, 4)
+
+        # Within the backoff window nothing is requested
+        pipeline.image_service = WikimediaImageService(api_url=self.stub.url, workers=2, requests_per_second=200)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.enrich(pipeline, profiles)
+            pipeline.fetch_wikimedia_image("Hartford, CT", 1805)
+        self.assertEqual(pipeline.image_service.requests_made, 0)
+
+        # Once the service is back, --refresh-negatives recovers the image
+        self.stub = StubCommons()
+        pipeline.image_service = WikimediaImageService(api_url=self.stub.url, workers=2, requests_per_second=200)
+        pipeline.retry_policy = RetryPolicy(refresh_negatives=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.enrich(pipeline, profiles)
+        self.assertEqual(pipeline.image_cache["Hartford, CT|19th century"]["src"], "https://example.org/Hartford, CT 19th century map.jpg")
+        self.assertEqual(pipeline.image_cache.kind("Nowhere|18th century"), NEGATIVE)
+        self.assertEqual(len(self.stub.queries), 3)
+
+    def test_rate_limit_and_concurrency_bound(self):
+        profiles = [make_profile(str(i), f"Town{i}, CT", 1700) for i in range(15)]
+        pipeline = self.make_pipeline(workers=4, rate=40)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.enrich(pipeline, profiles)
+
+        times = sorted(self.stub.times)
+        self.assertEqual(len(times), 30)
+        # 30 requests at 40/s with a burst of 1 cannot finish faster than 29 intervals
+        self.assertGreaterEqual(times[-1] - times[0], 29 / 40 * 0.9)
+        self.assertLessEqual(self.stub.max_in_flight, 4)
+
+    def test_workers_overlap_requests(self):
+        profiles = [make_profile(str(i), f"Town{i}, CT", 1700) for i in range(8)]
+
+        # The first four requests are held at the stub until all four have
+        # arrived, which only four concurrent lookups can do (one worker
+        # would leave the barrier to time out and the lookups to fail)
+        self.stub.gate = threading.Barrier(4, timeout=5)
+        pipeline = self.make_pipeline(workers=4, rate=1000)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.enrich(pipeline, profiles)
+        self.assertFalse(self.stub.gate.broken)
+        self.assertEqual(self.stub.max_in_flight, 4)
+        self.assertEqual(len(self.stub.queries), 16)
+        self.assertEqual(pipeline.image_cache.kind("Town0, CT|18th century"), NEGATIVE)
+
+        # One worker sends one request at a time
+        self.stub.gate = None
+        self.stub.max_in_flight = 0
+        pipeline = self.make_pipeline(workers=1, rate=1000)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.enrich(pipeline, profiles)
+        self.assertEqual(self.stub.max_in_flight, 1)
+
+class TestTokenBucket(unittest.TestCase):
+    def test_waits_for_tokens(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            bucket.acquire()
+
+        # Two tokens from the initial burst, then one every half second
+        self.assertEqual(sleeps, [0.5, 0.5])
+        self.assertAlmostEqual(now[0], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()